@@ -0,0 +1,83 @@
+"""
+Benchmark Pengumpulan Hasil PayrollSystemMPI
+Membandingkan send/recv pickle (Employee), Send/Recv buffer, Gatherv dan RMA Put
+(fence & passive target) untuk mengumpulkan total gaji ke rank 0
+
+Cara menjalankan:
+    mpiexec -n 4 python bench_collect.py
+    mpiexec -n 4 python bench_collect.py --sizes 10000,100000,1000000 --json
+"""
+
+from mpi4py import MPI  # type: ignore
+import argparse
+import random
+
+import bench_metrics
+from payroll_mpi import PayrollSystemMPI
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+MODES = ('sendrecv', 'gatherv', 'fence', 'passive')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark mode pengumpulan hasil PayrollSystemMPI')
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--reps', type=int, default=3, help='repetisi per mode (diambil minimum)')
+    parser.add_argument('--skip-pickle', action='store_true', help='lewati jalur send/recv Employee (pickle)')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    sizes = bench_metrics.bench_sizes([int(v) for v in args.sizes.split(',')])
+
+    doc = bench_metrics.new_result("bench_collect", size)
+    if rank == 0:
+        print("=" * 78)
+        print(" " * 14 + "BENCHMARK PENGUMPULAN HASIL: SEND/RECV vs GATHERV vs RMA")
+        print("=" * 78)
+        print(f"Proses MPI: {size}, repetisi: {args.reps} (minimum)\n")
+        header = f"{'Jumlah':>10} | {'pickle':>8} | " + " | ".join(f"{m:>8}" for m in MODES)
+        print("Waktu pengumpulan (s); kolom pickle = total calculate_all_salaries_parallel")
+        print(header)
+        print("-" * len(header))
+
+    for n in sizes:
+        payroll = PayrollSystemMPI()
+        if rank == 0:
+            random.seed(0)
+            payroll.generate_sample_data(n)
+
+        pickle_time = None
+        if not args.skip_pickle:
+            times = []
+            for _ in range(args.reps):
+                times.append(payroll.calculate_all_salaries_parallel())
+            pickle_time = min(times) if rank == 0 else None
+
+        collect = {}
+        elapsed = {}
+        for mode in MODES:
+            best = None
+            for _ in range(args.reps):
+                t = payroll.calculate_all_salaries_collect(mode)
+                if rank == 0 and (best is None or payroll.comm_stats['collect_time'] < best[0]):
+                    best = (payroll.comm_stats['collect_time'], t)
+            if rank == 0:
+                collect[mode], elapsed[mode] = best
+
+        if rank == 0:
+            pickle_col = f"{pickle_time:>8.4f}" if pickle_time is not None else f"{'-':>8}"
+            print(f"{n:>10,} | {pickle_col} | " + " | ".join(f"{collect[m]:>8.4f}" for m in MODES))
+            bench_metrics.add_point(doc, n, serial_time=collect['sendrecv'], parallel_time=collect['fence'],
+                                    pickle_time=pickle_time, collect_times=collect, elapsed_times=elapsed)
+
+    if rank == 0:
+        print()
+        print("Mode fence/passive termasuk pembuatan window (Win.Create/Free) di setiap panggilan")
+        print("'speedup' pada dokumen JSON = pengumpulan sendrecv / fence")
+        bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
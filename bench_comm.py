@@ -0,0 +1,276 @@
+"""
+Microbenchmark Komunikasi MPI
+Latency & bandwidth untuk ping-pong, bcast, scatter(v), gather(v), reduce dan allreduce,
+masing-masing dengan API pickle (lowercase) dan API buffer (uppercase), ukuran pesan 8 B - 256 MB.
+Versi terukur dari contoh send_recv.py, collectives.py, scatter_gather.py dan scatter_gather_uneven.py
+
+Cara menjalankan:
+    mpiexec -n 4 python bench_comm.py
+    mpiexec -n 4 python bench_comm.py --ops pingpong,allreduce --max-bytes 16777216 --reps 5 --json
+
+Ukuran pesan = bytes per rank (scatter/gather: potongan tiap rank; reduce: panjang vektor).
+Tabel bench_comm_<op>_<api>.csv/.md ditulis ke --out-dir (default <temp>/bench_data/bench_comm)
+dengan kolom bench_scaling.py: mode = "msg<bytes>", rows = bytes = ukuran pesan, time_s = median
+waktu per operasi; speedup/efficiency dikosongkan (bukan data scaling, diabaikan bench_model dan
+tidak diuji efisiensinya oleh bench_regression).
+Jalankan ulang dengan -n berbeda untuk menambah titik procs ke tabel yang sama.
+"""
+
+from mpi4py import MPI  # type: ignore
+import argparse
+import os
+import tempfile
+
+import numpy as np  # type: ignore
+
+import bench_metrics
+import bench_scaling
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+OUT_DIR = os.path.join(tempfile.gettempdir(), 'bench_data', 'bench_comm')  # di luar repo, seperti data bench_scaling
+OPS = ('pingpong', 'bcast', 'scatter', 'scatterv', 'gather', 'gatherv', 'reduce', 'allreduce')
+APIS = ('pickle', 'buffer')
+
+
+def message_sizes(min_bytes, max_bytes, factor):
+    sizes = []
+    n = min_bytes
+    while n < max_bytes:
+        sizes.append(n)
+        n *= factor
+    sizes.append(max_bytes)
+    return sizes
+
+
+def iterations(nbytes, budget=64 << 20):
+    """Jumlah iterasi per repetisi: banyak untuk pesan kecil, sedikit untuk pesan besar"""
+    return max(2, min(1000, budget // max(nbytes, 1)))
+
+
+def uneven_counts(elems):
+    """Counts tak seragam (rank i ~ i+1 bagian) dengan total = elems * size, pola scatter_gather_uneven"""
+    total = elems * size
+    weights = [i + 1 for i in range(size)]
+    counts = [total * w // sum(weights) for w in weights]
+    counts[-1] += total - sum(counts)
+    displs = [sum(counts[:i]) for i in range(size)]
+    return counts, displs
+
+
+# -------------------------------
+# Operasi (satu iterasi)
+# -------------------------------
+def make_op(op, api, nbytes):
+    """Siapkan buffer dan kembalikan fungsi satu iterasi operasi; None jika op tidak berlaku"""
+    elems = max(nbytes // 8, 1)
+    local = np.full(elems, float(rank))
+
+    if op == 'pingpong':
+        if size < 2:
+            return None
+        if api == 'pickle':
+            def run():
+                if rank == 0:
+                    comm.send(local, dest=1, tag=0)
+                    comm.recv(source=1, tag=0)
+                elif rank == 1:
+                    comm.send(comm.recv(source=0, tag=0), dest=0, tag=0)
+        else:
+            recv = np.empty_like(local)
+
+            def run():
+                if rank == 0:
+                    comm.Send(local, dest=1, tag=0)
+                    comm.Recv(recv, source=1, tag=0)
+                elif rank == 1:
+                    comm.Recv(recv, source=0, tag=0)
+                    comm.Send(recv, dest=0, tag=0)
+        return run
+
+    if op == 'bcast':
+        if api == 'pickle':
+            return lambda: comm.bcast(local if rank == 0 else None, root=0)
+        return lambda: comm.Bcast(local, root=0)
+
+    if op in ('scatter', 'scatterv'):
+        counts, displs = uneven_counts(elems) if op == 'scatterv' else ([elems] * size, [elems * i for i in range(size)])
+        full = np.zeros(sum(counts)) if rank == 0 else None
+        if api == 'pickle':
+            parts = [full[d:d + c] for c, d in zip(counts, displs)] if rank == 0 else None
+            return lambda: comm.scatter(parts, root=0)
+        recv = np.empty(counts[rank])
+        if op == 'scatter':
+            return lambda: comm.Scatter(full, recv, root=0)
+        return lambda: comm.Scatterv([full, (counts, displs)] if rank == 0 else None, recv, root=0)
+
+    if op in ('gather', 'gatherv'):
+        counts, displs = uneven_counts(elems) if op == 'gatherv' else ([elems] * size, [elems * i for i in range(size)])
+        part = np.full(counts[rank], float(rank))
+        if api == 'pickle':
+            return lambda: comm.gather(part, root=0)
+        full = np.empty(sum(counts)) if rank == 0 else None
+        if op == 'gather':
+            return lambda: comm.Gather(part, full, root=0)
+        return lambda: comm.Gatherv(part, [full, (counts, displs)] if rank == 0 else None, root=0)
+
+    if op in ('reduce', 'allreduce'):
+        out = np.empty_like(local)
+        if api == 'pickle':
+            if op == 'reduce':
+                return lambda: comm.reduce(local, op=MPI.SUM, root=0)
+            return lambda: comm.allreduce(local, op=MPI.SUM)
+        if op == 'reduce':
+            return lambda: comm.Reduce(local, out if rank == 0 else None, op=MPI.SUM, root=0)
+        return lambda: comm.Allreduce(local, out, op=MPI.SUM)
+
+    raise ValueError(f"operasi tidak dikenal: {op}")
+
+
+def measure(op, api, nbytes, reps):
+    """Sampel waktu per operasi (detik) untuk setiap repetisi; waktu = maksimum antar rank"""
+    run = make_op(op, api, nbytes)
+    if run is None:
+        return None
+    iters = iterations(nbytes)
+    run()  # warm-up (alokasi, koneksi)
+    samples = []
+    for _ in range(reps):
+        comm.Barrier()
+        t0 = MPI.Wtime()
+        for _ in range(iters):
+            run()
+        elapsed = (MPI.Wtime() - t0) / iters
+        if op == 'pingpong':
+            elapsed /= 2  # latency satu arah
+        samples.append(comm.allreduce(elapsed, op=MPI.MAX))
+    return samples
+
+
+# -------------------------------
+# Tabel format harness
+# -------------------------------
+def table_points(results, procs):
+    """Titik tabel bench_scaling untuk satu (op, api): satu baris per ukuran pesan"""
+    points = []
+    for nbytes, samples in results:
+        points.append({
+            'procs': procs,
+            'threads': 1,
+            'mode': f'msg{nbytes}',
+            'rows': nbytes,
+            'bytes': nbytes,
+            'speedup': None,
+            'efficiency': None,
+            'samples': samples,
+            'stats': bench_scaling.summarize_samples(samples)
+        })
+    return points
+
+
+def merge_with_existing(path, points):
+    """Gabungkan dengan tabel lama (procs lain dipertahankan), urut ukuran pesan lalu procs"""
+    merged = {(p['procs'], p['mode']): p for p in points}
+    if os.path.exists(path):
+        for row in bench_scaling.read_table(path):
+            key = (row['procs'], row['mode'])
+            if key not in merged:
+                merged[key] = {
+                    'procs': row['procs'],
+                    'threads': row['threads'],
+                    'mode': row['mode'],
+                    'rows': row['rows'],
+                    'bytes': row['rows'],
+                    'speedup': None,
+                    'efficiency': None,
+                    'samples': row['samples'],
+                    'stats': bench_scaling.summarize_samples(row['samples'])
+                }
+    return sorted(merged.values(), key=lambda p: (p['rows'], p['procs']))
+
+
+def fmt_bandwidth(nbytes, seconds):
+    return f"{nbytes / seconds / 1e6:>10.1f}" if seconds > 0 else f"{'-':>10}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmark komunikasi MPI (latency & bandwidth)')
+    parser.add_argument('--ops', default=','.join(OPS))
+    parser.add_argument('--apis', default=','.join(APIS))
+    parser.add_argument('--min-bytes', type=int, default=8)
+    parser.add_argument('--max-bytes', type=int, default=256 << 20)
+    parser.add_argument('--factor', type=int, default=8, help='kelipatan ukuran pesan')
+    parser.add_argument('--reps', type=int, default=5)
+    parser.add_argument('--out-dir', default=OUT_DIR)
+    parser.add_argument('--no-tables', action='store_true')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    ops = [o for o in args.ops.split(',') if o]
+    apis = [a for a in args.apis.split(',') if a]
+    sizes = message_sizes(args.min_bytes, args.max_bytes, args.factor)
+    doc = bench_metrics.new_result("bench_comm", size, host=bench_metrics.host_fingerprint())
+
+    if rank == 0:
+        print("=" * 78)
+        print(" " * 20 + "MICROBENCHMARK KOMUNIKASI MPI")
+        print("=" * 78)
+        print(f"Proses MPI: {size}, repetisi: {args.reps}, ukuran: {sizes[0]} B - {sizes[-1]:,} B\n")
+
+    for op in ops:
+        per_api = {}
+        for api in apis:
+            results = []
+            for nbytes in sizes:
+                samples = measure(op, api, nbytes, args.reps)
+                if samples is None:
+                    break
+                results.append((nbytes, samples))
+            per_api[api] = results
+
+        if rank != 0:
+            continue
+        if not any(per_api.values()):
+            print(f"[{op}] dilewati (butuh minimal 2 proses)\n")
+            continue
+
+        print(f"[{op}] latency (us) / bandwidth (MB/s) per rank")
+        header = f"{'bytes':>12}"
+        for api in apis:
+            header += f" | {api + ' us':>12} {'MB/s':>10}"
+        print(header)
+        print("-" * len(header))
+        medians = {api: {n: bench_scaling.summarize_samples(s)['median'] for n, s in per_api[api]} for api in apis}
+        for nbytes in sizes:
+            line = f"{nbytes:>12,}"
+            for api in apis:
+                t = medians[api].get(nbytes)
+                line += f" | {t * 1e6:>12.2f} {fmt_bandwidth(nbytes, t)}" if t is not None else f" | {'-':>12} {'-':>10}"
+            print(line)
+            t_pickle = medians.get('pickle', {}).get(nbytes)
+            t_buffer = medians.get('buffer', {}).get(nbytes)
+            bench_metrics.add_point(doc, nbytes, serial_time=t_pickle, parallel_time=t_buffer, op=op,
+                                    latency={api: medians[api].get(nbytes) for api in apis})
+        print()
+
+        if not args.no_tables:
+            os.makedirs(args.out_dir, exist_ok=True)
+            for api in apis:
+                if not per_api[api]:
+                    continue
+                name = f"bench_comm_{op}_{api}"
+                path = os.path.join(args.out_dir, name + '.csv')
+                points = merge_with_existing(path, table_points(per_api[api], size))
+                bench_scaling.write_tables(points, args.out_dir, name, digits=9, extra_fields=('bytes',))
+
+    if rank == 0:
+        if not args.no_tables:
+            print(f">> Tabel ditulis ke {args.out_dir} (bench_comm_<op>_<api>.csv/.md)")
+        print("'speedup' pada dokumen JSON = waktu pickle / waktu buffer")
+        bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
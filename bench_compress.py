@@ -0,0 +1,115 @@
+"""
+Benchmark Kompresi Payload: chunk karyawan pickle rank 0 -> rank 1
+dengan codec none / zlib / lzma / auto (mpi_transport.send_compressed)
+
+Cara menjalankan:
+    mpiexec -n 2 python bench_compress.py
+    mpiexec -n 2 python bench_compress.py --sizes=10000,100000,1000000 --links=100,1000,10000 --json
+
+Waktu transfer = kompresi + kirim + dekompresi (sampai objek siap di rank 1), minimum dari --reps.
+Tabel kedua: codec yang dipilih mode auto pada bandwidth link simulasi (--links, MB/s).
+"""
+
+from mpi4py import MPI  # type: ignore
+import argparse
+import pickle
+import random
+
+import bench_metrics
+import mpi_transport
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+CODECS = (('none', None), ('zlib', 1), ('zlib', 6), ('lzma', 0), ('lzma', 1), ('auto', None))
+JABATAN = ["Manager", "Staff", "Supervisor", "Admin", "Developer"]
+
+
+def payroll_chunk(n):
+    """Chunk seperti payroll_full_mpi: (offset, karyawan, absen)"""
+    rng = random.Random(0)
+    karyawan = [{"id": f"K{i+1:04d}", "nama": f"Karyawan {i+1}", "jabatan": JABATAN[i % 5],
+                 "gaji_pokok": 150000 + (i % 5) * 50000} for i in range(n)]
+    absen = [{"id": f"K{i+1:04d}", "hari_masuk": rng.randint(20, 26)} for i in range(n)]
+    return 0, karyawan, absen
+
+
+def transfer(obj, codec, level, reps):
+    """(waktu transfer minimum, catatan send terakhir) rank 0 -> rank 1"""
+    best = None
+    record = None
+    for _ in range(reps):
+        comm.Barrier()
+        t0 = MPI.Wtime()
+        if rank == 0:
+            record = mpi_transport.send_compressed(comm, obj, 1, tag=0, codec=codec, level=level)
+        elif rank == 1:
+            mpi_transport.recv_compressed(comm, source=0, tag=0)
+        elapsed = comm.allreduce(MPI.Wtime() - t0, op=MPI.MAX)
+        best = elapsed if best is None else min(best, elapsed)
+    del mpi_transport.transfer_log[:]
+    return best, record
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark kompresi payload antar rank')
+    parser.add_argument('--sizes', default='10000,100000,500000')
+    parser.add_argument('--links', default='100,1000,10000', help='bandwidth simulasi mode auto (MB/s)')
+    parser.add_argument('--reps', type=int, default=3)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if size < 2:
+        if rank == 0:
+            print("[X] Butuh minimal 2 proses MPI")
+        return
+
+    bandwidth = mpi_transport.link_bandwidth(comm)
+    doc = bench_metrics.new_result("bench_compress", size, link_mbps=bandwidth / 1e6,
+                                   min_bytes=mpi_transport.COMPRESS_MIN_BYTES)
+    sizes = [int(n) for n in args.sizes.split(',') if n]
+
+    if rank == 0:
+        print("=" * 84)
+        print(" " * 22 + "BENCHMARK KOMPRESI PAYLOAD ANTAR RANK")
+        print("=" * 84)
+        print(f"Bandwidth link terukur: {bandwidth / 1e6:,.0f} MB/s, ambang kompresi: "
+              f"{mpi_transport.COMPRESS_MIN_BYTES:,} B\n")
+        print(f"{'Karyawan':>10} {'Codec':<9} {'Raw MB':>8} {'Wire MB':>8} {'Rasio':>7} "
+              f"{'Kompres':>9} {'Transfer':>9} {'vs none':>8}")
+        print("-" * 84)
+
+    for n in sizes:
+        obj = payroll_chunk(n) if rank == 0 else None
+        baseline = None
+        for codec, level in CODECS:
+            elapsed, record = transfer(obj, codec, level, args.reps)
+            if rank != 0:
+                continue
+            if baseline is None:
+                baseline = elapsed
+            label = record['codec'] + (f"-{record['level']}" if record['level'] is not None else "")
+            if codec == 'auto':
+                label = f"auto:{label}"
+            print(f"{n:>10,} {label:<9} {record['raw_bytes'] / 1e6:>8.2f} {record['wire_bytes'] / 1e6:>8.2f} "
+                  f"{record['ratio']:>6.1f}x {record['compress_time'] * 1000:>7.1f}ms "
+                  f"{elapsed * 1000:>7.1f}ms {(baseline - elapsed) * 1000:>+6.1f}ms")
+            bench_metrics.add_point(doc, n, serial_time=baseline, parallel_time=elapsed, codec=label,
+                                    raw_bytes=record['raw_bytes'], wire_bytes=record['wire_bytes'],
+                                    ratio=record['ratio'], compress_time=record['compress_time'])
+        if rank == 0:
+            print()
+
+    if rank == 0 and sizes:
+        data = pickle.dumps(payroll_chunk(sizes[-1]), protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"Pilihan mode auto untuk {sizes[-1]:,} karyawan per bandwidth link:")
+        for mbps in (float(x) for x in args.links.split(',') if x):
+            codec, level = mpi_transport.choose_codec(data, mbps * 1e6)
+            print(f"  {mbps:>8,.0f} MB/s -> {codec}{'' if level is None else f'-{level}'}")
+        print("\n'vs none' = waktu transfer tanpa kompresi - waktu codec (positif = lebih cepat)")
+        bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark Parser Kolom CSV: csv.reader per baris vs scanner mmap (regex) vs NumPy tervektorisasi
+Mengukur rows/s satu proses untuk menjumlahkan satu kolom numerik pada seluruh file.
+
+Cara menjalankan:
+    python bench_csv_parse.py big.csv
+    python bench_csv_parse.py big.csv --col 2 --reps 5 --window 8388608 --json
+
+Waktu = minimum dari --reps (cache halaman OS sudah hangat setelah putaran pertama).
+"""
+
+import argparse
+import csv
+import os
+import time
+
+import bench_metrics
+import csv_numpy
+import csv_partition
+import csv_scan
+
+
+def sum_csv_reader(path, start, end, col):
+    """Jalur lama: csv.reader + float() per baris dengan try/except"""
+    total = 0.0
+    count = 0
+    for row in csv.reader(csv_partition.iter_lines(path, start, end)):
+        try:
+            total += float(row[col])
+            count += 1
+        except (ValueError, IndexError):
+            pass
+    return total, count
+
+
+def parsers(window):
+    """Nama -> fungsi (path, start, end, col) -> (sum, count)"""
+    funcs = {
+        'csv': sum_csv_reader,
+        'mmap': lambda p, s, e, c: csv_scan.sum_column(p, s, e, c, window=window)[:2],
+    }
+    if csv_numpy.HAS_NUMPY:
+        funcs['numpy'] = lambda p, s, e, c: csv_numpy.sum_column(p, s, e, c, window=window)[:2]
+    return funcs
+
+
+def measure(func, path, start, end, col, reps):
+    """(waktu minimum, sum, count)"""
+    best = None
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        total, count = func(path, start, end, col)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, total, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark rows/s parser kolom CSV')
+    parser.add_argument('path', nargs='?', default=os.getenv('CSV_PATH', 'big.csv'))
+    parser.add_argument('--col', type=int, default=2, help='indeks kolom numerik (default: value)')
+    parser.add_argument('--no-header', action='store_true')
+    parser.add_argument('--reps', type=int, default=3)
+    parser.add_argument('--window', type=int, default=csv_scan.WINDOW_SIZE, help='bytes per jendela scanner')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    with open(args.path, 'rb') as f:
+        start = csv_partition.data_start(f, not args.no_header)
+        end = os.fstat(f.fileno()).st_size
+    mbytes = (end - start) / 1e6
+
+    results = {name: measure(func, args.path, start, end, args.col, args.reps)
+               for name, func in parsers(args.window).items()}
+    base_time = results['csv'][0]
+
+    doc = bench_metrics.new_result("bench_csv_parse", 1, path=args.path, col=args.col,
+                                   window=args.window, mbytes=mbytes)
+    print("=" * 72)
+    print(" " * 14 + "BENCHMARK PARSER KOLOM CSV (1 proses)")
+    print("=" * 72)
+    print(f"File: {args.path} ({mbytes:.1f} MB), kolom {args.col}, reps {args.reps}\n")
+    print(f"{'Parser':<8} {'Waktu':>9} {'Rows/s':>14} {'MB/s':>9} {'Speedup':>8} {'Rows':>10} {'Sum':>20}")
+    print("-" * 72)
+    for name, (elapsed, total, count) in results.items():
+        rows_s = count / elapsed if elapsed > 0 else 0.0
+        print(f"{name:<8} {elapsed:>8.3f}s {rows_s:>14,.0f} {csv_scan.throughput_mbs(end - start, elapsed):>9.1f} "
+              f"{base_time / elapsed:>7.2f}x {count:>10} {total:>20.6f}")
+        bench_metrics.add_point(doc, count, serial_time=base_time, parallel_time=elapsed, parser=name,
+                                rows_per_s=rows_s, sum=total)
+    print("\nSpeedup relatif terhadap csv.reader; selisih sum di digit terakhir berasal dari urutan penjumlahan")
+    bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark Kolektif Hierarkis: gather/reduce datar vs dua tingkat (mpi_hierarchy)
+Dengan banyak rank, root pada kolektif datar menerima size - 1 pesan; versi hierarkis
+hanya menerima dari rank se-node dan dari node leader lain.
+
+Cara menjalankan (simulasi 64 rank = 8 node x 8 rank di satu mesin):
+    mpiexec --oversubscribe -n 64 python bench_hier.py --node-size 8
+    mpiexec -n 16 python bench_hier.py --node-size 4 --iters 200 --payload 1024 --json
+
+Tanpa --node-size dipakai topologi fisik (COMM_TYPE_SHARED).
+"""
+
+from mpi4py import MPI  # type: ignore
+import argparse
+import os
+
+import bench_metrics
+import mpi_hierarchy
+import mpi_transport
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+
+def make_ops(payload, vector):
+    """Operasi yang dibandingkan: nama -> fungsi satu iterasi (memakai mode MPI_HIER saat ini)"""
+    np = mpi_transport.np
+    obj = {"rank": rank, "total_gaji": float(rank), "blob": bytes(payload)}
+    sendbuf = np.full(vector, float(rank))
+    recvbuf = np.empty(vector) if rank == 0 else None
+    return {
+        'gather': lambda: mpi_hierarchy.gather(comm, obj, root=0),
+        'reduce': lambda: mpi_hierarchy.reduce(comm, float(rank), op=MPI.SUM, root=0),
+        'Reduce': lambda: mpi_hierarchy.Reduce(comm, sendbuf, recvbuf, op=MPI.SUM, root=0),
+    }
+
+
+def measure(run, iters):
+    """(waktu per operasi di root, waktu per operasi critical path) dalam detik"""
+    run()  # warm-up
+    comm.Barrier()
+    t0 = MPI.Wtime()
+    for _ in range(iters):
+        run()
+    local = (MPI.Wtime() - t0) / iters
+    slowest = comm.allreduce(local, op=MPI.MAX)
+    root_time = comm.bcast(local, root=0)
+    return root_time, slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark gather/reduce datar vs hierarkis')
+    parser.add_argument('--node-size', type=int, help='rank per node simulasi (default: topologi fisik)')
+    parser.add_argument('--iters', type=int, default=100)
+    parser.add_argument('--payload', type=int, default=256, help='bytes per rank untuk gather')
+    parser.add_argument('--vector', type=int, default=100_000, help='panjang vektor float64 untuk Reduce')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if args.node_size:
+        os.environ['HIER_NODE_SIZE'] = str(args.node_size)
+    nodes = mpi_hierarchy.num_nodes(comm)
+    ops = make_ops(args.payload, args.vector)
+
+    results = {}
+    for mode in ('0', '1'):
+        os.environ['MPI_HIER'] = mode
+        for name, run in ops.items():
+            results[(name, mode)] = measure(run, args.iters)
+    messages = {mode: mpi_hierarchy.root_messages(comm, mode == '1') for mode in ('0', '1')}
+
+    if rank != 0:
+        return
+
+    doc = bench_metrics.new_result("bench_hier", size, nodes=nodes, node_size=args.node_size,
+                                   payload=args.payload, vector=args.vector)
+    print("=" * 78)
+    print(" " * 16 + "BENCHMARK KOLEKTIF: DATAR vs HIERARKIS DUA TINGKAT")
+    print("=" * 78)
+    print(f"Proses MPI: {size}, node: {nodes}, iterasi: {args.iters}")
+    print(f"Pesan masuk root per operasi: datar {messages['0']}, hierarkis {messages['1']}\n")
+    print(f"{'Operasi':<8} {'Root datar':>12} {'Root hier':>12} {'Max datar':>12} {'Max hier':>12} {'Speedup':>8}")
+    print("-" * 78)
+    for name in ops:
+        flat_root, flat_max = results[(name, '0')]
+        hier_root, hier_max = results[(name, '1')]
+        speedup = flat_max / hier_max if hier_max > 0 else 0
+        print(f"{name:<8} {flat_root * 1e6:>10.1f}us {hier_root * 1e6:>10.1f}us "
+              f"{flat_max * 1e6:>10.1f}us {hier_max * 1e6:>10.1f}us {speedup:>7.2f}x")
+        bench_metrics.add_point(doc, size, serial_time=flat_max, parallel_time=hier_max, op=name,
+                                root_flat=flat_root, root_hier=hier_root,
+                                root_messages_flat=messages['0'], root_messages_hier=messages['1'])
+    print("\nRoot = waktu per operasi di rank 0, Max = critical path antar rank")
+    print("'speedup' pada dokumen JSON = critical path datar / hierarkis")
+    bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Metadata & Metrics Benchmark
+Helper untuk identitas host, revisi git, dokumen hasil JSON (--json),
+dan parsing metrik dari output program MPI
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Pola teks yang dicetak oleh program benchmark (lihat demo_payroll_*.py, csv_parallel_*.py)
+_RE_SPEEDUP = re.compile(r"^\s*(?:>>\s*)?Speedup:\s*([\d.]+)x", re.MULTILINE)
+_RE_EFISIENSI = re.compile(r"^\s*(?:>>\s*)?Efisiensi:\s*([\d.]+)%", re.MULTILINE)
+_RE_AVG_SPEEDUP = re.compile(r"Rata-rata Speedup:\s*([\d.]+)x")
+_RE_AVG_EFISIENSI = re.compile(r"Rata-rata Efisiensi:\s*([\d.]+)%")
+_RE_CSV_TIME = re.compile(r"time=([\d.]+)s, procs=(\d+)")
+
+# Baris dokumen hasil JSON diawali penanda ini agar mudah dipisahkan dari output biasa
+JSON_MARKER = "BENCH_JSON "
+
+
+def host_fingerprint():
+    """Sidik jari host: hash dari nama mesin, arsitektur, CPU dan jumlah core"""
+    parts = [
+        platform.node(),
+        platform.machine(),
+        platform.processor(),
+        platform.system(),
+        str(multiprocessing.cpu_count()),
+    ]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def git_revision():
+    """Revisi git (commit hash) dari working tree, None jika tidak tersedia"""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=BASE_DIR
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except Exception:
+        pass
+    return None
+
+
+# -------------------------------
+# Dokumen hasil JSON
+# -------------------------------
+def json_mode():
+    """True jika program diminta mengeluarkan dokumen JSON (--json atau BENCH_JSON=1)"""
+    return '--json' in sys.argv or os.getenv('BENCH_JSON', '0') not in ('', '0')
+
+
+def bench_sizes(default):
+    """Ukuran masalah yang diuji; bisa dioverride lewat env BENCH_SIZES (mis. "1000,5000")"""
+    value = os.getenv('BENCH_SIZES', '').strip()
+    if not value:
+        return default
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def new_result(program, ranks, **extra):
+    """Buat dokumen hasil benchmark kosong"""
+    doc = {
+        'program': program,
+        'ranks': ranks,
+        'sizes': [],
+        'results': []
+    }
+    doc.update(extra)
+    return doc
+
+
+def add_point(doc, size, serial_time=None, parallel_time=None, rank_times=None, **extra):
+    """Tambah satu titik pengukuran (satu ukuran masalah) ke dokumen hasil"""
+    speedup = None
+    efficiency = None
+    if serial_time is not None and parallel_time:
+        speedup = serial_time / parallel_time
+        efficiency = speedup / doc['ranks']
+
+    point = {
+        'size': size,
+        'serial_time': serial_time,
+        'parallel_time': parallel_time,
+        'speedup': speedup,
+        'efficiency': efficiency,
+        'rank_times': list(rank_times) if rank_times is not None else None
+    }
+    point.update(extra)
+    doc['sizes'].append(size)
+    doc['results'].append(point)
+    return point
+
+
+def summarize(doc):
+    """Hitung rata-rata speedup/efisiensi dari semua titik yang punya speedup"""
+    speedups = [p['speedup'] for p in doc['results'] if p['speedup'] is not None]
+    efisiensi = [p['efficiency'] for p in doc['results'] if p['efficiency'] is not None]
+    doc['summary'] = {
+        'avg_speedup': sum(speedups) / len(speedups) if speedups else None,
+        'avg_efficiency': sum(efisiensi) / len(efisiensi) if efisiensi else None
+    }
+    return doc
+
+
+def emit_result(doc):
+    """Cetak dokumen hasil sebagai satu baris JSON (hanya jika mode JSON aktif)"""
+    if not json_mode():
+        return
+    summarize(doc)
+    print(JSON_MARKER + json.dumps(doc), flush=True)
+
+
+def extract_result(output):
+    """Ambil dokumen hasil JSON terakhir dari stdout program, None jika tidak ada"""
+    if not output:
+        return None
+    for line in reversed(output.splitlines()):
+        if line.startswith(JSON_MARKER):
+            try:
+                return json.loads(line[len(JSON_MARKER):])
+            except ValueError:
+                return None
+    return None
+
+
+def metrics_from_result(doc):
+    """Ringkas dokumen hasil JSON ke bentuk metrik yang disimpan di riwayat benchmark"""
+    if 'summary' not in doc:
+        summarize(doc)
+    metrics = {
+        'speedups': [p['speedup'] for p in doc['results'] if p['speedup'] is not None],
+        'efficiencies': [p['efficiency'] for p in doc['results'] if p['efficiency'] is not None],
+        'ranks': doc.get('ranks'),
+        'result': doc
+    }
+    if doc['summary']['avg_speedup'] is not None:
+        metrics['speedup'] = doc['summary']['avg_speedup']
+    if doc['summary']['avg_efficiency'] is not None:
+        metrics['efficiency'] = doc['summary']['avg_efficiency']
+    parallel_times = [p['parallel_time'] for p in doc['results'] if p['parallel_time'] is not None]
+    if parallel_times:
+        metrics['parallel_time'] = parallel_times[-1]
+    return metrics
+
+
+# -------------------------------
+# Parsing output teks (fallback)
+# -------------------------------
+def parse_metrics(output):
+    """Ambil metrik dari stdout program: dokumen JSON jika ada, selain itu parsing teks"""
+    metrics = {}
+    if not output:
+        return metrics
+
+    doc = extract_result(output)
+    if doc is not None:
+        return metrics_from_result(doc)
+
+    speedups = [float(v) for v in _RE_SPEEDUP.findall(output)]
+    efisiensi = [float(v) / 100 for v in _RE_EFISIENSI.findall(output)]
+    if speedups:
+        metrics['speedups'] = speedups
+    if efisiensi:
+        metrics['efficiencies'] = efisiensi
+
+    avg_speedup = _RE_AVG_SPEEDUP.search(output)
+    if avg_speedup:
+        metrics['speedup'] = float(avg_speedup.group(1))
+    elif speedups:
+        metrics['speedup'] = speedups[-1]
+
+    avg_efisiensi = _RE_AVG_EFISIENSI.search(output)
+    if avg_efisiensi:
+        metrics['efficiency'] = float(avg_efisiensi.group(1)) / 100
+    elif efisiensi:
+        metrics['efficiency'] = efisiensi[-1]
+
+    csv_time = _RE_CSV_TIME.search(output)
+    if csv_time:
+        metrics['parallel_time'] = float(csv_time.group(1))
+        metrics['ranks'] = int(csv_time.group(2))
+
+    return metrics
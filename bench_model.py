@@ -0,0 +1,258 @@
+"""
+Model Scaling Amdahl/Gustafson
+Fitting fraksi serial dan overhead komunikasi dari titik benchmark yang tersimpan,
+prediksi speedup pada jumlah proses yang belum diuji, dan rekomendasi jumlah proses
+
+Model waktu (strong scaling):
+    T(p) = a + b/p + c*log2(p)
+    a = bagian serial, b = bagian paralel, c = overhead komunikasi (tree collective)
+Fraksi serial Amdahl f = a / (a + b); Gustafson s dari scaled speedup (weak scaling)
+
+Contoh:
+    python bench_model.py                      # semua tabel bench_*.csv di repo
+    python bench_model.py compute_bound --max-procs 64 --min-efficiency 0.6
+"""
+
+import argparse
+import glob
+import math
+import os
+import statistics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Efisiensi minimum agar penambahan proses masih dianggap "cost-optimal"
+DEFAULT_MIN_EFFICIENCY = 0.5
+
+_TERMS = {
+    'a': lambda p: 1.0,
+    'b': lambda p: 1.0 / p,
+    'c': lambda p: math.log2(p)
+}
+
+
+def _solve(matrix, vector):
+    """Eliminasi Gauss dengan pivoting parsial (sistem kecil, tanpa numpy)"""
+    n = len(vector)
+    m = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-15:
+            return None
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(col + 1, n):
+            factor = m[r][col] / m[col][col]
+            for k in range(col, n + 1):
+                m[r][k] -= factor * m[col][k]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        x[r] = (m[r][n] - sum(m[r][k] * x[k] for k in range(r + 1, n))) / m[r][r]
+    return x
+
+
+def _least_squares(points, terms):
+    """Least squares T(p) = sum(coef * term(p)); kembalikan (koefisien, SSE)"""
+    funcs = [_TERMS[t] for t in terms]
+    ata = [[sum(f(p) * g(p) for p, _ in points) for g in funcs] for f in funcs]
+    aty = [sum(f(p) * t for p, t in points) for f in funcs]
+    coef = _solve(ata, aty)
+    if coef is None:
+        return None, math.inf
+    sse = sum((t - sum(c * f(p) for c, f in zip(coef, funcs))) ** 2 for p, t in points)
+    return dict(zip(terms, coef)), sse
+
+
+def fit_time_model(points):
+    """
+    Fit T(p) ke titik (procs, waktu). Dicoba beberapa subset suku dan dipilih yang
+    koefisiennya non-negatif dengan SSE terkecil.
+    """
+    distinct = {p for p, _ in points}
+    candidates = [('a', 'b', 'c'), ('a', 'b'), ('b', 'c'), ('b',)]
+    best = None
+    for terms in candidates:
+        if len(terms) > len(distinct):
+            continue
+        coef, sse = _least_squares(points, terms)
+        if coef is None or any(v < 0 for v in coef.values()):
+            continue
+        if best is None or sse < best[1] - 1e-12:
+            best = (coef, sse)
+    if best is None:
+        return None
+    coef = {t: best[0].get(t, 0.0) for t in _TERMS}
+    coef['rmse'] = math.sqrt(best[1] / len(points))
+    return coef
+
+
+def predict_time(model, p):
+    return model['a'] + model['b'] / p + model['c'] * math.log2(p)
+
+
+def predict_speedup(model, p):
+    t = predict_time(model, p)
+    return predict_time(model, 1) / t if t > 0 else 0.0
+
+
+def karp_flatt(speedup, p):
+    """Fraksi serial eksperimental Karp–Flatt; naik seiring p = overhead bertambah"""
+    if p <= 1 or speedup <= 0:
+        return None
+    return (1 / speedup - 1 / p) / (1 - 1 / p)
+
+
+def gustafson_fraction(points):
+    """Fraksi serial Gustafson s dari weak scaling: S(p) = p - s*(p - 1), S = p*T(1)/T(p)"""
+    base = dict(points).get(1)
+    if base is None:
+        return None
+    num = den = 0.0
+    for p, t in points:
+        if p <= 1 or t <= 0:
+            continue
+        scaled = p * base / t
+        num += (p - scaled) * (p - 1)
+        den += (p - 1) ** 2
+    return min(max(num / den, 0.0), 1.0) if den else None
+
+
+def recommend(model, max_procs, min_efficiency=DEFAULT_MIN_EFFICIENCY):
+    """
+    Jumlah proses cost-optimal: speedup terbesar di antara p yang efisiensinya >= min_efficiency.
+    Juga dikembalikan p dengan waktu minimum (time-optimal) sebagai pembanding.
+    """
+    best_p, best_speedup = 1, 1.0
+    time_opt = min(range(1, max_procs + 1), key=lambda p: predict_time(model, p))
+    for p in range(1, max_procs + 1):
+        s = predict_speedup(model, p)
+        if s / p >= min_efficiency and s > best_speedup:
+            best_p, best_speedup = p, s
+    return {
+        'recommended_processes': best_p,
+        'recommended_speedup': best_speedup,
+        'recommended_efficiency': best_speedup / best_p,
+        'time_optimal_processes': time_opt
+    }
+
+
+def analyze(program, points, mode='strong', max_procs=None, min_efficiency=DEFAULT_MIN_EFFICIENCY):
+    """Analisis lengkap satu program dari titik (procs, waktu median)"""
+    points = sorted(points)
+    max_procs = max_procs or os.cpu_count() or 1
+    result = {'program': program, 'mode': mode, 'points': points}
+
+    if mode == 'weak':
+        result['gustafson_serial_fraction'] = gustafson_fraction(points)
+        return result
+
+    model = fit_time_model(points)
+    if model is None:
+        return result
+    t1 = predict_time(model, 1)
+    result['model'] = model
+    result['serial_fraction'] = model['a'] / (model['a'] + model['b']) if (model['a'] + model['b']) > 0 else None
+    result['comm_overhead'] = model['c'] / t1 if t1 > 0 else None
+    measured_t1 = dict(points).get(1)
+    if measured_t1:
+        result['karp_flatt'] = {p: karp_flatt(measured_t1 / t, p) for p, t in points if p > 1}
+    probe = sorted({p for p, _ in points} | {2 ** k for k in range(int(math.log2(max_procs)) + 1)} | {max_procs})
+    result['predicted_speedup'] = {p: predict_speedup(model, p) for p in probe}
+    result.update(recommend(model, max_procs, min_efficiency))
+    return result
+
+
+# -------------------------------
+# Sumber titik benchmark
+# -------------------------------
+def points_from_table(path):
+    """Titik (procs, median waktu) per mode dari tabel bench_*.csv"""
+    import bench_scaling
+    rows = bench_scaling.infer_mode(bench_scaling.read_table(path))
+    by_mode = {}
+    for r in rows:
+        if r['threads'] != 1 or bench_scaling.is_message_mode(r['mode']):
+            continue  # tabel bench_comm (msg<bytes>) bukan data scaling
+        by_mode.setdefault(r['mode'], []).append((r['procs'], statistics.median(r['samples'])))
+    return by_mode
+
+
+def points_from_db(program_id=None, host=None, limit=1000):
+    """Titik (procs, median waktu) per program dari riwayat benchmark di database"""
+    import db_helper
+    runs = db_helper.get_benchmark_timings(limit, program_id, host)  # hanya kolom waktu, tanpa stdout
+    samples = {}
+    for r in runs:
+        t = r['metrics'].get('parallel_time') or r['elapsed_time']
+        samples.setdefault(r['program_id'], {}).setdefault(r['num_processes'], []).append(t)
+    return {prog: [(p, statistics.median(ts)) for p, ts in by_p.items()] for prog, by_p in samples.items()}
+
+
+def table_points(base_dir=BASE_DIR):
+    """Titik strong scaling dari semua tabel bench_*.csv di folder repo"""
+    points = {}
+    for path in sorted(glob.glob(os.path.join(base_dir, 'bench_*.csv'))):
+        name = os.path.splitext(os.path.basename(path))[0][len('bench_'):]
+        by_mode = points_from_table(path)
+        if 'strong' in by_mode:
+            points[name] = by_mode['strong']
+    return points
+
+
+def recommendations(max_procs, min_efficiency=DEFAULT_MIN_EFFICIENCY, use_db=True, host=None):
+    """Rekomendasi per program: riwayat database lebih diutamakan, fallback tabel bench_*.csv"""
+    sources = table_points()
+    if use_db:
+        try:
+            sources.update({k: v for k, v in points_from_db(host=host).items() if len({p for p, _ in v}) >= 2})
+        except Exception as e:
+            print(f"[MODEL] Riwayat database tidak tersedia: {e}")
+    result = {}
+    for program, points in sources.items():
+        analysis = analyze(program, points, 'strong', max_procs, min_efficiency)
+        if 'recommended_processes' in analysis:
+            result[program] = analysis
+    return result
+
+
+def format_analysis(a):
+    lines = [f"== {a['program']} ({a['mode']}) =="]
+    lines.append("   titik: " + ", ".join(f"p={p}: {t:.4f}s" for p, t in a['points']))
+    if a['mode'] == 'weak':
+        s = a.get('gustafson_serial_fraction')
+        lines.append(f"   fraksi serial Gustafson: {s:.3f}" if s is not None else "   data tidak cukup")
+        return '\n'.join(lines)
+    if 'model' not in a:
+        lines.append("   data tidak cukup untuk fitting")
+        return '\n'.join(lines)
+    m = a['model']
+    lines.append(f"   T(p) = {m['a']:.4f} + {m['b']:.4f}/p + {m['c']:.4f}*log2(p)   (rmse {m['rmse']:.4f})")
+    lines.append(f"   fraksi serial Amdahl: {a['serial_fraction']:.3f}, overhead komunikasi: {a['comm_overhead']:.3f}/log2(p)")
+    if a.get('karp_flatt'):
+        lines.append("   Karp-Flatt: " + ", ".join(f"p={p}: {e:.3f}" for p, e in a['karp_flatt'].items()))
+    lines.append("   prediksi speedup: " + ", ".join(f"p={p}: {s:.2f}x" for p, s in a['predicted_speedup'].items()))
+    lines.append(f"   rekomendasi: {a['recommended_processes']} proses "
+                 f"(speedup {a['recommended_speedup']:.2f}x, efisiensi {a['recommended_efficiency'] * 100:.1f}%), "
+                 f"time-optimal: {a['time_optimal_processes']}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fitting model Amdahl/Gustafson dari tabel benchmark')
+    parser.add_argument('programs', nargs='*', help='nama tabel (bench_<nama>.csv), default semua')
+    parser.add_argument('--max-procs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--min-efficiency', type=float, default=DEFAULT_MIN_EFFICIENCY)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(BASE_DIR, 'bench_*.csv')))
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0][len('bench_'):]
+        if args.programs and name not in args.programs:
+            continue
+        for mode, points in points_from_table(path).items():
+            a = analyze(name, points, mode, args.max_procs, args.min_efficiency)
+            print(format_analysis(a))
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark Transport Objek: comm.send (pickle in-band) vs pickle protocol 5 out-of-band
+Ping-pong rank 0 <-> rank 1 untuk dua jenis pesan:
+    mixed     - dict metadata + array NumPy float64 (n elemen)
+    employees - list Employee (payroll_mpi) vs batch kolom out-of-band (termasuk biaya kemas)
+
+Cara menjalankan:
+    mpiexec -n 2 python bench_oob.py
+    mpiexec -n 2 python bench_oob.py --sizes=10000,1000000,10000000 --reps 5 --json
+"""
+
+from mpi4py import MPI  # type: ignore
+import argparse
+import time
+
+import bench_metrics
+import mpi_transport
+from payroll_mpi import Employee, batch_to_employees, employees_to_batch
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+np = mpi_transport.np
+
+
+def mixed_message(n):
+    return {
+        'meta': {'program': 'bench_oob', 'offset': 0, 'count': n},
+        'names': [f"Karyawan {i}" for i in range(min(n, 100))],
+        'values': np.arange(n, dtype=np.float64)
+    }
+
+
+def employee_list(n):
+    return [Employee(i + 1, f"Karyawan {i + 1}", 5_000_000.0 + (i % 5) * 1_000_000, i % 20, 0.0, 150_000.0)
+            for i in range(n)]
+
+
+def pingpong(send, recv, obj, reps):
+    """Waktu satu arah (detik, minimum dari reps) dan objek yang kembali ke rank 0"""
+    best = None
+    back = None
+    for _ in range(reps):
+        comm.Barrier()
+        t0 = time.perf_counter()
+        if rank == 0:
+            send(obj, 1)
+            back = recv(1)
+        elif rank == 1:
+            send(recv(0), 0)
+        elapsed = (time.perf_counter() - t0) / 2
+        best = elapsed if best is None else min(best, elapsed)
+    return best, back
+
+
+def send_pickle(obj, dest):
+    comm.send(obj, dest=dest, tag=0)
+
+
+def recv_pickle(source):
+    return comm.recv(source=source, tag=0)
+
+
+def send_oob(obj, dest):
+    mpi_transport.send_oob(comm, obj, dest=dest, tag=0)
+
+
+def recv_oob(source):
+    return mpi_transport.recv_oob(comm, source=source, tag=0)
+
+
+def send_employees_oob(employees, dest):
+    mpi_transport.send_oob(comm, employees_to_batch(employees), dest=dest, tag=0)
+
+
+def recv_employees_oob(source):
+    return batch_to_employees(mpi_transport.recv_oob(comm, source=source, tag=0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pickle in-band vs protocol 5 out-of-band')
+    parser.add_argument('--sizes', default='10000,100000,1000000,10000000')
+    parser.add_argument('--employees', default='1000,10000,100000')
+    parser.add_argument('--reps', type=int, default=3)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if size < 2 or np is None:
+        if rank == 0:
+            print("[X] Butuh minimal 2 proses MPI dan numpy")
+        return
+
+    doc = bench_metrics.new_result("bench_oob", size, oob_min_bytes=mpi_transport.OOB_MIN_BYTES)
+    if rank == 0:
+        print("=" * 78)
+        print(" " * 14 + "BENCHMARK TRANSPORT OBJEK: PICKLE vs OUT-OF-BAND")
+        print("=" * 78)
+        print(f"{'Pesan':<10} {'n':>12} {'In-band MB':>11} {'OOB MB':>9} {'pickle (s)':>11} "
+              f"{'oob (s)':>10} {'Speedup':>8}")
+        print("-" * 78)
+
+    cases = [('mixed', int(n), mixed_message, (send_pickle, recv_pickle), (send_oob, recv_oob))
+             for n in args.sizes.split(',') if n]
+    cases += [('employees', int(n), employee_list, (send_pickle, recv_pickle), (send_employees_oob, recv_employees_oob))
+              for n in args.employees.split(',') if n]
+
+    for kind, n, build, plain, oob in cases:
+        obj = build(n) if rank == 0 else None
+        t_pickle, back_pickle = pingpong(*plain, obj, args.reps)
+        t_oob, back_oob = pingpong(*oob, obj, args.reps)
+        if rank != 0:
+            continue
+
+        if kind == 'mixed':
+            ok = np.array_equal(back_oob['values'], obj['values']) and back_oob['meta'] == obj['meta']
+            in_band, out_band = mpi_transport.oob_bytes(obj)
+        else:
+            ok = back_oob == back_pickle == obj
+            in_band, out_band = mpi_transport.oob_bytes(employees_to_batch(obj))
+        speedup = t_pickle / t_oob if t_oob > 0 else 0
+        print(f"{kind:<10} {n:>12,} {in_band / 1e6:>11.2f} {out_band / 1e6:>9.2f} {t_pickle:>11.5f} "
+              f"{t_oob:>10.5f} {speedup:>7.2f}x{'' if ok else '  [X] hasil beda!'}")
+        bench_metrics.add_point(doc, n, serial_time=t_pickle, parallel_time=t_oob, message=kind,
+                                in_band_bytes=in_band, oob_bytes=out_band,
+                                pickle_bytes=mpi_transport.payload_bytes(obj))
+
+    if rank == 0:
+        print("\nWaktu = satu arah (round trip / 2), minimum dari repetisi")
+        print("'employees' oob termasuk biaya kemas/bongkar Employee <-> kolom NumPy")
+        bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
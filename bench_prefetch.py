@@ -0,0 +1,103 @@
+"""
+Benchmark Prefetch Reader: baca-lalu-proses (depth 0) vs prefetch thread I/O (depth >= 1)
+Sebelum setiap repetisi halaman file dibuang dari page cache (posix_fadvise DONTNEED),
+sehingga setiap run membaca dari disk (cold cache). Diukur per kombinasi ukuran blok x depth:
+waktu total, waktu menunggu I/O di sisi parser, dan pengurangannya terhadap depth 0.
+
+Cara menjalankan:
+    python bench_prefetch.py big.csv
+    python bench_prefetch.py big.csv --depths 0,1,2,4 --blocks 262144,1048576,4194304 --reps 3 --json
+    python bench_prefetch.py big.csv --warm      # tanpa membuang cache (pembanding)
+
+Catatan: DONTNEED hanya membuang halaman bersih milik file ini; tidak butuh root.
+"""
+
+import argparse
+import os
+import time
+
+import bench_metrics
+import csv_numpy
+import csv_partition
+import csv_prefetch
+
+
+def _int_list(text):
+    return [int(x) for x in text.split(',') if x]
+
+
+def drop_cache(path):
+    """Buang halaman file dari page cache; False jika platform tidak mendukung"""
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return True
+
+
+def measure(path, start, end, col, scanner, block, depth, reps, cold):
+    """Median per metrik dari `reps` run: (waktu, io_wait, read_time, sum, count)"""
+    runs = []
+    for _ in range(reps):
+        if cold:
+            drop_cache(path)
+        stats = csv_prefetch.PrefetchStats()
+        t0 = time.perf_counter()
+        total, count, _ = csv_prefetch.sum_column(path, start, end, col, 0, scanner, block, depth, stats)
+        runs.append((time.perf_counter() - t0, stats.io_wait, stats.read_time, total, count))
+    runs.sort()
+    return runs[len(runs) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark prefetch reader (cold cache)')
+    parser.add_argument('path', nargs='?', default=os.getenv('CSV_PATH', 'big.csv'))
+    parser.add_argument('--col', type=int, default=2)
+    parser.add_argument('--depths', type=_int_list, default=[0, 1, 2, 4])
+    parser.add_argument('--blocks', type=_int_list, default=[256 << 10, 1 << 20, 4 << 20])
+    parser.add_argument('--scanner', choices=('numpy', 'mmap'), default='numpy' if csv_numpy.HAS_NUMPY else 'mmap')
+    parser.add_argument('--reps', type=int, default=3)
+    parser.add_argument('--warm', action='store_true', help='jangan buang page cache sebelum run')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    cold = not args.warm
+    if cold and not drop_cache(args.path):
+        print("[WARN] posix_fadvise tidak tersedia: hasil memakai cache hangat")
+        cold = False
+    with open(args.path, 'rb') as f:
+        start = csv_partition.data_start(f)
+        end = os.fstat(f.fileno()).st_size
+    mbytes = (end - start) / 1e6
+
+    doc = bench_metrics.new_result("bench_prefetch", 1, path=args.path, scanner=args.scanner,
+                                   cold=cold, mbytes=mbytes)
+    print("=" * 80)
+    print(" " * 18 + f"BENCHMARK PREFETCH READER ({'cold' if cold else 'warm'} cache)")
+    print("=" * 80)
+    print(f"File: {args.path} ({mbytes:.1f} MB), scanner {args.scanner}, median dari {args.reps} run\n")
+    print(f"{'Blok':>9} {'Depth':>6} {'Waktu':>9} {'I/O wait':>10} {'Baca':>9} {'MB/s':>8} "
+          f"{'Wait -%':>8} {'Speedup':>8}")
+    print("-" * 80)
+    for block in args.blocks:
+        base = None
+        for depth in args.depths:
+            elapsed, io_wait, read_time, total, count = measure(
+                args.path, start, end, args.col, args.scanner, block, depth, args.reps, cold)
+            if base is None:
+                base = (elapsed, io_wait)
+            reduction = 100 * (1 - io_wait / base[1]) if base[1] > 0 else 0.0
+            print(f"{block >> 10:>7}KB {depth:>6} {elapsed:>8.3f}s {io_wait:>9.3f}s {read_time:>8.3f}s "
+                  f"{mbytes / elapsed:>8.1f} {reduction:>7.1f}% {base[0] / elapsed:>7.2f}x")
+            bench_metrics.add_point(doc, count, serial_time=base[0], parallel_time=elapsed,
+                                    block=block, depth=depth, io_wait=io_wait, read_time=read_time,
+                                    io_wait_reduction=reduction, sum=total)
+        print()
+    print("I/O wait = waktu parser menunggu blok; Baca = waktu readinto (di thread I/O jika depth >= 1)")
+    print("Wait -% dan speedup relatif terhadap depth pertama pada ukuran blok yang sama")
+    bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Regression Gate Benchmark
+Membandingkan hasil harness (bench_scaling.py) terbaru dengan baseline bench_*.csv yang di-commit.
+Perlambatan atau penurunan efisiensi yang signifikan secara statistik (Welch t-test atas
+sampel repetisi) per program dan jumlah proses -> laporan diff + exit status 1.
+Titik baseline tanpa pasangan (MISSING) atau dengan ukuran berbeda (SIZE MISMATCH) juga
+gagal (exit 1); jika tidak ada satu titik pun yang terbandingkan, exit 2.
+
+Contoh:
+    python bench_regression.py csv_parallel_sum --reps 5           # jalankan harness lalu bandingkan
+    python bench_regression.py csv_parallel_sum --fresh out/bench_csv_parallel_sum.csv
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+
+import bench_scaling
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def welch_t(a, b):
+    """Statistik Welch t (b relatif terhadap a) dan derajat kebebasannya"""
+    na, nb = len(a), len(b)
+    va = statistics.variance(a) if na > 1 else 0.0
+    vb = statistics.variance(b) if nb > 1 else 0.0
+    se2 = va / na + vb / nb
+    diff = statistics.fmean(b) - statistics.fmean(a)
+    if se2 == 0:
+        return (math.inf if diff > 0 else -math.inf if diff < 0 else 0.0), max(na + nb - 2, 1)
+    # Welch–Satterthwaite
+    num = se2 ** 2
+    den = 0.0
+    if na > 1:
+        den += (va / na) ** 2 / (na - 1)
+    if nb > 1:
+        den += (vb / nb) ** 2 / (nb - 1)
+    df = num / den if den > 0 else max(na + nb - 2, 1)
+    return diff / math.sqrt(se2), df
+
+
+def significantly_greater(baseline, fresh, tolerance):
+    """
+    True jika `fresh` lebih besar dari `baseline` * (1 + tolerance) secara signifikan.
+    Dengan satu sampel baseline (tabel lama), variansi hanya berasal dari sampel baru.
+    """
+    shifted = [x * (1 + tolerance) for x in baseline]
+    if len(fresh) < 2:
+        return statistics.fmean(fresh) > statistics.fmean(shifted)
+    t, df = welch_t(shifted, fresh)
+    return t > bench_scaling.t_critical(max(int(df), 1))
+
+
+def _efficiency_samples(table, point):
+    """Sampel efisiensi per repetisi, relatif ke median titik dasar (procs terkecil)"""
+    group = [r for r in table if r['threads'] == point['threads'] and r['mode'] == point['mode']]
+    base = min(group, key=lambda r: r['procs'])
+    base_time = statistics.median(base['samples'])
+    scale = point['procs'] / base['procs']
+    if point['mode'] == 'weak':
+        return [base_time / t for t in point['samples'] if t > 0]
+    return [base_time / (t * scale) for t in point['samples'] if t > 0]
+
+
+def compare(baseline, fresh, tolerance=0.10, eff_tolerance=0.05):
+    """Bandingkan dua tabel; kembalikan list baris perbandingan per (procs, threads, mode)"""
+    fresh_by_key = {(r['procs'], r['threads'], r['mode']): r for r in fresh}
+    report = []
+    for base in baseline:
+        key = (base['procs'], base['threads'], base['mode'])
+        new = fresh_by_key.get(key)
+        row = {
+            'procs': base['procs'],
+            'threads': base['threads'],
+            'mode': base['mode'],
+            'base_time': statistics.median(base['samples']),
+            'status': 'MISSING'
+        }
+        report.append(row)
+        if new is None:
+            continue
+        if base['rows'] and new['rows'] and base['rows'] != new['rows']:
+            row['status'] = f"SIZE MISMATCH (rows {base['rows']} vs {new['rows']})"
+            continue
+
+        row['new_time'] = statistics.median(new['samples'])
+        row['time_change'] = (row['new_time'] - row['base_time']) / row['base_time']
+        slower = significantly_greater(base['samples'], new['samples'], tolerance)
+        if bench_scaling.is_message_mode(base['mode']):
+            # Tabel bench_comm: hanya waktu per ukuran pesan, tidak ada efisiensi scaling
+            row['base_eff'] = row['new_eff'] = None
+            row['status'] = 'SLOWDOWN' if slower else 'ok'
+            continue
+        base_eff = _efficiency_samples(baseline, base)
+        new_eff = _efficiency_samples(fresh, new)
+        row['base_eff'] = statistics.median(base_eff)
+        row['new_eff'] = statistics.median(new_eff)
+        # Efisiensi turun lebih dari eff_tolerance (absolut) dan signifikan secara statistik
+        eff_drop = (row['base_eff'] - row['new_eff'] > eff_tolerance and
+                    significantly_greater([eff_tolerance - e for e in base_eff], [-e for e in new_eff], 0.0))
+
+        problems = []
+        if slower:
+            problems.append('SLOWDOWN')
+        if eff_drop:
+            problems.append('EFFICIENCY')
+        row['status'] = ','.join(problems) if problems else 'ok'
+    return report
+
+
+def format_report(name, report, tolerance, eff_tolerance):
+    """Laporan diff dalam format Markdown"""
+    lines = [
+        f"## Regression check: {name}",
+        f"toleransi waktu {tolerance * 100:.0f}%, toleransi efisiensi {eff_tolerance * 100:.0f} poin",
+        "",
+        " | procs | threads | mode | baseline (s) | baru (s) | Δ waktu | efisiensi lama | efisiensi baru | status |",
+        " |------:|--------:|:-----|-------------:|---------:|--------:|---------------:|---------------:|:-------|"
+    ]
+    for r in report:
+        if 'new_time' in r:
+            base_eff = '-' if r['base_eff'] is None else f"{r['base_eff'] * 100:.1f}%"
+            new_eff = '-' if r['new_eff'] is None else f"{r['new_eff'] * 100:.1f}%"
+            lines.append(
+                f" | {r['procs']} | {r['threads']} | {r['mode']} | {r['base_time']:.4f} | {r['new_time']:.4f} | "
+                f"{r['time_change'] * 100:+.1f}% | {base_eff} | {new_eff} | {r['status']} |")
+        else:
+            lines.append(
+                f" | {r['procs']} | {r['threads']} | {r['mode']} | {r['base_time']:.4f} | - | - | - | - | {r['status']} |")
+    return '\n'.join(lines)
+
+
+def has_regression(report):
+    """Ada titik terbandingkan yang lebih lambat / efisiensinya turun signifikan"""
+    return any(r['status'] != 'ok' for r in report if 'new_time' in r)
+
+
+def incomparable(report):
+    """Titik baseline yang tidak bisa dibandingkan (MISSING / SIZE MISMATCH)"""
+    return [r for r in report if 'new_time' not in r]
+
+
+def run_fresh(program_id, baseline, reps, warmup, data_dir=None):
+    """Jalankan harness dengan titik (procs, threads, mode, ukuran) yang sama seperti baseline"""
+    fresh = []
+    for mode in sorted({r['mode'] for r in baseline}):
+        group = [r for r in baseline if r['mode'] == mode]
+        procs = sorted({r['procs'] for r in group})
+        threads = sorted({r['threads'] for r in group})
+        ref = min(group, key=lambda r: r['procs'])
+        size = ref['rows'] // ref['procs'] if mode == 'weak' else ref['rows']
+        points = bench_scaling.sweep(program_id, procs, threads, mode, size,
+                                     reps=reps, warmup=warmup, data_dir=data_dir)
+        fresh.extend({
+            'procs': p['procs'],
+            'threads': p['threads'],
+            'mode': p['mode'],
+            'rows': p['rows'],
+            'samples': p['samples']
+        } for p in points)
+    return fresh
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regression gate benchmark terhadap baseline bench_*.csv')
+    parser.add_argument('program', choices=sorted(bench_scaling.PROGRAMS))
+    parser.add_argument('--baseline', help='default: bench_<program>.csv di folder repo')
+    parser.add_argument('--fresh', help='tabel hasil harness; jika kosong harness dijalankan sekarang')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='perlambatan relatif yang ditoleransi')
+    parser.add_argument('--eff-tolerance', type=float, default=0.05, help='penurunan efisiensi absolut')
+    parser.add_argument('--reps', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--data-dir')
+    parser.add_argument('--report', help='tulis laporan Markdown ke file ini')
+    args = parser.parse_args()
+
+    baseline_path = args.baseline or os.path.join(BASE_DIR, f'bench_{args.program}.csv')
+    baseline = bench_scaling.infer_mode(bench_scaling.read_table(baseline_path))
+    if args.fresh:
+        fresh = bench_scaling.infer_mode(bench_scaling.read_table(args.fresh))
+    else:
+        fresh = run_fresh(args.program, baseline, args.reps, args.warmup, args.data_dir)
+
+    report = compare(baseline, fresh, args.tolerance, args.eff_tolerance)
+    text = format_report(args.program, report, args.tolerance, args.eff_tolerance)
+    print(text)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+    skipped = incomparable(report)
+    if len(skipped) == len(report):
+        print("\n[X] Tidak ada titik yang bisa dibandingkan dengan baseline (cek ukuran / procs)")
+        sys.exit(2)
+    if has_regression(report):
+        print("\n[X] Regresi performa terdeteksi")
+        sys.exit(1)
+    if skipped:
+        print(f"\n[X] {len(skipped)} titik baseline tidak terbandingkan (MISSING / SIZE MISMATCH)")
+        sys.exit(1)
+    print("\n[OK] Tidak ada regresi signifikan")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+"""
+Harness Benchmark Scaling (Strong & Weak)
+Menjalankan program MPI untuk beberapa jumlah proses (dan thread untuk program hybrid),
+dengan warm-up + N repetisi per titik, lalu menulis ulang tabel bench_*.csv / bench_*.md
+
+Contoh:
+    python bench_scaling.py csv_parallel_sum --procs 1,2,4,8 --size 1000000 --reps 5
+    python bench_scaling.py csv_parallel_split --mode weak --size 125000 --threads 1,2
+    python bench_scaling.py csv_parallel_split_proc --procs 1,2,4 --threads 1,2,4
+    MPIEXEC_ARGS="--oversubscribe" python bench_scaling.py pi_montecarlo --procs 1,2,4
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import bench_metrics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Program yang bisa di-sweep. 'size' menentukan cara ukuran masalah diberikan ke program:
+#   csv   -> file CSV tunggal (CSV_PATH), split -> satu file per rank (SPLIT_DIR),
+#   sizes -> env BENCH_SIZES (lihat bench_metrics.bench_sizes)
+PROGRAMS = {
+    'csv_parallel_sum': {
+        'file': 'csv_parallel_sum.py',
+        'size': 'csv',
+        'default_size': 1_000_000,
+        'env': {}
+    },
+    'compute_bound': {
+        'file': 'csv_parallel_sum.py',
+        'size': 'csv',
+        'default_size': 1_000_000,
+        'env': {'CPU_WORK': os.getenv('CPU_WORK', '10')}
+    },
+    'csv_parallel_split': {
+        'file': 'csv_parallel_split.py',
+        'size': 'split',
+        'default_size': 1_000_000,
+        'hybrid': True,
+        'env': {}
+    },
+    'csv_parallel_split_proc': {
+        'file': 'csv_parallel_split.py',
+        'size': 'split',
+        'default_size': 1_000_000,
+        'hybrid': True,  # --threads = jumlah worker proses per rank
+        'env': {'SPLIT_WORKER_MODE': 'process', 'CSV_CACHE': '0'}
+    },
+    'pi_montecarlo': {
+        'file': 'pi_montecarlo_mpi.py',
+        'size': 'sizes',
+        'default_size': 1_000_000,
+        'env': {}
+    },
+    'payroll_complex': {
+        'file': 'demo_payroll_complex.py',
+        'size': 'sizes',
+        'default_size': 2000,
+        'env': {}
+    },
+    'payroll_simple': {
+        'file': 'demo_payroll_benchmark.py',
+        'size': 'sizes',
+        'default_size': 50000,
+        'env': {}
+    }
+}
+
+# Kolom tabel: 5 kolom pertama sama dengan bench_*.csv lama
+# Tabel bench_comm_*.csv memakai mode "msg<bytes>" (rows = ukuran pesan, kolom tambahan bytes)
+# dan speedup/efisiensi kosong: itu data biaya komunikasi, bukan titik scaling.
+FIELDNAMES = ['procs', 'time_s', 'speedup', 'efficiency', 'rows',
+              'threads', 'mode', 'reps', 'stdev', 'ci95_low', 'ci95_high',
+              'min', 'max', 'samples']
+
+# Nilai kritis t-Student dua sisi 95% untuk df = 1..30
+_T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+         2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+         2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def t_critical(df):
+    """Nilai kritis t 95% dua sisi (pendekatan normal untuk df > 30)"""
+    if df < 1:
+        return float('nan')
+    return _T_95[df - 1] if df <= len(_T_95) else 1.96
+
+
+def summarize_samples(samples):
+    """Statistik repetisi: median, sebaran (stdev, min, max) dan CI 95% dari rata-rata"""
+    n = len(samples)
+    mean = statistics.fmean(samples)
+    stdev = statistics.stdev(samples) if n > 1 else 0.0
+    half = t_critical(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        'median': statistics.median(samples),
+        'mean': mean,
+        'stdev': stdev,
+        'min': min(samples),
+        'max': max(samples),
+        'ci95_low': mean - half,
+        'ci95_high': mean + half,
+        'n': n
+    }
+
+
+# -------------------------------
+# Data input CSV
+# -------------------------------
+def _write_csv_rows(path, ids):
+    """Tulis file CSV format make_big_csv.py (id, group, value)"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(['id', 'group', 'value'])
+        for i in ids:
+            w.writerow([i, i % 10, round(random.uniform(0, 100), 6)])
+
+
+def prepare_csv(data_dir, rows):
+    """File CSV tunggal dengan `rows` baris (dibuat sekali, dipakai ulang)"""
+    path = os.path.join(data_dir, f'big_{rows}.csv')
+    if not os.path.exists(path):
+        random.seed(42)
+        _write_csv_rows(path + '.tmp', range(rows))
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def prepare_split(data_dir, rows, parts):
+    """Folder berisi `parts` file big_{i}.csv dengan total `rows` baris (pola make_big_split.py)"""
+    outdir = os.path.join(data_dir, f'split_{rows}_{parts}')
+    marker = os.path.join(outdir, '.complete')
+    if not os.path.exists(marker):
+        os.makedirs(outdir, exist_ok=True)
+        random.seed(42)
+        for part in range(parts):
+            _write_csv_rows(os.path.join(outdir, f'big_{part}.csv'), range(part, rows, parts))
+        open(marker, 'w').close()
+    return outdir
+
+
+# -------------------------------
+# Eksekusi satu run
+# -------------------------------
+def build_command(program_file, procs):
+    """Perintah mpiexec (argumen tambahan dari env MPIEXEC_ARGS)"""
+    extra = shlex.split(os.getenv('MPIEXEC_ARGS', ''))
+    return ['mpiexec', *extra, '-n', str(procs), sys.executable, program_file, '--json']
+
+
+def run_once(program_file, procs, env, timeout=600):
+    """Jalankan program sekali; kembalikan (waktu paralel, dokumen hasil JSON)"""
+    t0 = time.perf_counter()
+    result = subprocess.run(
+        build_command(program_file, procs),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        cwd=BASE_DIR,
+        env=env
+    )
+    wall = time.perf_counter() - t0
+    if result.returncode != 0:
+        raise RuntimeError(f"{program_file} (procs={procs}) gagal:\n{result.stderr.strip()}")
+
+    doc = bench_metrics.extract_result(result.stdout)
+    if doc and doc['results']:
+        point = doc['results'][-1]
+        if point.get('parallel_time') is not None:
+            return point['parallel_time'], doc
+    # Program tanpa dokumen JSON: pakai waktu wall-clock mpiexec
+    return wall, doc
+
+
+def point_env(spec, mode, size, procs, threads, data_dir, csv_path=None):
+    """Environment untuk satu titik sweep, beserta jumlah baris/ukuran total"""
+    env = dict(os.environ)
+    env.update(spec['env'])
+    env['BENCH_JSON'] = '1'
+    env['OMP_NUM_THREADS'] = str(threads)
+
+    total = size * procs if mode == 'weak' else size
+    if spec['size'] == 'csv':
+        env['CSV_PATH'] = csv_path if (csv_path and mode == 'strong') else prepare_csv(data_dir, total)
+    elif spec['size'] == 'split':
+        env['SPLIT_DIR'] = prepare_split(data_dir, total, procs)
+    else:
+        env['BENCH_SIZES'] = str(total)
+    return env, total
+
+
+def sweep(program_id, procs_list, threads_list=(1,), mode='strong', size=None,
+          reps=5, warmup=1, data_dir=None, csv_path=None, store=False, verbose=True):
+    """
+    Sweep jumlah proses (x thread) untuk satu program.
+    Mode strong: ukuran total tetap. Mode weak: ukuran per rank tetap.
+    """
+    spec = PROGRAMS[program_id]
+    size = size or spec['default_size']
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), 'bench_data')
+    os.makedirs(data_dir, exist_ok=True)
+    if not spec.get('hybrid'):
+        threads_list = (1,)
+
+    points = []
+    for threads in threads_list:
+        for procs in procs_list:
+            env, total = point_env(spec, mode, size, procs, threads, data_dir, csv_path)
+            for _ in range(warmup):
+                run_once(spec['file'], procs, env)
+            samples = []
+            for _ in range(reps):
+                elapsed, doc = run_once(spec['file'], procs, env)
+                samples.append(elapsed)
+                if store:
+                    _store_sample(program_id, procs, elapsed, doc)
+            stats = summarize_samples(samples)
+            points.append({
+                'procs': procs,
+                'threads': threads,
+                'mode': mode,
+                'rows': total,
+                'samples': samples,
+                'stats': stats
+            })
+            if verbose:
+                print(f"[{program_id}] mode={mode} procs={procs} threads={threads} rows={total}: "
+                      f"median={stats['median']:.4f}s (CI95 {stats['ci95_low']:.4f}-{stats['ci95_high']:.4f}, "
+                      f"n={stats['n']})", flush=True)
+
+    _add_scaling(points)
+    return points
+
+
+def _add_scaling(points):
+    """Speedup & efisiensi relatif ke titik dengan proses paling sedikit (per jumlah thread)"""
+    for threads in {p['threads'] for p in points}:
+        group = sorted((p for p in points if p['threads'] == threads), key=lambda p: p['procs'])
+        base = group[0]
+        base_time = base['stats']['median']
+        for p in group:
+            t = p['stats']['median']
+            scale = p['procs'] / base['procs']
+            if p['mode'] == 'weak':
+                # Weak scaling: efisiensi = T_base / T_p, speedup = scaled speedup
+                p['efficiency'] = base_time / t if t > 0 else 0.0
+                p['speedup'] = p['efficiency'] * scale
+            else:
+                p['speedup'] = base_time / t if t > 0 else 0.0
+                p['efficiency'] = p['speedup'] / scale
+
+
+def _store_sample(program_id, procs, elapsed, doc):
+    """Simpan satu repetisi ke riwayat benchmark di database (opsional, --store)"""
+    import db_helper
+    metrics = bench_metrics.metrics_from_result(doc) if doc else {}
+    db_helper.save_benchmark_run({
+        'program_id': program_id,
+        'num_processes': procs,
+        'host_fingerprint': bench_metrics.host_fingerprint(),
+        'git_revision': bench_metrics.git_revision(),
+        'elapsed_time': elapsed,
+        'metrics': metrics,
+        'output': '',
+        'error': '',
+        'success': True
+    })
+
+
+# -------------------------------
+# Tabel CSV / Markdown
+# -------------------------------
+def table_name(program_id, mode):
+    suffix = '_weak' if mode == 'weak' else ''
+    return f'bench_{program_id}{suffix}'
+
+
+def is_message_mode(mode):
+    """Mode tabel bench_comm (msg<bytes>): bukan data strong/weak scaling"""
+    return mode.startswith('msg')
+
+
+def write_tables(points, out_dir, name, digits=4, extra_fields=()):
+    """
+    Tulis ulang bench_<name>.csv dan bench_<name>.md (digits = presisi kolom waktu dalam detik).
+    speedup/efficiency None ditulis kosong; extra_fields = kolom tambahan dari setiap titik.
+    """
+    csv_path = os.path.join(out_dir, name + '.csv')
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES + list(extra_fields), quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        for p in points:
+            s = p['stats']
+            writer.writerow({
+                'procs': p['procs'],
+                'time_s': round(s['median'], digits),
+                'speedup': '' if p['speedup'] is None else round(p['speedup'], 3),
+                'efficiency': '' if p['efficiency'] is None else f"{p['efficiency'] * 100:.1f}%",
+                'rows': p['rows'],
+                'threads': p['threads'],
+                'mode': p['mode'],
+                'reps': s['n'],
+                'stdev': round(s['stdev'], digits),
+                'ci95_low': round(s['ci95_low'], digits),
+                'ci95_high': round(s['ci95_high'], digits),
+                'min': round(s['min'], digits),
+                'max': round(s['max'], digits),
+                'samples': ';'.join(f'{x:.{digits + 2}f}' for x in p['samples']),
+                **{field: p.get(field) for field in extra_fields}
+            })
+
+    md_path = os.path.join(out_dir, name + '.md')
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(' | procs | threads | time (s) | ±CI95 | speed-up | efisiensi | rows | reps |\n')
+        f.write(' |------:|--------:|---------:|------:|---------:|----------:|-----:|-----:|\n')
+        for p in points:
+            s = p['stats']
+            half = (s['ci95_high'] - s['ci95_low']) / 2
+            speedup = '-' if p['speedup'] is None else f"{p['speedup']:.3f}"
+            efficiency = '-' if p['efficiency'] is None else f"{p['efficiency'] * 100:.1f}%"
+            f.write(f" | {p['procs']} | {p['threads']} | {s['median']:.{digits}f} | {half:.{digits}f} | "
+                    f"{speedup} | {efficiency} | {p['rows']} | {s['n']} |\n")
+    return csv_path, md_path
+
+
+def read_table(path):
+    """Baca tabel bench_*.csv (format lama maupun format harness) ke list dict"""
+    rows = []
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            samples = row.get('samples') or ''
+            rows.append({
+                'procs': int(row['procs']),
+                'threads': int(row.get('threads') or 1),
+                'mode': row.get('mode') or 'strong',
+                'rows': int(row['rows']) if row.get('rows') else None,
+                'time_s': float(row['time_s']),
+                'speedup': float(row['speedup']) if row['speedup'] else None,
+                'efficiency': float(row['efficiency'].rstrip('%')) / 100 if row['efficiency'] else None,
+                'samples': [float(x) for x in samples.split(';') if x] or [float(row['time_s'])]
+            })
+    return rows
+
+
+def infer_mode(rows):
+    """
+    Tabel lama tidak punya kolom mode: rows yang naik sebanding procs berarti weak scaling.
+    Tabel yang sudah bermode (termasuk msg<bytes> bench_comm) dikembalikan apa adanya.
+    """
+    if any(r['mode'] != 'strong' for r in rows):
+        return rows
+    per_rank = {r['rows'] / r['procs'] for r in rows if r['rows']}
+    if len(rows) > 1 and len(per_rank) == 1 and len({r['rows'] for r in rows}) > 1:
+        for r in rows:
+            r['mode'] = 'weak'
+    return rows
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep strong/weak scaling untuk program MPI')
+    parser.add_argument('program', choices=sorted(PROGRAMS))
+    parser.add_argument('--procs', type=_int_list, default=[1, 2, 4, 8], help='mis. 1,2,4,8')
+    parser.add_argument('--threads', type=_int_list, default=[1], help='thread per rank (program hybrid)')
+    parser.add_argument('--mode', choices=['strong', 'weak'], default='strong')
+    parser.add_argument('--size', type=int, help='ukuran total (strong) atau per rank (weak)')
+    parser.add_argument('--reps', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--csv', help='file CSV yang sudah ada (mode strong, program csv)')
+    parser.add_argument('--data-dir', help='folder data CSV sintetis')
+    parser.add_argument('--out-dir', default=BASE_DIR)
+    parser.add_argument('--name', help='nama tabel output (default bench_<program>[_weak])')
+    parser.add_argument('--store', action='store_true', help='simpan setiap repetisi ke database')
+    args = parser.parse_args()
+    os.makedirs(args.out_dir, exist_ok=True)  # sebelum sweep, agar hasil pengukuran tidak hilang
+
+    points = sweep(args.program, args.procs, args.threads, args.mode, args.size,
+                   args.reps, args.warmup, args.data_dir, args.csv, args.store)
+    csv_path, md_path = write_tables(points, args.out_dir, args.name or table_name(args.program, args.mode))
+    print(f">> Tabel ditulis: {csv_path}, {md_path}")
+
+
+if __name__ == '__main__':
+    main()
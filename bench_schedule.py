@@ -0,0 +1,114 @@
+"""
+Benchmark Load Balancing: blok statis vs self-scheduling
+Workload payroll sintetis dengan biaya per record yang tidak seragam (iterasi pajak
+berbeda per karyawan), dibandingkan antara pembagian statis, master-worker dan counter RMA
+
+Cara menjalankan:
+    mpiexec -n 4 python bench_schedule.py
+    mpiexec -n 4 python bench_schedule.py --records 4000 --skew front --policy adaptive --json
+
+Skew:
+    front  - 10% record pertama 20x lebih berat (rank 0 pada pembagian statis kebagian semua)
+    ramp   - biaya naik linear dari 1x sampai 10x
+    pareto - biaya acak berekor panjang (seed tetap)
+"""
+
+from mpi4py import MPI  # type: ignore
+import argparse
+import random
+
+import bench_metrics
+import mpi_schedule
+from demo_payroll_complex import generate_data, hitung_batch
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+SKEWS = ('front', 'ramp', 'pareto')
+
+
+def skewed_costs(n, skew, base_iter):
+    """Jumlah iterasi pajak per record sesuai pola skew"""
+    if skew == 'front':
+        heavy = max(1, n // 10)
+        return [base_iter * 20 if i < heavy else base_iter for i in range(n)]
+    if skew == 'ramp':
+        return [int(base_iter * (1 + 9 * i / max(n - 1, 1))) for i in range(n)]
+    rng = random.Random(42)
+    return [min(int(base_iter * rng.paretovariate(1.5)), base_iter * 100) for _ in range(n)]
+
+
+def build_workload(n, skew, base_iter):
+    """Pasangan (karyawan, absen) dengan field `iterasi` (hanya rank 0)"""
+    if rank != 0:
+        return None
+    random.seed(0)
+    karyawan, absen = generate_data(n)
+    for k, iterasi in zip(karyawan, skewed_costs(n, skew, base_iter)):
+        k["iterasi"] = iterasi
+    return list(zip(karyawan, absen))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark load balancing statis vs dinamis')
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--base-iter', type=int, default=200, help='iterasi pajak record termurah')
+    parser.add_argument('--skew', choices=SKEWS + ('all',), default='all')
+    parser.add_argument('--policy', choices=('guided', 'adaptive', 'fixed'), default=mpi_schedule.DEFAULT_POLICY)
+    parser.add_argument('--min-chunk', type=int, default=mpi_schedule.DEFAULT_MIN_CHUNK)
+    parser.add_argument('--chunk', type=int, help='ukuran chunk untuk policy fixed')
+    parser.add_argument('--strategies', default='static,master,rma')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    strategies = [s.strip() for s in args.strategies.split(',') if s.strip()]
+    skews = SKEWS if args.skew == 'all' else (args.skew,)
+    doc = bench_metrics.new_result("bench_schedule", size, policy=args.policy, min_chunk=args.min_chunk)
+
+    if rank == 0:
+        print("=" * 78)
+        print(" " * 16 + "BENCHMARK LOAD BALANCING: STATIS vs DINAMIS")
+        print("=" * 78)
+        print(f"Proses MPI: {size}, record: {args.records:,}, policy: {args.policy}, min chunk: {args.min_chunk}\n")
+
+    for skew in skews:
+        items = build_workload(args.records, skew, args.base_iter)
+        if rank == 0:
+            print(f"Skew: {skew}")
+            print(f"  {'Strategi':<10} {'Waktu (s)':>10} {'vs statis':>10} {'Imbalance':>10} {'Chunk':>14}")
+            print("  " + "-" * 58)
+
+        reference = None
+        static_time = None
+        for strategy in strategies:
+            comm.Barrier()
+            results, stats = mpi_schedule.run(strategy, comm, items, hitung_batch, policy=args.policy,
+                                              min_chunk=args.min_chunk, chunk=args.chunk)
+            if rank != 0:
+                continue
+
+            if reference is None:
+                reference = results
+            elif results != reference:
+                print(f"  [X] Hasil {strategy} berbeda dari {strategies[0]}!")
+            if strategy == 'static':
+                static_time = stats['elapsed']
+
+            ratio = f"{static_time / stats['elapsed']:.2f}x" if static_time else "-"
+            print(f"  {strategy:<10} {stats['elapsed']:>10.4f} {ratio:>10} {stats['imbalance']:>10.2f} "
+                  f"{'/'.join(str(c) for c in stats['chunks']):>14}")
+            bench_metrics.add_point(doc, args.records, serial_time=static_time, parallel_time=stats['elapsed'],
+                                    rank_times=stats['busy_times'], strategy=strategy, skew=skew,
+                                    imbalance=stats['imbalance'], chunks=stats['chunks'])
+        if rank == 0:
+            print()
+
+    if rank == 0:
+        print("Imbalance = waktu sibuk rank tersibuk / rata-rata (1.00 = seimbang)")
+        print("'vs statis' = waktu statis / waktu strategi ('speedup' pada dokumen JSON)")
+        bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Benchmark Transport MPI: pickle send/recv vs Scatterv/Gatherv buffer
+Mengukur waktu komunikasi distribusi data karyawan dan pengumpulan hasil gaji,
+serta protokol hasil: dict lengkap vs kolom numerik (bytes on the wire & waktu gather)
+
+Cara menjalankan:
+    mpiexec -n 4 python bench_transport.py
+    mpiexec -n 4 python bench_transport.py --sizes 10000,100000,1000000,10000000 --json
+
+Jalur pickle untuk ukuran > PICKLE_MAX (default 1.000.000) dilewati karena list of dict
+sebesar itu butuh memori berlipat di rank 0.
+"""
+
+from mpi4py import MPI  # type: ignore
+import os
+import sys
+from array import array
+
+import numpy as np  # type: ignore
+
+import bench_metrics
+import mpi_transport
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+PICKLE_MAX = int(os.getenv("PICKLE_MAX", "1000000"))
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def generate_records(n):
+    """Data karyawan format demo_payroll_benchmark (list of dict)"""
+    karyawan = [{"id": f"K{i+1:04d}", "nama": f"Karyawan {i+1}", "gaji_pokok": 150000 + (i % 5) * 50000}
+                for i in range(n)]
+    absen = [{"id": f"K{i+1:04d}", "hari_masuk": 20 + (i % 7)} for i in range(n)]
+    return karyawan, absen
+
+
+def generate_columns(n):
+    """Data karyawan langsung dalam bentuk kolom NumPy"""
+    idx = np.arange(n, dtype=np.int64)
+    return {
+        "gaji_pokok": (150000 + (idx % 5) * 50000).astype(np.float64),
+        "hari_masuk": 20 + (idx % 7)
+    }
+
+
+def run_pickle(karyawan, absen):
+    """Distribusi & pengumpulan dengan comm.send/recv list of dict; kembalikan (t_dist, t_collect)"""
+    comm.Barrier()
+    t0 = MPI.Wtime()
+    if rank == 0:
+        counts, displs = mpi_transport.block_partition(len(karyawan), size)
+        for i in range(1, size):
+            lo, hi = displs[i], displs[i] + counts[i]
+            comm.send((karyawan[lo:hi], absen[lo:hi]), dest=i, tag=0)
+        local_k, local_a = karyawan[:counts[0]], absen[:counts[0]]
+    else:
+        local_k, local_a = comm.recv(source=0, tag=0)
+    comm.Barrier()
+    t1 = MPI.Wtime()
+
+    local_gaji = [{"id": k["id"], "nama": k["nama"], "total_gaji": k["gaji_pokok"] * a["hari_masuk"]}
+                  for k, a in zip(local_k, local_a)]
+
+    comm.Barrier()
+    t2 = MPI.Wtime()
+    if rank == 0:
+        hasil = list(local_gaji)
+        for i in range(1, size):
+            hasil.extend(comm.recv(source=i, tag=1))
+    else:
+        comm.send(local_gaji, dest=0, tag=1)
+    comm.Barrier()
+    t3 = MPI.Wtime()
+    return t1 - t0, t3 - t2
+
+
+def run_buffer(columns):
+    """Distribusi & pengumpulan dengan Scatterv/Gatherv; kembalikan (t_dist, t_collect)"""
+    comm.Barrier()
+    t0 = MPI.Wtime()
+    local, counts, displs = mpi_transport.distribute_columns(comm, columns)
+    comm.Barrier()
+    t1 = MPI.Wtime()
+
+    local_total = local["gaji_pokok"] * local["hari_masuk"]
+
+    comm.Barrier()
+    t2 = MPI.Wtime()
+    mpi_transport.collect_column(comm, local_total, counts, displs)
+    comm.Barrier()
+    t3 = MPI.Wtime()
+    return t1 - t0, t3 - t2
+
+
+def run_result_protocol(n):
+    """
+    Pengumpulan hasil saja (data sudah ada di tiap rank): dict {id, nama, total_gaji}
+    vs kolom numerik array('d') + offset vs Gatherv NumPy.
+    Kembalikan dict {protokol: (bytes dari worker, waktu gather)} di rank 0.
+    """
+    counts, displs = mpi_transport.block_partition(n, size)
+    lo, count = displs[rank], counts[rank]
+    totals = [float(150000 + (i % 5) * 50000) * (20 + i % 7) for i in range(lo, lo + count)]
+    hasil = {}
+
+    def timed(fn):
+        comm.Barrier()
+        t0 = MPI.Wtime()
+        fn()
+        comm.Barrier()
+        return MPI.Wtime() - t0
+
+    if n <= PICKLE_MAX:
+        local_gaji = [{"id": f"K{i+1:04d}", "nama": f"Karyawan {i+1}", "total_gaji": t}
+                      for i, t in zip(range(lo, lo + count), totals)]
+
+        def gather_dicts():
+            if rank == 0:
+                for i in range(1, size):
+                    comm.recv(source=i, tag=1)
+            else:
+                comm.send(local_gaji, dest=0, tag=1)
+
+        t = timed(gather_dicts)
+        nbytes = comm.reduce(mpi_transport.payload_bytes(local_gaji) if rank else 0, root=0)
+        hasil["dict"] = (nbytes, t)
+        del local_gaji
+
+    local_columns = {"total_gaji": array("d", totals)}
+    t = timed(lambda: mpi_transport.collect_numeric(comm, lo, local_columns, n))
+    nbytes = comm.reduce(mpi_transport.payload_bytes((lo, local_columns)) if rank else 0, root=0)
+    hasil["numeric"] = (nbytes, t)
+
+    local_np = np.asarray(local_columns["total_gaji"])
+    t = timed(lambda: mpi_transport.collect_column(comm, local_np, counts, displs))
+    nbytes = comm.reduce(local_np.nbytes if rank else 0, root=0)
+    hasil["gatherv"] = (nbytes, t)
+    return hasil
+
+
+def main():
+    sizes = DEFAULT_SIZES
+    for arg in sys.argv[1:]:
+        if arg.startswith("--sizes"):
+            sizes = [int(v) for v in arg.split("=", 1)[1].split(",")] if "=" in arg else sizes
+    sizes = bench_metrics.bench_sizes(sizes)
+
+    doc = bench_metrics.new_result("bench_transport", size)
+    if rank == 0:
+        print("=" * 78)
+        print(" " * 14 + "BENCHMARK TRANSPORT: PICKLE vs SCATTERV/GATHERV")
+        print("=" * 78)
+        print(f"Proses MPI: {size}\n")
+        print(f"{'Jumlah':>12} | {'pickle dist':>11} {'collect':>9} | {'pack':>8} {'Scatterv':>9} {'Gatherv':>9} | {'rasio':>6}")
+        print("-" * 78)
+
+    for n in sizes:
+        use_pickle = n <= PICKLE_MAX
+        karyawan = absen = None
+        if rank == 0 and use_pickle:
+            karyawan, absen = generate_records(n)
+
+        if use_pickle:
+            p_dist, p_collect = run_pickle(karyawan, absen)
+        else:
+            p_dist = p_collect = None
+
+        # Packing list of dict -> kolom (biaya tambahan jalur buffer jika data asal berupa dict)
+        columns = None
+        t_pack = None
+        if rank == 0:
+            if use_pickle:
+                t0 = MPI.Wtime()
+                columns = {
+                    "gaji_pokok": mpi_transport.pack_column(karyawan, "gaji_pokok", np.float64),
+                    "hari_masuk": mpi_transport.pack_column(absen, "hari_masuk", np.int64, int)
+                }
+                t_pack = MPI.Wtime() - t0
+            else:
+                columns = generate_columns(n)
+        del karyawan, absen
+
+        b_dist, b_collect = run_buffer(columns)
+
+        if rank == 0:
+            b_total = b_dist + b_collect
+            if use_pickle:
+                p_total = p_dist + p_collect
+                ratio = f"{p_total / b_total:6.1f}x" if b_total > 0 else "-"
+                print(f"{n:>12,} | {p_dist:>11.4f} {p_collect:>9.4f} | {t_pack:>8.4f} {b_dist:>9.4f} {b_collect:>9.4f} | {ratio}")
+            else:
+                print(f"{n:>12,} | {'skip':>11} {'skip':>9} | {'-':>8} {b_dist:>9.4f} {b_collect:>9.4f} | {'-':>6}")
+            bench_metrics.add_point(
+                doc, n,
+                serial_time=(p_dist + p_collect) if use_pickle else None,
+                parallel_time=b_total,
+                pickle_dist=p_dist, pickle_collect=p_collect,
+                pack_time=t_pack, scatterv=b_dist, gatherv=b_collect
+            )
+
+    if rank == 0:
+        print("-" * 78)
+        print("Waktu dalam detik. rasio = total komunikasi pickle / total Scatterv+Gatherv")
+        print("('speedup' pada dokumen JSON = rasio tersebut)")
+        print()
+        print(" " * 18 + "PROTOKOL HASIL: DICT vs KOLOM NUMERIK")
+        print("-" * 78)
+        print(f"{'Jumlah':>12} | {'dict MB':>9} {'gather':>8} | {'numerik MB':>10} {'gather':>8} | {'Gatherv MB':>10} {'gather':>8}")
+        print("-" * 78)
+
+    for n in sizes:
+        hasil = run_result_protocol(n)
+        if rank == 0:
+            cols = []
+            for name in ("dict", "numeric", "gatherv"):
+                if name in hasil:
+                    nbytes, t = hasil[name]
+                    cols.append(f"{nbytes / 1e6:>{10 if name != 'dict' else 9}.2f} {t:>8.4f}")
+                else:
+                    cols.append(f"{'skip':>9} {'skip':>8}")
+            print(f"{n:>12,} | " + " | ".join(cols))
+            doc["results"][sizes.index(n)]["result_protocol"] = {
+                name: {"bytes": nbytes, "gather_time": t} for name, (nbytes, t) in hasil.items()
+            }
+
+    if rank == 0:
+        print("-" * 78)
+        print("MB = bytes yang dikirim worker ke rank 0 (tanpa bagian rank 0 sendiri)")
+        bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,61 @@ Dipanggil oleh web application
 """
 
 from mpi4py import MPI  # type: ignore
+from array import array
 import csv
+import mpi_transport
 
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
 size = comm.Get_size()
 
+def baca_data_temp():
+    """Baca data karyawan & absen dari file temp (hanya rank 0)"""
+    with open('temp_karyawan.csv', 'r', encoding='utf-8') as f:
+        karyawan = list(csv.DictReader(f))
+    with open('temp_absen.csv', 'r', encoding='utf-8') as f:
+        absen = list(csv.DictReader(f))
+    return karyawan, absen
+
+def simpan_gaji_temp(gaji_final):
+    """Simpan hasil gaji ke file temp (hanya rank 0)"""
+    with open('temp_gaji.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['id', 'nama', 'total_gaji'])
+        writer.writeheader()
+        writer.writerows(gaji_final)
+
+def main_buffer():
+    """Versi Scatterv/Gatherv: hanya kolom numerik yang dikirim, id/nama tetap di rank 0"""
+    columns = None
+    if rank == 0:
+        karyawan, absen = baca_data_temp()
+        np = mpi_transport.np
+        columns = {
+            "gaji_pokok": mpi_transport.pack_column(karyawan, "gaji_pokok", np.float64),
+            "hari_masuk": mpi_transport.pack_column(absen, "hari_masuk", np.int64, int)
+        }
+    
+    local, counts, displs = mpi_transport.distribute_columns(comm, columns)
+    local_total = local["gaji_pokok"] * local["hari_masuk"]
+    total = mpi_transport.collect_column(comm, local_total, counts, displs)
+    
+    if rank == 0:
+        gaji_final = [
+            {"id": k["id"], "nama": k["nama"], "total_gaji": float(t)}
+            for k, t in zip(karyawan, total)
+        ]
+        simpan_gaji_temp(gaji_final)
+        print(f"[MPI] Berhasil menghitung {len(gaji_final)} gaji dengan {size} proses")
+
 def main():
+    if mpi_transport.transport_mode() == 'buffer':
+        main_buffer()
+        return
+    
     # Baca data dari file temp
     if rank == 0:
         # Master process membaca data
-        karyawan = []
-        absen = []
-        
-        with open('temp_karyawan.csv', 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            karyawan = list(reader)
-        
-        with open('temp_absen.csv', 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            absen = list(reader)
+        karyawan, absen = baca_data_temp()
         
         # Distribusi pekerjaan
         num_karyawan = len(karyawan)
@@ -39,55 +74,29 @@ def main():
                 local_karyawan = karyawan[start_idx:end_idx]
                 local_absen = absen[start_idx:end_idx]
             else:
-                comm.send((karyawan[start_idx:end_idx], absen[start_idx:end_idx]), dest=i, tag=0)
+                comm.send((start_idx, karyawan[start_idx:end_idx], absen[start_idx:end_idx]), dest=i, tag=0)
             
             start_idx = end_idx
-        
-        # Proses lokal
-        local_gaji = []
-        for i, k in enumerate(local_karyawan):
-            hari_masuk = int(local_absen[i]["hari_masuk"])
-            total = float(k["gaji_pokok"]) * hari_masuk
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "total_gaji": total
-            })
-        
-        # Kumpulkan hasil
-        all_gaji = [local_gaji]
-        for i in range(1, size):
-            hasil = comm.recv(source=i, tag=1)
-            all_gaji.append(hasil)
-        
-        # Gabungkan dan simpan
-        gaji_final = []
-        for chunk in all_gaji:
-            gaji_final.extend(chunk)
-        
-        # Simpan ke file
-        with open('temp_gaji.csv', 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['id', 'nama', 'total_gaji'])
-            writer.writeheader()
-            writer.writerows(gaji_final)
-        
-        print(f"[MPI] Berhasil menghitung {len(gaji_final)} gaji dengan {size} proses")
-    
+        offset = 0
     else:
         # Worker process
-        local_karyawan, local_absen = comm.recv(source=0, tag=0)
-        
-        local_gaji = []
-        for i, k in enumerate(local_karyawan):
-            hari_masuk = int(local_absen[i]["hari_masuk"])
-            total = float(k["gaji_pokok"]) * hari_masuk
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "total_gaji": total
-            })
+        offset, local_karyawan, local_absen = comm.recv(source=0, tag=0)
+        num_karyawan = None
+    
+    # Hitung bagian lokal: hanya kolom total_gaji yang dikirim balik
+    local_total = array("d", (float(k["gaji_pokok"]) * int(a["hari_masuk"])
+                              for k, a in zip(local_karyawan, local_absen)))
+    hasil = mpi_transport.collect_numeric(comm, offset, {"total_gaji": local_total}, num_karyawan)
+    
+    if rank == 0:
+        # Gabungkan dengan id/nama di rank 0 dan simpan
+        gaji_final = [
+            {"id": k["id"], "nama": k["nama"], "total_gaji": t}
+            for k, t in zip(karyawan, hasil["total_gaji"])
+        ]
+        simpan_gaji_temp(gaji_final)
         
-        comm.send(local_gaji, dest=0, tag=1)
+        print(f"[MPI] Berhasil menghitung {len(gaji_final)} gaji dengan {size} proses")
 
 if __name__ == "__main__":
     main()
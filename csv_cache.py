@@ -0,0 +1,261 @@
+"""
+Cache Kolom Biner untuk CSV
+Setiap CSV (dengan header) diubah sekali menjadi direktori `<csv>.cols/` berisi satu file
+.npy per kolom dan manifest.json yang memuat fingerprint sumber (ukuran + mtime). Run
+berikutnya cukup mem-mmap kolom yang dibutuhkan (np.load mmap_mode='r') tanpa parse
+teks; cache dianggap basi dan diabaikan begitu CSV berubah.
+
+Tipe kolom:
+    int   -> int64   (semua nilai bilangan bulat kanonik)
+    float -> float64 (nilai tidak valid disimpan NaN + mask valid, teks aslinya di manifest)
+    str   -> unicode lebar tetap
+load_records() hanya memakai cache jika semua teks kembali persis sama lewat str()/repr()
+(flag "exact"), sehingga dict yang dihasilkan identik dengan csv.DictReader.
+
+Konversi manual (bisa beberapa file sekaligus):
+    python csv_cache.py big.csv D:\\data\\big_split\\big_0.csv --force
+
+Cache hanya dipakai jika diaktifkan: CSV_CACHE=1 = pakai cache jika segar (dibuat lewat
+konversi manual di atas); CSV_CACHE=0 (default) = selalu parse teks CSV. Program tidak
+pernah membuat cache sendiri, sehingga benchmark tidak diam-diam berpindah ke kolom biner.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+
+import csv_index
+import csv_scan
+
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+MANIFEST = "manifest.json"
+MAX_INVALID = 0.01  # kolom float boleh memuat <= 1% nilai rusak (disimpan di manifest)
+INT64_MAX = 2 ** 63 - 1
+
+
+def cache_mode():
+    """'1' (pakai cache segar) atau '0' (default, nonaktif); selalu '0' tanpa numpy"""
+    mode = os.getenv("CSV_CACHE", "0").lower()
+    if HAS_NUMPY and mode in ("1", "on", "true", "yes"):
+        return "1"
+    return "0"
+
+
+def cache_dir(path):
+    return path + ".cols"
+
+
+def _column_file(i):
+    return f"{i}.npy"
+
+
+def _valid_file(i):
+    return f"{i}.valid.npy"
+
+
+# -------------------------------
+# Konversi
+# -------------------------------
+def _as_int(texts):
+    """int64 array jika semua teks bilangan bulat kanonik, selain itu None"""
+    try:
+        ints = [int(t) for t in texts]
+    except ValueError:
+        return None
+    if any(str(v) != t or not -INT64_MAX <= v <= INT64_MAX for v, t in zip(ints, texts)):
+        return None
+    return np.array(ints, dtype=np.int64)
+
+
+def _as_float(texts):
+    """(float64 array, valid mask, {baris: teks rusak}, exact) atau None jika terlalu banyak rusak"""
+    values = np.empty(len(texts), dtype=np.float64)
+    valid = np.ones(len(texts), dtype=bool)
+    invalid = {}
+    exact = True
+    for i, t in enumerate(texts):
+        try:
+            v = float(t)
+        except ValueError:
+            values[i] = np.nan
+            valid[i] = False
+            invalid[str(i)] = t
+            if len(invalid) > MAX_INVALID * len(texts):  # tanpa batas minimum: kolom teks kecil tetap str
+                return None
+            continue
+        exact = exact and repr(v) == t
+        values[i] = v
+    return values, valid, invalid, exact
+
+
+def _classify(texts):
+    """(kind, array, valid mask atau None, {baris: teks}, exact) untuk satu kolom"""
+    if texts:
+        ints = _as_int(texts)
+        if ints is not None:
+            return "int", ints, None, {}, True
+        floats = _as_float(texts)
+        if floats is not None:
+            values, valid, invalid, exact = floats
+            return "float", values, (None if valid.all() else valid), invalid, exact
+    return "str", np.array(texts, dtype=str if texts else "U1"), None, {}, True
+
+
+def _read_columns(path, encoding="utf-8"):
+    """(header, list teks per kolom) atau None jika ada baris dengan jumlah field berbeda"""
+    with open(path, "r", newline="", encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return None
+        columns = [[] for _ in header]
+        width = len(header)
+        for row in reader:
+            if not row:
+                continue  # baris kosong dilewati, sama seperti DictReader
+            if len(row) != width:
+                return None
+            for col, text in zip(columns, row):
+                col.append(text)
+    return header, columns
+
+
+def build_cache(path, encoding="utf-8"):
+    """Konversi CSV ke direktori kolom biner (atomik); manifest, atau None jika tidak bisa"""
+    size, mtime_ns = csv_index.fingerprint(path)
+    parsed = _read_columns(path, encoding)
+    if parsed is None:
+        return None
+    header, columns = parsed
+    target = cache_dir(path)
+    tmp = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    manifest = {"size": size, "mtime_ns": mtime_ns, "rows": len(columns[0]),
+                "header": header, "columns": []}
+    for i, texts in enumerate(columns):
+        kind, array, valid, invalid, exact = _classify(texts)
+        np.save(os.path.join(tmp, _column_file(i)), array)
+        if valid is not None:
+            np.save(os.path.join(tmp, _valid_file(i)), valid)
+        manifest["columns"].append({"name": header[i], "kind": kind, "exact": exact,
+                                    "valid": valid is not None, "invalid": invalid})
+        columns[i] = None  # bebaskan teks kolom ini lebih awal
+    with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    manifest["path"] = path
+    return manifest
+
+
+def read_manifest(path):
+    """Manifest cache yang masih segar, atau None jika belum ada / basi (tanpa melihat CSV_CACHE)"""
+    try:
+        with open(os.path.join(cache_dir(path), MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if (manifest["size"], manifest["mtime_ns"]) != csv_index.fingerprint(path):
+            return None
+    except (OSError, ValueError, KeyError):
+        return None
+    manifest["path"] = path
+    return manifest
+
+
+def load_manifest(path):
+    """Manifest segar jika cache diaktifkan (CSV_CACHE=1), selain itu None"""
+    if cache_mode() == "0":
+        return None
+    return read_manifest(path)
+
+
+# -------------------------------
+# Membaca cache
+# -------------------------------
+def is_numeric(manifest, col):
+    return manifest is not None and col < len(manifest["columns"]) and \
+        manifest["columns"][col]["kind"] in ("int", "float")
+
+
+def open_column(manifest, col):
+    """(values, valid mask atau None) sebagai array mmap read-only"""
+    base = cache_dir(manifest["path"])
+    values = np.load(os.path.join(base, _column_file(col)), mmap_mode="r")
+    valid = None
+    if manifest["columns"][col]["valid"]:
+        valid = np.load(os.path.join(base, _valid_file(col)), mmap_mode="r")
+    return values, valid
+
+
+def sum_column(manifest, col, part=0, parts=1, work=0):
+    """
+    (sum, count, bytes) kolom numerik untuk bagian ke-`part` dari `parts` (baris dibagi rata).
+    `work` = iterasi beban CPU opsional per nilai (seperti CPU_WORK), tidak mengubah nilai.
+    """
+    values, valid = open_column(manifest, col)
+    rows = manifest["rows"]
+    first, last = part * rows // parts, (part + 1) * rows // parts
+    chunk = np.asarray(values[first:last], dtype=np.float64)
+    nbytes = values[first:last].nbytes
+    if valid is not None:
+        chunk = chunk[valid[first:last]]
+    csv_scan.apply_work(chunk, work)
+    return float(chunk.sum()), len(chunk), nbytes
+
+
+def load_records(path, encoding="utf-8"):
+    """
+    Pengganti list(csv.DictReader(f)): dari cache jika diaktifkan dan segar, selain itu baca CSV.
+    """
+    manifest = load_manifest(path)
+    if manifest is None or not all(c["exact"] for c in manifest["columns"]):
+        with open(path, mode="r", newline="", encoding=encoding) as f:
+            return list(csv.DictReader(f))
+
+    names = manifest["header"]
+    columns = []
+    for i, meta in enumerate(manifest["columns"]):
+        values, _ = open_column(manifest, i)
+        if meta["kind"] == "str":
+            texts = values.tolist()
+        else:
+            texts = [str(v) for v in values.tolist()]
+        for row, text in meta["invalid"].items():
+            texts[int(row)] = text
+        columns.append(texts)
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konversi CSV ke cache kolom biner (.npy + manifest)")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--force", action="store_true", help="bangun ulang walau cache masih segar")
+    args = parser.parse_args()
+    if not HAS_NUMPY:
+        parser.error("numpy diperlukan untuk cache kolom")
+
+    for path in args.paths:
+        manifest = None if args.force else read_manifest(path)
+        status = "masih segar"
+        if manifest is None:
+            manifest = build_cache(path)
+            status = "dibuat"
+        if manifest is None:
+            print(f"[SKIP] {path}: jumlah field per baris tidak seragam")
+            continue
+        kinds = ", ".join(f"{c['name']}:{c['kind']}" for c in manifest["columns"])
+        print(f"[OK] {cache_dir(path)} {status}: {manifest['rows']:,} baris ({kinds})")
+
+
+if __name__ == "__main__":
+    main()
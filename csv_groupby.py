@@ -0,0 +1,252 @@
+"""
+Group-By Paralel atas Kolom `group` CSV
+Setiap rank memindai bagiannya (rentang byte satu file, atau sebagian file part) dan
+membangun state parsial per grup: count, sum, min, max, mean dan M2 (Welford/Chan).
+State parsial bisa digabung dalam urutan apa pun, sehingga:
+    reduce - semua state digabung ke rank 0 dalam SATU MPI reduce dengan op kustom
+             (MERGE_OP, dua tingkat lewat mpi_hierarchy)
+    hash   - untuk kardinalitas besar: grup dipartisi hash(key) % size, setiap rank
+             menerima (alltoall) dan menggabung hanya grup miliknya, lalu hasil dikumpulkan
+    auto   - hash jika jumlah grup lokal terbesar >= --hash-min, selain itu reduce
+
+Cara menjalankan:
+    mpiexec -n 4 python csv_groupby.py big.csv
+    mpiexec -n 4 python csv_groupby.py D:\\data\\big_split --mode hash --top 5 --json
+
+Kunci harus bilangan bulat (seperti `group` = i % 10); baris dengan kunci/nilai rusak
+dilewati. Variance = variance sampel (M2 / (n - 1)).
+"""
+
+from mpi4py import MPI  # type: ignore
+import argparse
+import glob
+import os
+import time
+
+import bench_metrics
+import csv_numpy
+import csv_partition
+import csv_scan
+import mpi_hierarchy
+
+np = csv_numpy.np
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+size = comm.Get_size()
+
+STATE_DTYPE = [('key', 'i8'), ('n', 'i8'), ('sum', 'f8'), ('min', 'f8'), ('max', 'f8'),
+               ('mean', 'f8'), ('m2', 'f8')]
+HASH_MIN = int(os.getenv("GROUPBY_HASH_MIN", "10000"))
+
+
+# -------------------------------
+# State parsial per grup
+# -------------------------------
+def empty_state():
+    return np.empty(0, dtype=STATE_DTYPE)
+
+
+def block_state(keys, values):
+    """State per grup dari satu blok (keys int64, values float64), urut menurut key"""
+    state = empty_state()
+    if len(keys) == 0:
+        return state
+    order = np.argsort(keys, kind='stable')
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    sums = np.add.reduceat(values, starts)
+    means = sums / counts
+    state = np.empty(len(starts), dtype=STATE_DTYPE)
+    state['key'] = keys[starts]
+    state['n'] = counts
+    state['sum'] = sums
+    state['min'] = np.minimum.reduceat(values, starts)
+    state['max'] = np.maximum.reduceat(values, starts)
+    state['mean'] = means
+    state['m2'] = np.add.reduceat((values - np.repeat(means, counts)) ** 2, starts)
+    return state
+
+
+def merge_states(*states):
+    """Gabung beberapa state (kunci boleh beririsan) dengan rumus paralel Chan"""
+    merged = np.concatenate(states) if states else empty_state()
+    if len(merged) == 0:
+        return merged
+    merged = merged[np.argsort(merged['key'], kind='stable')]
+    keys = merged['key']
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    if len(starts) == len(merged):
+        return merged
+    counts = np.add.reduceat(merged['n'], starts)
+    sums = np.add.reduceat(merged['sum'], starts)
+    means = np.add.reduceat(merged['n'] * merged['mean'], starts) / counts
+    delta = merged['mean'] - np.repeat(means, np.diff(np.r_[starts, len(merged)]))
+    out = np.empty(len(starts), dtype=STATE_DTYPE)
+    out['key'] = keys[starts]
+    out['n'] = counts
+    out['sum'] = sums
+    out['min'] = np.minimum.reduceat(merged['min'], starts)
+    out['max'] = np.maximum.reduceat(merged['max'], starts)
+    out['mean'] = means
+    out['m2'] = np.add.reduceat(merged['m2'] + merged['n'] * delta ** 2, starts)
+    return out
+
+
+def _merge_op(a, b, datatype=None):
+    return merge_states(a, b)
+
+
+MERGE_OP = MPI.Op.Create(_merge_op, commute=True)
+
+
+def variance(state):
+    """Variance sampel per grup (NaN untuk grup dengan satu baris)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(state['n'] > 1, state['m2'] / (state['n'] - 1), np.nan)
+
+
+# -------------------------------
+# Scan
+# -------------------------------
+def scan_range(path, start, end, key_col, value_col, window=csv_scan.WINDOW_SIZE):
+    """(state, baris_dipindai) dari rentang byte [start, end) satu file"""
+    states = []
+    scanned = 0
+    if end <= start:
+        return empty_state(), 0
+    f, mm = csv_scan.open_mmap(path)
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    try:
+        for ws, we in csv_scan.iter_windows(mm, start, end, window):
+            block = buf[ws:we]
+            keys, key_ok = csv_numpy.parse_block(block, key_col)
+            values, value_ok = csv_numpy.parse_block(block, value_col)
+            del block
+            ok = key_ok & value_ok & (keys == np.floor(keys))
+            scanned += len(ok)
+            states.append(block_state(keys[ok].astype(np.int64), values[ok]))
+    finally:
+        del buf
+        mm.close()
+        f.close()
+    return merge_states(*states), scanned
+
+
+def assign_files(files):
+    """Bagi file ke rank: terbesar dulu ke rank dengan beban terkecil (sama di semua rank)"""
+    loads = [0] * size
+    mine = []
+    for path in sorted(files, key=lambda p: (-os.path.getsize(p), p)):
+        target = loads.index(min(loads))
+        loads[target] += os.path.getsize(path)
+        if target == rank:
+            mine.append(path)
+    return mine
+
+
+def local_scan(source, key_col, value_col):
+    """State lokal rank ini untuk file tunggal (rentang byte) atau direktori file part"""
+    if os.path.isdir(source):
+        parts = [scan_range(p, *csv_partition.byte_ranges(p, 1)[0], key_col, value_col)
+                 for p in assign_files(glob.glob(os.path.join(source, "*.csv")))]
+    else:
+        start, end = csv_partition.rank_range(source, rank, size)
+        parts = [scan_range(source, start, end, key_col, value_col)]
+    return merge_states(*(s for s, _ in parts)), sum(n for _, n in parts)
+
+
+# -------------------------------
+# Penggabungan antar rank
+# -------------------------------
+def hash_owner(keys):
+    """Rank pemilik setiap kunci (hash multiplikatif 64-bit, merata untuk kunci berurutan)"""
+    h = keys.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    return ((h >> np.uint64(32)) % np.uint64(size)).astype(np.int64)
+
+
+def combine_reduce(state):
+    """Satu reduce dengan op kustom (dua tingkat); hasil lengkap di rank 0"""
+    return mpi_hierarchy.reduce(comm, state, op=MERGE_OP, root=0)
+
+
+def combine_hash(state):
+    """Partisi hash: setiap rank menggabung grup miliknya, lalu potongan akhir dikumpulkan ke rank 0"""
+    owner = hash_owner(state['key'])
+    outgoing = [state[owner == r] for r in range(size)]
+    incoming = comm.alltoall(outgoing)
+    owned = merge_states(*incoming)
+    parts = mpi_hierarchy.gather(comm, owned, root=0)
+    if rank != 0:
+        return None, len(owned)
+    return merge_states(*parts), len(owned)
+
+
+def print_table(state, top):
+    var = variance(state)
+    print(f"{'group':>10} {'count':>10} {'sum':>16} {'min':>10} {'max':>10} {'mean':>12} {'variance':>12}")
+    print("-" * 86)
+    for i in range(min(top, len(state))):
+        g = state[i]
+        print(f"{g['key']:>10} {g['n']:>10} {g['sum']:>16.4f} {g['min']:>10.4f} {g['max']:>10.4f} "
+              f"{g['mean']:>12.6f} {var[i]:>12.6f}")
+    if len(state) > top:
+        print(f"... {len(state) - top} grup lain (--top untuk menampilkan lebih banyak)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group-by paralel: count/sum/min/max/mean/variance per grup")
+    parser.add_argument("source", nargs="?", default=os.getenv("CSV_PATH", r"D:\data\big.csv"),
+                        help="file CSV atau direktori file part")
+    parser.add_argument("--key", type=int, default=1, help="indeks kolom kunci (default: group)")
+    parser.add_argument("--value", type=int, default=2, help="indeks kolom nilai (default: value)")
+    parser.add_argument("--mode", choices=("auto", "reduce", "hash"), default=os.getenv("GROUPBY_MODE", "auto"))
+    parser.add_argument("--hash-min", type=int, default=HASH_MIN, help="mode auto: pakai hash mulai jumlah grup ini")
+    parser.add_argument("--top", type=int, default=20, help="jumlah grup yang dicetak")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    state, scanned = local_scan(args.source, args.key, args.value)
+    t_scan = time.perf_counter() - t0
+
+    mode = args.mode
+    if mode == "auto":
+        mode = "hash" if comm.allreduce(len(state), op=MPI.MAX) >= args.hash_min else "reduce"
+    t1 = time.perf_counter()
+    if mode == "hash":
+        result, owned = combine_hash(state)
+    else:
+        result, owned = combine_reduce(state), None
+    t_merge = time.perf_counter() - t1
+    local_time = time.perf_counter() - t0
+
+    rows_scanned = comm.reduce(scanned, op=MPI.SUM, root=0)
+    rank_times = mpi_hierarchy.gather(comm, (local_time, t_scan, t_merge, len(state), owned), root=0)
+    if rank != 0:
+        return
+
+    total_time = max(t for t, *_ in rank_times)
+    rows = int(result['n'].sum())
+    print("=" * 86)
+    print(" " * 24 + f"GROUP-BY PARALEL ({mode}, {size} proses)")
+    print("=" * 86)
+    print(f"Sumber: {args.source}, kunci kolom {args.key}, nilai kolom {args.value}")
+    print(f"Baris dipindai: {rows_scanned:,}, baris valid: {rows:,}, grup: {len(result):,}\n")
+    print_table(result, args.top)
+    print(f"\nWaktu: {total_time:.3f}s (scan maks {max(r[1] for r in rank_times):.3f}s, "
+          f"merge maks {max(r[2] for r in rank_times):.3f}s)")
+    print("Grup lokal per rank: " + ", ".join(str(r[3]) for r in rank_times))
+    if mode == "hash":
+        print("Grup dimiliki per rank (hash): " + ", ".join(str(r[4]) for r in rank_times))
+
+    doc = bench_metrics.new_result("csv_groupby", size, mode=mode, groups=len(result))
+    bench_metrics.add_point(doc, rows, parallel_time=total_time, rank_times=[r[0] for r in rank_times],
+                            rows_scanned=rows_scanned, scan_time=[r[1] for r in rank_times],
+                            merge_time=[r[2] for r in rank_times])
+    bench_metrics.emit_result(doc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Indeks Offset Baris CSV (sidecar)
+File `<csv>.idx` menyimpan offset byte setiap baris data ke-N beserta fingerprint file
+(ukuran + mtime). Program bisa langsung lompat ke baris mana pun: cari offset terdekat
+di indeks (O(1)) lalu lewati paling banyak N-1 baris. Indeks otomatis dianggap basi dan
+dibangun ulang jika CSV berubah.
+
+Membangun indeks (paralel, setiap rank memindai rentang byte-nya sendiri):
+    mpiexec -n 4 python csv_index.py big.csv --every 1000
+
+Format sidecar: baris magic, baris JSON header, lalu offset int64 little-endian.
+"""
+
+from mpi4py import MPI  # type: ignore
+from array import array
+from dataclasses import dataclass
+import argparse
+import json
+import os
+import sys
+import time
+
+import csv_partition
+
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+MAGIC = b"CSVIDX1\n"
+DEFAULT_EVERY = int(os.getenv("CSV_INDEX_EVERY", "1000"))
+
+
+@dataclass
+class CsvIndex:
+    path: str
+    size: int
+    mtime_ns: int
+    every: int
+    rows: int
+    header: bool
+    offsets: array  # offsets[k] = byte awal baris data ke-(k * every)
+
+
+def sidecar_path(path):
+    return path + ".idx"
+
+
+def fingerprint(path):
+    """(ukuran, mtime_ns) file; berubah jika CSV ditulis ulang"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _count_rows(path, start, end):
+    """Jumlah baris data di [start, end) (baris terakhir tanpa newline ikut dihitung)"""
+    rows = 0
+    last = b"\n"
+    for block in csv_partition.iter_blocks(path, start, end):
+        rows += block.count(b"\n")
+        last = block[-1:]
+    return rows + (1 if last != b"\n" else 0)
+
+
+def _sample_offsets(path, start, end, first_row, every):
+    """Offset baris global kelipatan `every` yang berada di [start, end); first_row = nomor baris di start"""
+    offsets = array("q")
+    need = (-first_row) % every  # nomor baris lokal berikutnya yang dicatat
+    if need == 0:
+        offsets.append(start)
+        need = every
+    seen = 0  # newline yang sudah dilewati = baris lokal sebelum blok ini
+    pos = start
+    for block in csv_partition.iter_blocks(path, start, end):
+        count = block.count(b"\n")
+        if seen + count >= need:
+            # baris lokal ke-j dimulai tepat setelah newline ke-j
+            if HAS_NUMPY:
+                newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+                picks = newlines[need - seen - 1::every] + (pos + 1)
+                offsets.extend(picks.tolist())
+                need += every * len(picks)
+            else:
+                i = -1
+                for k in range(seen + 1, seen + count + 1):
+                    i = block.find(b"\n", i + 1)
+                    if k == need:
+                        offsets.append(pos + i + 1)
+                        need += every
+        seen += count
+        pos += len(block)
+    while offsets and offsets[-1] >= end:
+        offsets.pop()  # newline terakhir rentang: baris berikutnya milik rank lain / EOF
+    return offsets
+
+
+def build_index(comm, path, every=DEFAULT_EVERY, header=True):
+    """
+    Bangun indeks secara kolektif: setiap rank menghitung baris di rentang byte-nya,
+    Exscan memberi nomor baris awal, lalu offset sampel dikumpulkan ke rank 0 yang
+    menulis sidecar. Semua rank mendapat CsvIndex yang sama.
+    """
+    rank = comm.Get_rank()
+    size, mtime_ns = fingerprint(path) if rank == 0 else (None, None)
+    size, mtime_ns = comm.bcast((size, mtime_ns), root=0)
+
+    start, end = csv_partition.rank_range(path, rank, comm.Get_size(), header)
+    local_rows = _count_rows(path, start, end) if end > start else 0
+    first_row = comm.exscan(local_rows) or 0
+    offsets = _sample_offsets(path, start, end, first_row, every) if end > start else array("q")
+
+    parts = comm.gather(offsets, root=0)
+    total_rows = comm.allreduce(local_rows)
+    index = None
+    if rank == 0:
+        merged = array("q")
+        for part in parts:
+            merged.extend(part)
+        index = CsvIndex(path, size, mtime_ns, every, total_rows, header, merged)
+        save_index(index)
+    return comm.bcast(index, root=0)
+
+
+def save_index(index):
+    """Tulis sidecar secara atomik (file sementara lalu rename)"""
+    meta = {"size": index.size, "mtime_ns": index.mtime_ns, "every": index.every,
+            "rows": index.rows, "header": index.header}
+    tmp = sidecar_path(index.path) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(meta).encode("ascii") + b"\n")
+        offsets = index.offsets
+        if sys.byteorder != "little":
+            offsets = array("q", offsets)
+            offsets.byteswap()
+        offsets.tofile(f)
+    os.replace(tmp, sidecar_path(index.path))
+
+
+def load_index(path):
+    """CsvIndex dari sidecar, atau None jika belum ada / basi (fingerprint tidak cocok)"""
+    try:
+        with open(sidecar_path(path), "rb") as f:
+            if f.readline() != MAGIC:
+                return None
+            meta = json.loads(f.readline())
+            offsets = array("q", f.read())
+    except (OSError, ValueError):
+        return None
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    if (meta["size"], meta["mtime_ns"]) != fingerprint(path):
+        return None
+    return CsvIndex(path, meta["size"], meta["mtime_ns"], meta["every"], meta["rows"], meta["header"], offsets)
+
+
+def ensure_index(comm, path, every=DEFAULT_EVERY, header=True):
+    """Kolektif: muat sidecar yang masih valid, atau bangun ulang jika basi/belum ada"""
+    index = load_index(path) if comm.Get_rank() == 0 else None
+    index = comm.bcast(index, root=0)
+    if index is None or index.every != every or index.header != header:
+        index = build_index(comm, path, every, header)
+    return index
+
+
+# -------------------------------
+# Lompat ke baris
+# -------------------------------
+def row_offset(index, row):
+    """Offset byte awal baris data ke-`row` (0-based); baris == rows -> ukuran file"""
+    if row >= index.rows:
+        return index.size
+    k, skip = divmod(row, index.every)
+    pos = index.offsets[k]
+    if skip == 0:
+        return pos
+    with open(index.path, "rb") as f:
+        f.seek(pos)
+        for _ in range(skip):
+            pos += len(f.readline())
+    return pos
+
+
+def row_range_bytes(index, first, count):
+    """Rentang byte [start, end) untuk baris data [first, first + count)"""
+    return row_offset(index, first), row_offset(index, min(first + count, index.rows))
+
+
+def row_partition(index, rank, size):
+    """Rentang byte untuk pembagian baris yang persis rata antar rank"""
+    base, rem = divmod(index.rows, size)
+    first = rank * base + min(rank, rem)
+    return row_range_bytes(index, first, base + (1 if rank < rem else 0))
+
+
+def main():
+    comm = MPI.COMM_WORLD
+    parser = argparse.ArgumentParser(description="Bangun indeks offset baris CSV (sidecar .idx)")
+    parser.add_argument("path")
+    parser.add_argument("--every", type=int, default=DEFAULT_EVERY, help="simpan offset setiap N baris")
+    parser.add_argument("--no-header", action="store_true")
+    parser.add_argument("--force", action="store_true", help="bangun ulang walau sidecar masih valid")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.force:
+        index = build_index(comm, args.path, args.every, not args.no_header)
+    else:
+        index = ensure_index(comm, args.path, args.every, not args.no_header)
+    elapsed = time.perf_counter() - t0
+    if comm.Get_rank() == 0:
+        print(f"[OK] {sidecar_path(args.path)}: {index.rows:,} baris, {len(index.offsets):,} offset "
+              f"(setiap {index.every}), {elapsed:.3f}s dengan {comm.Get_size()} proses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Parser Kolom Numerik CSV Tervektorisasi (NumPy)
+Setiap jendela byte (mmap, sejajar baris) dilihat sebagai array uint8 tanpa salinan.
+Posisi newline dan separator dicari sekaligus, lalu angka desimal kolom target diurai
+digit demi digit untuk semua baris secara bersamaan (mantissa int64 / 10**frac, hasil
+sama persis dengan float()). Baris rusak ditandai lewat mask, bukan exception; hanya
+bentuk yang jarang (eksponen, spasi, nan, > 15 digit) yang diurai ulang dengan float().
+
+Dipakai oleh csv_parallel_sum.py dan csv_parallel_split.py (CSV_SCANNER=numpy, default
+jika numpy terpasang).
+"""
+
+import csv_scan
+
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+MAX_WIDTH = 24   # field lebih lebar dari ini langsung ke jalur float()
+MAX_DIGITS = 15  # mantissa < 2**53 agar pembagian dengan 10**frac tetap presisi
+
+
+def line_index(buf, sep):
+    """(awal, akhir, separator, separator_pertama) baris di buf; dipakai ulang untuk banyak kolom"""
+    n = len(buf)
+    newlines = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [n]))
+    if starts[-1] >= n:  # jendela diakhiri newline: tidak ada baris sisa
+        starts, ends = starts[:-1], ends[:-1]
+    has_cr = (ends > starts) & (buf[np.maximum(ends - 1, 0)] == 13)
+    ends = ends - has_cr
+
+    seps = np.flatnonzero(buf == sep)
+    first = np.searchsorted(seps, starts)  # separator pertama di/atau setelah awal baris
+    return starts, ends, seps, first
+
+
+def field_bounds(buf, col, sep, lines=None):
+    """(awal, akhir, ada) field ke-`col` untuk setiap baris di buf (akhir tanpa '\\r')"""
+    starts, ends, seps, first = lines if lines is not None else line_index(buf, sep)
+    padded = np.concatenate((seps, [len(buf)]))  # penjaga agar indeks di luar batas tetap valid
+    if col == 0:
+        field_start = starts
+        present = np.ones(len(starts), dtype=bool)
+    else:
+        k = np.minimum(first + col - 1, len(seps))
+        present = padded[k] < ends
+        field_start = padded[k] + 1
+    field_end = np.minimum(padded[np.minimum(first + col, len(seps))], ends)
+    field_start = np.where(present, field_start, ends)
+    return field_start, np.maximum(field_end, field_start), present
+
+
+def parse_block(buf, col, sep=b","):
+    """
+    (values, mask) kolom `col` untuk semua baris di buf (uint8).
+    mask False = kolom tidak ada atau bukan angka (setara ValueError/IndexError di jalur csv).
+    """
+    sep = sep[0] if isinstance(sep, bytes) else ord(sep)
+    return parse_fields(buf, *field_bounds(buf, col, sep))
+
+
+def parse_fields(buf, start, end, present):
+    """(values, mask) untuk field [start, end) yang sudah diketahui (bisa subset baris)"""
+    width = end - start
+    rows = len(start)
+    if rows == 0:
+        return np.empty(0), np.zeros(0, dtype=bool)
+
+    last = len(buf) - 1
+    first_char = buf[np.minimum(start, last)]
+    negative = (width > 0) & (first_char == 45)
+    signed = (width > 0) & ((first_char == 45) | (first_char == 43))
+
+    ok = present & (width > 0) & (width <= MAX_WIDTH)
+    mantissa = np.zeros(rows, dtype=np.int64)
+    frac = np.zeros(rows, dtype=np.int64)
+    digits = np.zeros(rows, dtype=np.int64)
+    seen_dot = np.zeros(rows, dtype=bool)
+    for j in range(min(int(width.max()), MAX_WIDTH)):
+        active = j < width
+        c = buf[np.minimum(start + j, last)]
+        is_digit = active & (c >= 48) & (c <= 57)
+        is_dot = active & (c == 46)
+        if j == 0:
+            ok &= ~active | is_digit | is_dot | signed
+        else:
+            ok &= ~active | is_digit | is_dot
+        ok &= ~(is_dot & seen_dot)
+        seen_dot |= is_dot
+        mantissa = np.where(is_digit, mantissa * 10 + (c.astype(np.int64) - 48), mantissa)
+        frac += is_digit & seen_dot
+        digits += is_digit
+    ok &= (digits > 0) & (digits <= MAX_DIGITS)
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        values = mantissa / np.power(10.0, frac)
+    values = np.where(negative, -values, values)
+
+    # Bentuk lain yang masih diterima float() (1e5, " 4", nan, angka panjang, "2.5" berkutip)
+    for i in np.flatnonzero(present & ~ok & (width > 0)):
+        text = buf[start[i]:end[i]].tobytes().strip(b'"')
+        try:
+            values[i] = float(text)
+            ok[i] = True
+        except ValueError:
+            pass
+    return values, ok
+
+
+def sum_block(buf, col, work=0, scanner="numpy", sep=b","):
+    """
+    (sum, count) kolom `col` satu blok byte sejajar baris (bytes/memoryview/mmap), dengan
+    parser numpy atau regex mmap. Tidak ada array turunan buf yang tersisa setelah kembali.
+    """
+    if scanner == "numpy":
+        values, mask = parse_block(np.frombuffer(buf, dtype=np.uint8), col, sep)
+        values = values[mask]
+        csv_scan.apply_work(values, work)
+        return float(values.sum()), len(values)
+    floats = csv_scan.to_floats(csv_scan.column_pattern(col, sep).findall(buf))
+    csv_scan.apply_work(floats, work)
+    return sum(floats, 0.0), len(floats)
+
+
+def iter_arrays(path, start, end, col, sep=b",", window=csv_scan.WINDOW_SIZE):
+    """Array float64 nilai valid kolom `col` per jendela dari rentang [start, end)"""
+    if end <= start:
+        return
+    f, mm = csv_scan.open_mmap(path)
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    try:
+        for ws, we in csv_scan.iter_windows(mm, start, end, window):
+            values, mask = parse_block(buf[ws:we], col, sep)
+            yield values[mask]
+    finally:
+        del buf  # view harus dilepas sebelum mmap ditutup
+        mm.close()
+        f.close()
+
+
+def sum_column(path, start, end, col, work=0, sep=b",", window=csv_scan.WINDOW_SIZE):
+    """(sum, count, bytes_scanned) seperti csv_scan.sum_column, dengan reduksi vektor"""
+    total = 0.0
+    count = 0
+    for values in iter_arrays(path, start, end, col, sep, window):
+        csv_scan.apply_work(values, work)
+        total += float(values.sum())
+        count += len(values)
+    return total, count, max(end - start, 0)
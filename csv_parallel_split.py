@@ -13,13 +13,21 @@ except Exception:
         def reduce(self, value, op=None, root=0):
             # In single-process fallback just return the local value
             return value
+        def gather(self, value, root=0):
+            return [value]
     class _MPI:
         SUM = None
         MAX = None
         COMM_WORLD = _FakeComm()
     MPI = _MPI()
 
-import csv, time, os
+import csv, glob, time, os
+import bench_metrics
+import csv_cache
+import csv_partition
+import csv_prefetch
+import csv_scan
+import csv_workers
 from multiprocessing.pool import ThreadPool
 
 comm = MPI.COMM_WORLD
@@ -27,73 +35,142 @@ rank = comm.Get_rank()
 size = comm.Get_size()
 
 # === KONFIGURASI ===
-DIR = r"D:\data\big_split"   # folder tempat file split disimpan
+DIR = os.getenv("SPLIT_DIR", r"D:\data\big_split")   # folder tempat file split disimpan
 CPU_WORK = int(os.getenv("CPU_WORK", "0"))  # beban komputasi opsional
 OMP_THREADS = int(os.getenv("OMP_NUM_THREADS", "1"))  # jumlah thread OpenMP per proses MPI
+ASSIGN = os.getenv("SPLIT_ASSIGN", "static")  # static = big_{rank}.csv per rank, dynamic = antrian semua file
+SCHEDULE = os.getenv("SPLIT_SCHEDULE", "master")  # strategi antrian dinamis (mpi_schedule): master / rma
+PATTERN = os.getenv("SPLIT_PATTERN", "big_*.csv")  # file part yang dicari pada mode dynamic
+WORKER_MODE = csv_workers.worker_mode()  # thread = ThreadPool, process = pool proses + shared memory
+CHUNKS = csv_workers.chunk_count(OMP_THREADS)  # potongan baris per file (SPLIT_CHUNKS)
+SCANNER = csv_scan.scanner_mode()  # numpy/mmap = scan kolom langsung dari byte, csv = csv.reader + list baris
 # ====================
 
-path = os.path.join(DIR, f"big_{rank}.csv")  # setiap rank baca file sesuai nomor
-
-if not os.path.exists(path):
-    print(f"[Rank {rank}] File tidak ditemukan: {path}")
-    exit(0)
-
-t0 = time.perf_counter()
-
-# Load data ke memori untuk OpenMP parallelization
-rows_data = []
-with open(path, "r", newline="", encoding="utf-8", errors="ignore") as f:
-    reader = csv.reader(f)
-    next(reader, None)  # lewati header
-    rows_data = list(reader)
-
-local_sum = 0.0
-local_cnt = 0
-
-def process_chunk(args):
-    """Process a chunk of rows and return partial sum and count"""
-    start, end = args
-    psum = 0.0
-    pcnt = 0
-    for i in range(start, end):
-        row = rows_data[i]
-        try:
-            val = float(row[2])
-            tmp = val
-            for _ in range(CPU_WORK):
-                tmp = (tmp * 1.000001) ** 0.5
-            psum += val
-            pcnt += 1
-        except (ValueError, IndexError):
-            pass
-    return psum, pcnt
-
-if OMP_THREADS > 1 and len(rows_data) > 0:
-    # Parallel processing using ThreadPool
-    num_rows = len(rows_data)
-    chunk_ranges = []
-    for tid in range(OMP_THREADS):
-        start = tid * num_rows // OMP_THREADS
-        end = (tid + 1) * num_rows // OMP_THREADS
-        chunk_ranges.append((start, end))
-    
-    with ThreadPool(processes=OMP_THREADS) as pool:
-        results = pool.map(process_chunk, chunk_ranges)
-    
-    local_sum = sum(r[0] for r in results)
-    local_cnt = sum(r[1] for r in results)
+def load_cache(path):
+    """Manifest cache kolom biner file ini (csv_cache.py, CSV_CACHE=1) jika segar dan kolom value numerik"""
+    cache = csv_cache.load_manifest(path)
+    return cache if csv_cache.is_numeric(cache, 2) else None
+
+def process_file(path, cache):
+    """(sum, count, bytes) kolom value satu file part"""
+    local_sum = 0.0
+    local_cnt = 0
+    local_bytes = 0
+
+    def scan_range(byte_range):
+        """Scan kolom value pada satu rentang byte (mmap), tanpa memuat baris ke memori"""
+        scan = csv_prefetch.column_summer(SCANNER)  # CSV_PREFETCH_DEPTH > 0: blok dibaca thread I/O di depan
+        return scan(path, byte_range[0], byte_range[1], 2, CPU_WORK)
+
+    def sum_cached(part):
+        """Jumlahkan bagian ke-`part` dari kolom value di cache (array mmap)"""
+        return csv_cache.sum_column(cache, 2, part, OMP_THREADS, CPU_WORK)
+
+    if cache is not None:
+        # Baris kolom biner dibagi rata per thread, tanpa parse teks
+        if OMP_THREADS > 1:
+            with ThreadPool(processes=OMP_THREADS) as pool:
+                results = pool.map(sum_cached, range(OMP_THREADS))
+        else:
+            results = [sum_cached(0)]
+        local_sum = sum(r[0] for r in results)
+        local_cnt = sum(r[1] for r in results)
+        local_bytes = sum(r[2] for r in results)
+    elif WORKER_MODE == "process" and OMP_THREADS > 1:
+        # Hybrid MPI x proses: isi file di shared memory, worker mem-parse potongan baris tanpa GIL
+        local_sum, local_cnt, local_bytes = csv_workers.sum_file(path, 2, OMP_THREADS, CHUNKS, CPU_WORK, SCANNER)
+    elif SCANNER != "csv":
+        # Rentang data dibagi per potongan (batas sejajar baris), hasil parsial dijumlahkan
+        ranges = csv_partition.byte_ranges(path, CHUNKS, header=True)
+        if OMP_THREADS > 1:
+            with ThreadPool(processes=OMP_THREADS) as pool:
+                results = pool.map(scan_range, ranges)
+        else:
+            results = [scan_range(r) for r in ranges]
+        local_sum = sum(r[0] for r in results)
+        local_cnt = sum(r[1] for r in results)
+        local_bytes = sum(r[2] for r in results)
+    else:
+        # Load data ke memori untuk OpenMP parallelization
+        rows_data = []
+        with open(path, "r", newline="", encoding="utf-8", errors="ignore") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # lewati header
+            rows_data = list(reader)
+
+        def process_chunk(args):
+            """Process a chunk of rows and return partial sum and count"""
+            start, end = args
+            values = []
+            for i in range(start, end):
+                try:
+                    values.append(float(rows_data[i][2]))
+                except (ValueError, IndexError):
+                    pass
+            csv_scan.apply_work(values, CPU_WORK)
+            return sum(values, 0.0), len(values)
+
+        if OMP_THREADS > 1 and len(rows_data) > 0:
+            # Parallel processing using ThreadPool
+            num_rows = len(rows_data)
+            chunk_ranges = []
+            for tid in range(OMP_THREADS):
+                start = tid * num_rows // OMP_THREADS
+                end = (tid + 1) * num_rows // OMP_THREADS
+                chunk_ranges.append((start, end))
+
+            with ThreadPool(processes=OMP_THREADS) as pool:
+                results = pool.map(process_chunk, chunk_ranges)
+
+            local_sum = sum(r[0] for r in results)
+            local_cnt = sum(r[1] for r in results)
+        else:
+            # Sequential fallback
+            local_sum, local_cnt = process_chunk((0, len(rows_data)))
+
+    return local_sum, local_cnt, local_bytes
+
+def discover_files():
+    """Semua file part di DIR (pola SPLIT_PATTERN), terbesar dulu"""
+    files = glob.glob(os.path.join(DIR, PATTERN))
+    return sorted(files, key=lambda p: (-os.path.getsize(p), p))
+
+my_files = []  # (path, cache, sum, count, bytes) untuk setiap file yang diproses rank ini
+
+def process_files(paths):
+    """work_fn mpi_schedule: proses file satu per satu, hasil dicatat di my_files"""
+    results = []
+    for p in paths:
+        cache = load_cache(p)
+        my_files.append((p, cache) + process_file(p, cache))
+        results.append(my_files[-1][2:4])
+    return results
+
+schedule_stats = None
+if ASSIGN == "dynamic":
+    import mpi_schedule
+    # Antrian dinamis: semua file part (terbesar dulu) diambil rank yang selesai lebih dulu
+    files = discover_files() if rank == 0 else None
+    if rank == 0 and not files:
+        print(f"[Rank 0] Tidak ada file {PATTERN} di {DIR}")
+    t0 = time.perf_counter()
+    _, schedule_stats = mpi_schedule.run(SCHEDULE, comm, files or [], process_files,
+                                         policy="fixed", chunk=1, min_chunk=1)
 else:
-    # Sequential fallback
-    for row in rows_data:
-        try:
-            val = float(row[2])
-            tmp = val
-            for _ in range(CPU_WORK):
-                tmp = (tmp * 1.000001) ** 0.5
-            local_sum += val
-            local_cnt += 1
-        except (ValueError, IndexError):
-            pass
+    path = os.path.join(DIR, f"big_{rank}.csv")  # setiap rank baca file sesuai nomor
+
+    if not os.path.exists(path):
+        print(f"[Rank {rank}] File tidak ditemukan: {path}")
+        exit(0)
+
+    cache = load_cache(path)
+
+    t0 = time.perf_counter()
+    my_files.append((path, cache) + process_file(path, cache))
+
+local_sum = sum(f[2] for f in my_files)
+local_cnt = sum(f[3] for f in my_files)
+local_bytes = sum(f[4] for f in my_files)
 
 t1 = time.perf_counter()
 local_time = t1 - t0
@@ -102,8 +179,31 @@ local_time = t1 - t0
 global_sum  = comm.reduce(local_sum,  op=MPI.SUM, root=0)
 global_cnt  = comm.reduce(local_cnt,  op=MPI.SUM, root=0)
 global_time = comm.reduce(local_time, op=MPI.MAX, root=0)
+rank_times  = comm.gather(local_time, root=0)
+rank_stats  = comm.gather((csv_scan.throughput_mbs(local_bytes, local_time), csv_scan.peak_rss_mb()), root=0)
+cached_files = comm.reduce(sum(f[1] is not None for f in my_files), op=MPI.SUM, root=0)
+files_per_rank = comm.gather(len(my_files), root=0)
 
 if rank == 0:
     avg = (global_sum / global_cnt) if global_cnt else float("nan")
     omp_info = f", threads={OMP_THREADS}" if OMP_THREADS > 1 else ""
-    print(f"rows={global_cnt}, sum={global_sum}, avg={avg}, time={global_time:.3f}s, procs={size}{omp_info}")
\ No newline at end of file
+    if OMP_THREADS > 1 and WORKER_MODE == "process":
+        omp_info = f", workers={OMP_THREADS} (proses)"
+    print(f"rows={global_cnt}, sum={global_sum}, avg={avg}, time={global_time:.3f}s, procs={size}{omp_info}")
+    if SCANNER != "csv" or cached_files:
+        print("MB/s per rank: " + ", ".join(f"{mbs:.1f}" for mbs, _ in rank_stats))
+    extra = {}
+    if schedule_stats is not None:
+        # Waktu sibuk = total waktu memproses file (tanpa menunggu antrian)
+        print("Busy per rank: " + ", ".join(f"{busy:.3f}s ({n} file)" for busy, n in
+                                            zip(schedule_stats['busy_times'], files_per_rank)) +
+              f", imbalance={schedule_stats['imbalance']:.2f}")
+        extra = {'busy_times': schedule_stats['busy_times'], 'files_per_rank': files_per_rank,
+                 'imbalance': schedule_stats['imbalance']}
+    doc = bench_metrics.new_result("csv_parallel_split", size, threads=OMP_THREADS, scanner=SCANNER,
+                                   cached_files=cached_files, worker_mode=WORKER_MODE, chunks=CHUNKS,
+                                   assign=ASSIGN)
+    bench_metrics.add_point(doc, global_cnt, parallel_time=global_time, rank_times=rank_times,
+                            sum=global_sum, avg=avg, throughput_mbs=[mbs for mbs, _ in rank_stats],
+                            peak_rss_mb=[rss for _, rss in rank_stats], **extra)
+    bench_metrics.emit_result(doc)
@@ -1,46 +1,55 @@
 from mpi4py import MPI
-import csv, time, os
+import csv, time, os, sys
+import bench_metrics
+import csv_cache
+import csv_index
+import csv_partition
+import csv_prefetch
+import csv_query
+import csv_scan
+import mpi_hierarchy
 
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
 size = comm.Get_size()
 
 # === KONFIGURASI ===
-CSV_PATH   = r"D:\data\big.csv"   # sudah benar: file besar
+CSV_PATH   = os.getenv("CSV_PATH", r"D:\data\big.csv")   # sudah benar: file besar
 COL_INDEX  = 2                    # kolom 'value'
 HAS_HEADER = True
 ENCODING   = "utf-8"
 CPU_WORK   = int(os.getenv("CPU_WORK", "0"))  # 0=off, >0 = beban komputasi ringan
+PARTITION  = os.getenv("CSV_PARTITION", "bytes")  # bytes = rentang byte, index = baris rata via sidecar .idx, rows = cara lama
+SCANNER    = csv_scan.scanner_mode()  # numpy / mmap / csv (lihat csv_scan.py)
+QUERY      = os.getenv("CSV_QUERY", "")  # mis. "SELECT sum(value), count(*) WHERE value > 50 AND group IN (1,3)"
 # ====================
 
 def count_lines(path):
     with open(path, "r", newline="", encoding=ENCODING, errors="ignore") as f:
         return sum(1 for _ in f)
 
-if rank == 0:
-    total_lines = count_lines(CSV_PATH)
-    start = 1 if HAS_HEADER else 0
-    data_lines = max(0, total_lines - start)
-    base, rem = divmod(data_lines, size)
-    sizes = [base + (1 if i < rem else 0) for i in range(size)]
-    offsets = [start]
-    for s in sizes[:-1]:
-        offsets.append(offsets[-1] + s)
-else:
-    sizes = None
-    offsets = None
-
-sizes   = comm.bcast(sizes, root=0)
-offsets = comm.bcast(offsets, root=0)
-my_start = offsets[rank]
-my_size  = sizes[rank]
-
-# ===== timer mulai =====
-t0 = time.perf_counter()
+def rows_partition():
+    """Cara lama: rank 0 menghitung baris, setiap rank melewati my_start baris dari awal file"""
+    if rank == 0:
+        total_lines = count_lines(CSV_PATH)
+        start = 1 if HAS_HEADER else 0
+        data_lines = max(0, total_lines - start)
+        base, rem = divmod(data_lines, size)
+        sizes = [base + (1 if i < rem else 0) for i in range(size)]
+        offsets = [start]
+        for s in sizes[:-1]:
+            offsets.append(offsets[-1] + s)
+    else:
+        sizes = None
+        offsets = None
+    
+    sizes   = comm.bcast(sizes, root=0)
+    offsets = comm.bcast(offsets, root=0)
+    return offsets[rank], sizes[rank]
 
-local_sum = 0.0
-local_cnt = 0
-if my_size > 0:
+def iter_rows_skip(my_start, my_size):
+    if my_size <= 0:
+        return
     with open(CSV_PATH, "r", newline="", encoding=ENCODING, errors="ignore") as f:
         reader = csv.reader(f)
         for _ in range(my_start):
@@ -48,26 +57,130 @@ if my_size > 0:
         for _ in range(my_size):
             row = next(reader, None)
             if row is None: break
-            try:
-                val = float(row[COL_INDEX])
-                # Beban CPU ringan (opsional) BIAR TIDAK MENGUBAH NILAI ASLI
-                tmp = val
-                for _ in range(CPU_WORK):
-                    tmp = (tmp * 1.000001) ** 0.5
-                # akumulasi pakai nilai asli
-                local_sum += val
-                local_cnt += 1
-            except (ValueError, IndexError):
-                pass
+            yield row
+
+if PARTITION == "rows":
+    my_start, my_size = rows_partition()
+elif PARTITION == "index":
+    # Sidecar dibangun sekali (paralel) dan dipakai ulang selama CSV tidak berubah
+    row_index = csv_index.ensure_index(comm, CSV_PATH, header=HAS_HEADER)
+
+def run_query(text):
+    """Mode query (csv_query.py): predikat & proyeksi dievaluasi saat scan rentang byte rank ini"""
+    if csv_query.np is None:
+        if rank == 0:
+            print("[ERROR] CSV_QUERY membutuhkan numpy")
+        return 1
+    try:
+        query = csv_query.parse_query(text, csv_query.read_header(CSV_PATH, ENCODING))
+    except ValueError as exc:
+        if rank == 0:
+            print(f"[ERROR] query tidak valid: {exc}")
+        return 1
+    if PARTITION == "index":
+        byte_start, byte_end = csv_index.row_partition(row_index, rank, size)
+    else:
+        byte_start, byte_end = csv_partition.rank_range(CSV_PATH, rank, size, HAS_HEADER)
+
+    t0 = time.perf_counter()
+    partial = csv_query.scan_range(query, CSV_PATH, byte_start, byte_end)
+    local_time = time.perf_counter() - t0
+
+    partials   = mpi_hierarchy.gather(comm, partial, root=0)
+    rank_times = mpi_hierarchy.gather(comm, local_time, root=0)
+    if rank != 0:
+        return 0
+    total = csv_query.merge_partials(query, partials)
+    global_time = max(rank_times)
+    print(f"query: {query.text}")
+    if query.aggregate:
+        values = csv_query.results(query, total)
+        print(", ".join(f"{label}={value}" for label, value in values.items()))
+    else:
+        values = None
+        print(" | ".join(query.columns[col] for _, col, _ in query.select))
+        for row in total["rows"]:
+            print(" | ".join("" if v is None else f"{v:.15g}" for v in row))
+    scanned, matched = total["scanned"], total["matched"]
+    print(f"rows_scanned={scanned}, rows_matched={matched} ({100 * matched / max(scanned, 1):.2f}%), "
+          f"fields_parsed={total['parsed']}, time={global_time:.3f}s, procs={size}")
+    for (_, _, _, label), passed in zip(query.where, total["passed"]):
+        print(f"  {label}: {passed} baris lolos")
+    doc = bench_metrics.new_result("csv_parallel_sum", size, partition=PARTITION, scanner="numpy",
+                                   query=query.text)
+    bench_metrics.add_point(doc, matched, parallel_time=global_time, rank_times=rank_times,
+                            rows_scanned=scanned, rows_matched=matched, fields_parsed=total["parsed"],
+                            predicate_passed=total["passed"], results=values, rows=total["rows"])
+    bench_metrics.emit_result(doc)
+    return 0
+
+if QUERY:
+    # Tanpa cache dan tanpa parse penuh: hanya kolom predikat/SELECT yang diurai
+    sys.exit(run_query(QUERY))
+
+# Cache kolom biner (csv_cache.py, CSV_CACHE=1): jika masih segar, kolom di-mmap tanpa parse teks
+cache = csv_cache.load_manifest(CSV_PATH) if rank == 0 and HAS_HEADER else None
+cache = comm.bcast(cache if csv_cache.is_numeric(cache, COL_INDEX) else None, root=0)
+
+# ===== timer mulai =====
+t0 = time.perf_counter()
+
+local_bytes = 0
+if cache is not None:
+    rows = None
+elif PARTITION == "rows":
+    rows = iter_rows_skip(my_start, my_size)
+else:
+    if PARTITION == "index":
+        # Jumlah baris persis rata: offset awal/akhir dari indeks (lompat O(1))
+        byte_start, byte_end = csv_index.row_partition(row_index, rank, size)
+    else:
+        # Rentang byte sendiri (batas sejajar awal baris), tanpa membaca bagian rank lain
+        byte_start, byte_end = csv_partition.rank_range(CSV_PATH, rank, size, HAS_HEADER)
+    local_bytes = max(byte_end - byte_start, 0)
+    rows = csv.reader(csv_partition.iter_lines(CSV_PATH, byte_start, byte_end, ENCODING))
+
+local_sum = 0.0
+local_cnt = 0
+if cache is not None:
+    # Baris dibagi persis rata langsung di array kolom
+    local_sum, local_cnt, local_bytes = csv_cache.sum_column(cache, COL_INDEX, rank, size, CPU_WORK)
+elif PARTITION != "rows" and SCANNER != "csv":
+    # mmap + parser kolom (numpy tervektorisasi / regex): tanpa decode dan tanpa list per baris
+    scan = csv_prefetch.column_summer(SCANNER)  # CSV_PREFETCH_DEPTH > 0: blok dibaca thread I/O di depan
+    local_sum, local_cnt, _ = scan(CSV_PATH, byte_start, byte_end, COL_INDEX, CPU_WORK)
+else:
+    for row in rows:
+        try:
+            val = float(row[COL_INDEX])
+        except (ValueError, IndexError):
+            continue
+        # Beban CPU ringan (opsional) BIAR TIDAK MENGUBAH NILAI ASLI
+        if CPU_WORK:
+            csv_scan.apply_work((val,), CPU_WORK)
+        # akumulasi pakai nilai asli
+        local_sum += val
+        local_cnt += 1
 
 t1 = time.perf_counter()
 local_time = t1 - t0
 # ===== timer selesai =====
 
-global_sum  = comm.reduce(local_sum,  op=MPI.SUM, root=0)
-global_cnt  = comm.reduce(local_cnt,  op=MPI.SUM, root=0)
-global_time = comm.reduce(local_time, op=MPI.MAX, root=0)  # waktu terlama antar-rank = critical path
+# Agregasi dua tingkat (dalam node, lalu antar node leader)
+global_sum  = mpi_hierarchy.reduce(comm, local_sum,  op=MPI.SUM, root=0)
+global_cnt  = mpi_hierarchy.reduce(comm, local_cnt,  op=MPI.SUM, root=0)
+rank_times  = mpi_hierarchy.gather(comm, local_time, root=0)
+rank_stats  = mpi_hierarchy.gather(comm, (csv_scan.throughput_mbs(local_bytes, local_time), csv_scan.peak_rss_mb()), root=0)
+global_time = max(rank_times) if rank == 0 else None  # waktu terlama antar-rank = critical path
 
 if rank == 0:
     avg = (global_sum / global_cnt) if global_cnt else float("nan")
     print(f"rows={global_cnt}, sum={global_sum}, avg={avg}, time={global_time:.3f}s, procs={size}")
+    if cache is not None or PARTITION != "rows":
+        print("MB/s per rank: " + ", ".join(f"{mbs:.1f}" for mbs, _ in rank_stats))
+    doc = bench_metrics.new_result("csv_parallel_sum", size, partition=PARTITION, scanner=SCANNER,
+                                   cached=cache is not None)
+    bench_metrics.add_point(doc, global_cnt, parallel_time=global_time, rank_times=rank_times,
+                            sum=global_sum, avg=avg, throughput_mbs=[mbs for mbs, _ in rank_stats],
+                            peak_rss_mb=[rss for _, rss in rank_stats])
+    bench_metrics.emit_result(doc)
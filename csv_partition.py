@@ -0,0 +1,91 @@
+"""
+Partisi CSV Berdasarkan Byte
+File dibagi menjadi rentang byte [start, end) yang sama besar, lalu setiap batas digeser
+ke awal baris berikutnya. Setiap rank hanya membuka dan mem-parse rentangnya sendiri
+(seek + read blok), tanpa menghitung baris atau melewati baris milik rank lain.
+
+Asumsi: field tidak berisi newline di dalam tanda kutip (seperti big.csv).
+"""
+
+import os
+
+BLOCK_SIZE = int(os.getenv("CSV_BLOCK_SIZE", str(1 << 20)))  # ukuran blok baca (bytes)
+ALIGN_BLOCK = 64 * 1024
+
+
+def data_start(f, header=True):
+    """Offset byte awal data (setelah baris header jika ada)"""
+    if not header:
+        return 0
+    f.seek(0)
+    return len(f.readline())
+
+
+def align_to_line(f, pos, lower, upper):
+    """Geser pos ke awal baris berikutnya (tetap pos jika tepat setelah newline)"""
+    if pos <= lower:
+        return lower
+    if pos >= upper:
+        return upper
+    f.seek(pos - 1)
+    offset = pos - 1
+    while True:
+        block = f.read(ALIGN_BLOCK)
+        if not block:
+            return upper
+        i = block.find(b"\n")
+        if i >= 0:
+            return min(offset + i + 1, upper)
+        offset += len(block)
+
+
+def byte_ranges(path, parts, header=True):
+    """Semua rentang [(start, end)] untuk `parts` bagian, batas sejajar awal baris"""
+    with open(path, "rb") as f:
+        lower = data_start(f, header)
+        upper = os.fstat(f.fileno()).st_size
+        span = upper - lower
+        bounds = [align_to_line(f, lower + span * i // parts, lower, upper) for i in range(parts + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def rank_range(path, rank, size, header=True):
+    """Rentang byte milik satu rank; dihitung mandiri (batas sama dengan rank tetangga)"""
+    with open(path, "rb") as f:
+        lower = data_start(f, header)
+        upper = os.fstat(f.fileno()).st_size
+        span = upper - lower
+        start = align_to_line(f, lower + span * rank // size, lower, upper)
+        end = align_to_line(f, lower + span * (rank + 1) // size, lower, upper)
+    return start, end
+
+
+def iter_blocks(path, start, end, block_size=BLOCK_SIZE):
+    """Blok bytes dari [start, end), setiap blok berakhir di batas baris"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        tail = b""
+        while remaining > 0:
+            chunk = f.read(min(block_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            cut = chunk.rfind(b"\n") + 1
+            if cut == 0:
+                tail += chunk
+                continue
+            yield tail + chunk[:cut]
+            tail = chunk[cut:]
+        if tail:
+            yield tail
+
+
+def iter_lines(path, start, end, encoding="utf-8", block_size=BLOCK_SIZE):
+    """Baris teks (tanpa newline) dari rentang [start, end), untuk csv.reader"""
+    for block in iter_blocks(path, start, end, block_size):
+        lines = block.decode(encoding, errors="ignore").split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        for line in lines:
+            yield line[:-1] if line.endswith("\r") else line
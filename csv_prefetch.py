@@ -0,0 +1,164 @@
+"""
+Pembaca CSV dengan Prefetch (double/multi-buffering)
+Thread I/O latar belakang membaca blok besar berikutnya (readinto ke buffer prealokasi)
+selagi blok saat ini di-parse dan diagregasi, sehingga waktu tunggu disk tumpang tindih
+dengan komputasi. Blok selalu berakhir di batas baris (sisa baris dibawa ke blok berikutnya).
+
+    CSV_PREFETCH_DEPTH  jumlah blok yang boleh dibaca di depan (0 = nonaktif, pakai mmap;
+                        1 = double buffering; lebih besar = lebih tahan lonjakan latensi)
+    CSV_PREFETCH_BLOCK  ukuran blok (bytes, default 4 MiB); memori = (depth + 1) x blok
+
+Benchmark cold cache (halaman file dibuang lewat posix_fadvise DONTNEED):
+    python bench_prefetch.py big.csv --depths 0,1,2,4 --blocks 262144,1048576,4194304
+"""
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+import csv_numpy
+import csv_scan
+
+PREFETCH_BLOCK = int(os.getenv("CSV_PREFETCH_BLOCK", str(4 << 20)))
+
+
+def prefetch_depth():
+    return max(0, int(os.getenv("CSV_PREFETCH_DEPTH", "0")))
+
+
+@dataclass
+class PrefetchStats:
+    blocks: int = 0
+    bytes: int = 0
+    read_time: float = 0.0  # waktu di readinto (thread I/O, atau sinkron jika depth 0)
+    io_wait: float = 0.0    # waktu konsumen menunggu blok berikutnya siap
+
+
+def _produce(path, start, end, get_buffer, stats):
+    """Isi buffer bergiliran dari [start, end); yield (buffer, panjang_sampai_batas_baris)"""
+    with open(path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), start, end - start, os.POSIX_FADV_SEQUENTIAL)
+        f.seek(start)
+        pos = start
+        tail = b""
+        buf = None
+        while pos < end:
+            if buf is None:
+                buf = get_buffer()
+                if buf is None:
+                    return  # konsumen berhenti lebih awal
+            t = len(tail)
+            if t * 2 > len(buf):
+                buf = bytearray(t * 2 + len(buf))  # baris lebih panjang dari blok
+            buf[:t] = tail
+            t0 = time.perf_counter()
+            with memoryview(buf) as mv:
+                n = f.readinto(mv[t:t + min(len(buf) - t, end - pos)])
+            stats.read_time += time.perf_counter() - t0
+            if not n:
+                break  # file memendek sejak rentang dihitung
+            pos += n
+            stats.bytes += n
+            total = t + n
+            cut = total if pos >= end else buf.rfind(b"\n", 0, total) + 1
+            if cut == 0:
+                tail = bytes(buf[:total])  # belum ada newline: buffer dipakai lagi
+                continue
+            tail = bytes(buf[cut:total])
+            yield buf, cut
+            buf = None
+        if tail:
+            buf = buf if buf is not None else get_buffer()
+            if buf is not None:
+                if len(buf) < len(tail):
+                    buf = bytearray(len(tail))
+                buf[:len(tail)] = tail
+                yield buf, len(tail)
+
+
+def iter_blocks(path, start, end, block_size=PREFETCH_BLOCK, depth=1, stats=None):
+    """
+    memoryview blok sejajar baris dari [start, end). View hanya valid sampai iterasi
+    berikutnya (buffer dipakai ulang), jadi jangan disimpan.
+    """
+    stats = stats if stats is not None else PrefetchStats()
+    if end <= start:
+        return
+
+    if depth <= 0:
+        # Tanpa prefetch: baca lalu proses bergantian (baseline)
+        single = bytearray(block_size)
+        blocks = _produce(path, start, end, lambda: single, stats)
+        while True:
+            t0 = time.perf_counter()
+            item = next(blocks, None)
+            stats.io_wait += time.perf_counter() - t0
+            if item is None:
+                return
+            buf, cut = item
+            single = buf
+            with memoryview(buf) as mv, mv[:cut] as view:
+                stats.blocks += 1
+                yield view
+
+    free = queue.Queue()
+    ready = queue.Queue()
+    for _ in range(depth + 1):
+        free.put(bytearray(block_size))
+    stop = threading.Event()
+
+    def next_buffer():
+        buf = free.get()
+        return None if stop.is_set() else buf
+
+    def reader():
+        try:
+            for item in _produce(path, start, end, next_buffer, stats):
+                ready.put(item)
+            ready.put(None)
+        except BaseException as exc:  # diteruskan ke konsumen
+            ready.put(exc)
+
+    thread = threading.Thread(target=reader, name="csv-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            t0 = time.perf_counter()
+            item = ready.get()
+            stats.io_wait += time.perf_counter() - t0
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            buf, cut = item
+            with memoryview(buf) as mv, mv[:cut] as view:
+                stats.blocks += 1
+                yield view
+            free.put(buf)
+    finally:
+        stop.set()
+        free.put(None)  # bangunkan reader jika sedang menunggu buffer
+        thread.join()
+
+
+def sum_column(path, start, end, col, work=0, scanner="numpy", block_size=PREFETCH_BLOCK,
+               depth=None, stats=None):
+    """(sum, count, bytes_scanned) seperti csv_scan.sum_column, dengan blok di-prefetch"""
+    depth = prefetch_depth() if depth is None else depth
+    total = 0.0
+    count = 0
+    for view in iter_blocks(path, start, end, block_size, depth, stats):
+        s, c = csv_numpy.sum_block(view, col, work, scanner)
+        total += s
+        count += c
+    return total, count, max(end - start, 0)
+
+
+def column_summer(scanner):
+    """Fungsi (path, start, end, col, work) -> (sum, count, bytes) sesuai scanner & CSV_PREFETCH_DEPTH"""
+    if prefetch_depth() > 0 and scanner != "csv":
+        return lambda path, start, end, col, work=0: sum_column(path, start, end, col, work, scanner)
+    return csv_numpy.sum_column if scanner == "numpy" else csv_scan.sum_column
@@ -0,0 +1,275 @@
+"""
+Mode Query untuk Scanner CSV (predicate & projection pushdown)
+Query kecil bergaya SQL dievaluasi langsung saat scan per jendela mmap:
+
+    SELECT sum(value), count(*), avg(value) WHERE value > 50 AND group IN (1,3)
+    SELECT id, value WHERE group = 7 AND value >= 99.5 LIMIT 5
+
+Predikat dievaluasi berurutan dan setiap predikat hanya mengurai kolomnya untuk baris
+yang masih lolos; kolom SELECT diurai hanya untuk baris yang cocok. Baris yang gagal di
+predikat pertama tidak pernah dikonversi lebih jauh. Nilai yang bukan angka dianggap
+tidak cocok (seperti NULL).
+
+Dukungan: agregat count/sum/min/max/avg atau proyeksi kolom (dengan LIMIT, default 10),
+operator > >= < <= = != dan IN (...), digabung dengan AND. Literal harus angka.
+Dipakai oleh csv_parallel_sum.py (CSV_QUERY="...").
+"""
+
+import csv
+import re
+from dataclasses import dataclass, field
+
+import csv_numpy
+import csv_scan
+
+np = csv_numpy.np
+
+AGGREGATES = ("count", "sum", "min", "max", "avg")
+DEFAULT_LIMIT = 10
+
+_TOKEN = re.compile(r"\s*(>=|<=|!=|<>|==|[(),*<>=]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|\w+)")
+_OPS = {
+    ">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal,
+    "=": np.equal, "==": np.equal, "!=": np.not_equal, "<>": np.not_equal,
+} if np is not None else {}
+
+
+@dataclass
+class Query:
+    text: str
+    select: list  # [(agregat atau None, indeks kolom atau None untuk *, label)]
+    where: list   # [(indeks kolom, operator, literal tuple, label)]
+    limit: int = DEFAULT_LIMIT
+    columns: list = field(default_factory=list)  # nama kolom header
+
+    @property
+    def aggregate(self):
+        return self.select[0][0] is not None
+
+
+def read_header(path, encoding="utf-8"):
+    """Nama kolom dari baris pertama CSV"""
+    with open(path, "r", newline="", encoding=encoding, errors="ignore") as f:
+        header = next(csv.reader(f), [])
+    return [name.strip().lstrip("﻿") for name in header]
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise ValueError(f"token tidak dikenal di posisi {pos}: {text[pos:pos + 10]!r}")
+        tokens.append(m.group(1))
+        pos = m.end()
+    return tokens
+
+
+def parse_query(text, header):
+    """Query dari teks; ValueError dengan pesan jika tidak valid"""
+    tokens = _tokenize(text)
+    names = {name.lower(): i for i, name in enumerate(header)}
+    pos = 0
+
+    def peek():
+        return tokens[pos].lower() if pos < len(tokens) else None
+
+    def take(expected=None):
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError(f"query terpotong, diharapkan {expected or 'token'}")
+        token = tokens[pos]
+        if expected is not None and token.lower() != expected:
+            raise ValueError(f"diharapkan {expected!r}, ditemukan {token!r}")
+        pos += 1
+        return token
+
+    def column():
+        name = take()
+        if name.lower() not in names:
+            raise ValueError(f"kolom {name!r} tidak ada (header: {', '.join(header)})")
+        return names[name.lower()]
+
+    def number():
+        token = take()
+        try:
+            return float(token)
+        except ValueError:
+            raise ValueError(f"literal harus angka, ditemukan {token!r}") from None
+
+    take("select")
+    select = []
+    while True:
+        if peek() in AGGREGATES and pos + 1 < len(tokens) and tokens[pos + 1] == "(":
+            agg = take().lower()
+            take("(")
+            if peek() == "*":
+                if agg != "count":
+                    raise ValueError(f"{agg}(*) tidak didukung, hanya count(*)")
+                take()
+                col = None
+            else:
+                col = column()
+            take(")")
+            select.append((agg, col, f"{agg}({'*' if col is None else header[col]})"))
+        else:
+            col = column()
+            select.append((None, col, header[col]))
+        if peek() != ",":
+            break
+        take(",")
+    if len({agg is None for agg, _, _ in select}) > 1:
+        raise ValueError("agregat dan kolom biasa tidak bisa dicampur (tidak ada GROUP BY)")
+
+    where = []
+    if peek() == "where":
+        take()
+        while True:
+            col = column()
+            op = take().lower()
+            if op == "in":
+                take("(")
+                values = [number()]
+                while peek() == ",":
+                    take(",")
+                    values.append(number())
+                take(")")
+                label = f"{header[col]} IN ({', '.join(f'{v:g}' for v in values)})"
+                where.append((col, "in", tuple(values), label))
+            elif op in _OPS:
+                value = number()
+                where.append((col, op, (value,), f"{header[col]} {op} {value:g}"))
+            else:
+                raise ValueError(f"operator tidak dikenal: {op!r}")
+            if peek() != "and":
+                break
+            take("and")
+
+    limit = DEFAULT_LIMIT
+    if peek() == "limit":
+        take()
+        limit = int(number())
+    if pos != len(tokens):
+        raise ValueError(f"sisa query tidak dikenali: {' '.join(tokens[pos:])!r}")
+    return Query(text, select, where, limit, list(header))
+
+
+# -------------------------------
+# Evaluasi saat scan
+# -------------------------------
+def new_partial(query):
+    return {
+        "scanned": 0,
+        "matched": 0,
+        "parsed": 0,  # jumlah field yang benar-benar diurai menjadi angka
+        "passed": [0] * len(query.where),
+        "aggs": [[0, 0.0, np.inf, -np.inf] for _ in query.select],  # count, sum, min, max
+        "rows": [],
+    }
+
+
+def _scan_block(query, block, sep, partial):
+    lines = csv_numpy.line_index(block, sep)
+    bounds = {}
+
+    def parse(col, rows):
+        if col not in bounds:
+            bounds[col] = csv_numpy.field_bounds(block, col, sep, lines)
+        start, end, present = bounds[col]
+        partial["parsed"] += len(rows)
+        return csv_numpy.parse_fields(block, start[rows], end[rows], present[rows])
+
+    alive = np.arange(len(lines[0]))
+    partial["scanned"] += len(alive)
+    for i, (col, op, literals, _) in enumerate(query.where):
+        if len(alive) == 0:
+            break
+        values, ok = parse(col, alive)
+        if op == "in":
+            ok &= np.isin(values, literals)
+        else:
+            ok &= _OPS[op](values, literals[0])
+        alive = alive[ok]
+        partial["passed"][i] += len(alive)
+    partial["matched"] += len(alive)
+    if len(alive) == 0:
+        return
+
+    if not query.aggregate:
+        need = query.limit - len(partial["rows"])
+        if need <= 0:
+            return
+        alive = alive[:need]
+        columns = []
+        for _, col, _ in query.select:
+            values, ok = parse(col, alive)
+            columns.append([v if k else None for v, k in zip(values.tolist(), ok.tolist())])
+        partial["rows"].extend(zip(*columns))
+        return
+
+    parsed = {}
+    for (agg, col, _), state in zip(query.select, partial["aggs"]):
+        if col is None:
+            state[0] += len(alive)
+            continue
+        if col not in parsed:
+            values, ok = parse(col, alive)
+            parsed[col] = values[ok]
+        values = parsed[col]
+        if len(values):
+            state[0] += len(values)
+            state[1] += float(values.sum())
+            state[2] = min(state[2], float(values.min()))
+            state[3] = max(state[3], float(values.max()))
+
+
+def scan_range(query, path, start, end, sep=b",", window=csv_scan.WINDOW_SIZE):
+    """Partial (statistik + state agregat / baris proyeksi) untuk rentang byte [start, end)"""
+    partial = new_partial(query)
+    if end <= start:
+        return partial
+    sep = sep[0]
+    f, mm = csv_scan.open_mmap(path)
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    try:
+        for ws, we in csv_scan.iter_windows(mm, start, end, window):
+            _scan_block(query, buf[ws:we], sep, partial)
+            if not query.aggregate and len(partial["rows"]) >= query.limit:
+                break  # proyeksi tanpa agregat: cukup `limit` baris per rank
+    finally:
+        del buf
+        mm.close()
+        f.close()
+    return partial
+
+
+def merge_partials(query, partials):
+    """Gabung partial semua rank (urut rank); baris proyeksi dipotong ke LIMIT"""
+    total = new_partial(query)
+    for part in partials:
+        for key in ("scanned", "matched", "parsed"):
+            total[key] += part[key]
+        total["passed"] = [a + b for a, b in zip(total["passed"], part["passed"])]
+        for state, other in zip(total["aggs"], part["aggs"]):
+            state[0] += other[0]
+            state[1] += other[1]
+            state[2] = min(state[2], other[2])
+            state[3] = max(state[3], other[3])
+        total["rows"].extend(part["rows"])
+    total["rows"] = total["rows"][:query.limit]
+    return total
+
+
+def results(query, total):
+    """{label: nilai} untuk query agregat (None jika tidak ada nilai)"""
+    out = {}
+    for (agg, _, label), (count, s, lo, hi) in zip(query.select, total["aggs"]):
+        if agg == "count":
+            out[label] = count
+        elif count == 0:
+            out[label] = None
+        else:
+            out[label] = {"sum": s, "min": lo, "max": hi, "avg": s / count}[agg]
+    return out
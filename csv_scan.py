@@ -0,0 +1,143 @@
+"""
+Scanner Kolom CSV Berbasis mmap
+File di-mmap (read-only) dan dipindai per jendela byte yang sejajar baris. Nilai satu
+kolom diambil langsung dari byte mentah dengan regex terkompilasi (tanpa decode teks,
+tanpa list per baris), lalu dikonversi sekaligus per jendela (`map(float, ...)`).
+Memori per rank hanya sebesar satu jendela nilai, berapa pun ukuran file.
+
+Dipakai oleh csv_parallel_sum.py dan csv_parallel_split.py (CSV_SCANNER=mmap, default
+tanpa numpy); CSV_SCANNER=numpy memakai parser tervektorisasi csv_numpy.py, CSV_SCANNER=csv
+kembali ke csv.reader.
+"""
+
+import mmap
+import os
+import re
+
+try:
+    import resource  # type: ignore
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import numpy  # type: ignore  # noqa: F401
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+WINDOW_SIZE = int(os.getenv("CSV_WINDOW_SIZE", str(4 << 20)))  # bytes per jendela
+
+_patterns = {}
+
+
+def scanner_mode():
+    """Mode scanner aktif: 'numpy' (default jika numpy ada), 'mmap' atau 'csv'"""
+    default = "numpy" if HAS_NUMPY else "mmap"
+    mode = os.getenv("CSV_SCANNER", default).lower()
+    if mode == "numpy" and not HAS_NUMPY:
+        return "mmap"
+    return mode if mode in ("numpy", "mmap", "csv") else default
+
+
+def column_pattern(col, sep=b","):
+    """Regex (multiline) yang menangkap isi kolom ke-`col` di awal setiap baris"""
+    key = (col, sep)
+    if key not in _patterns:
+        s = re.escape(sep)
+        skip = (b"[^" + s + b"\\n]*" + s) * col
+        _patterns[key] = re.compile(b"^" + skip + b"([^" + s + b"\\r\\n]*)", re.M)
+    return _patterns[key]
+
+
+def open_mmap(path):
+    """(file, mmap) read-only; mmap None untuk file kosong"""
+    f = open(path, "rb")
+    if os.fstat(f.fileno()).st_size == 0:
+        return f, None
+    return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_windows(mm, start, end, window=WINDOW_SIZE):
+    """Rentang (ws, we) sepanjang ~window bytes di [start, end), batas di awal baris"""
+    pos = start
+    while pos < end:
+        cut = mm.find(b"\n", min(pos + window, end) - 1, end)
+        we = end if cut < 0 else cut + 1
+        yield pos, we
+        pos = we
+
+
+def iter_column(path, start, end, col, sep=b",", window=WINDOW_SIZE):
+    """List nilai mentah (bytes) kolom `col` per jendela dari rentang [start, end)"""
+    if end <= start:
+        return
+    f, mm = open_mmap(path)
+    try:
+        pattern = column_pattern(col, sep)
+        for ws, we in iter_windows(mm, start, end, window):
+            yield pattern.findall(mm, ws, we)
+    finally:
+        if mm is not None:
+            mm.close()
+        f.close()
+
+
+def to_floats(values):
+    """
+    Konversi massal (bytes); jika ada nilai rusak, ulangi per nilai dan lewati yang gagal.
+    Field berkutip ("5") diterima seperti csv.reader dan csv_numpy.parse_fields.
+    """
+    try:
+        return list(map(float, values))
+    except ValueError:
+        out = []
+        for v in values:
+            try:
+                out.append(float(v.strip(b'"')))
+            except ValueError:
+                pass
+        return out
+
+
+def apply_work(values, work):
+    """
+    Beban CPU opsional (CPU_WORK): `work` iterasi loop Python untuk SETIAP nilai, hasil dibuang.
+    Satu-satunya implementasi beban ini; semua scanner (termasuk numpy/cache) memanggilnya
+    agar CPU_WORK tetap compute-bound per nilai, bukan operasi array yang hampir gratis.
+    """
+    if work <= 0:
+        return
+    if hasattr(values, "tolist"):  # array numpy -> float Python, sama seperti jalur csv.reader
+        values = values.tolist()
+    for val in values:
+        tmp = val
+        for _ in range(work):
+            tmp = (tmp * 1.000001) ** 0.5
+
+
+def sum_column(path, start, end, col, work=0, sep=b",", window=WINDOW_SIZE):
+    """
+    (sum, count, bytes_scanned) kolom numerik di [start, end).
+    `work` = iterasi beban CPU opsional per nilai (seperti CPU_WORK), tidak mengubah nilai.
+    """
+    total = 0.0
+    count = 0
+    for values in iter_column(path, start, end, col, sep, window):
+        floats = to_floats(values)
+        apply_work(floats, work)
+        total = sum(floats, total)
+        count += len(floats)
+    return total, count, max(end - start, 0)
+
+
+def peak_rss_mb():
+    """Puncak resident memory proses (MB), None jika tidak tersedia"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if os.uname().sysname != "Darwin" else rss / 1e6
+
+
+def throughput_mbs(nbytes, seconds):
+    return nbytes / seconds / 1e6 if seconds > 0 else 0.0
+
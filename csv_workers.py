@@ -0,0 +1,84 @@
+"""
+Worker Proses untuk csv_parallel_split.py (hybrid MPI x proses)
+ThreadPool tertahan GIL untuk parse/loop Python per baris. Mode proses: rank menyalin isi
+file sekali ke multiprocessing.shared_memory, pool proses worker menempel ke blok yang
+sama (tanpa salinan per worker) dan masing-masing memproses potongan baris [start, end)
+dengan parser yang sama seperti rank (numpy / mmap regex / csv.reader).
+
+    SPLIT_WORKER_MODE=process OMP_NUM_THREADS=4 mpiexec -n 2 python csv_parallel_split.py
+    SPLIT_CHUNKS=16 ...   # 16 potongan sejajar baris, diambil worker satu per satu
+
+Worker dibuat dengan fork (worker tidak memanggil MPI). Tanpa fork (Windows) mode proses
+kembali ke thread.
+"""
+
+import csv
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import csv_numpy
+import csv_partition
+import csv_scan
+
+_shared = None  # SharedMemory milik proses worker (diisi initializer)
+
+
+def worker_mode():
+    """'thread' (default, ThreadPool) atau 'process' (pool proses + shared memory)"""
+    mode = os.getenv("SPLIT_WORKER_MODE", "thread").lower()
+    if mode == "process" and "fork" in multiprocessing.get_all_start_methods():
+        return "process"
+    return "thread"
+
+
+def chunk_count(workers):
+    """Jumlah potongan baris per file (SPLIT_CHUNKS, default satu per worker)"""
+    return max(1, int(os.getenv("SPLIT_CHUNKS", "0")) or workers)
+
+
+def _attach(name):
+    global _shared
+    _shared = shared_memory.SharedMemory(name=name)
+
+
+def sum_chunk(task):
+    """(sum, count) kolom `col` dari potongan [start, end) di shared memory"""
+    start, end, col, work, scanner = task
+    view = _shared.buf[start:end]
+    try:
+        if scanner != "csv":
+            return csv_numpy.sum_block(view, col, work, scanner)
+        lines = bytes(view).decode("utf-8", errors="ignore").split("\n")
+        values = []
+        for row in csv.reader(line[:-1] if line.endswith("\r") else line for line in lines):
+            try:
+                values.append(float(row[col]))
+            except (ValueError, IndexError):
+                pass
+        csv_scan.apply_work(values, work)
+        return sum(values, 0.0), len(values)
+    finally:
+        view.release()
+
+
+def sum_file(path, col, workers, chunks, work=0, scanner="numpy"):
+    """
+    (sum, count, bytes) kolom `col` satu file CSV (dengan header) memakai `workers` proses.
+    File dibagi `chunks` potongan sejajar baris; worker mengambil potongan berikutnya begitu selesai.
+    """
+    size = os.path.getsize(path)
+    ranges = csv_partition.byte_ranges(path, chunks, header=True)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        with open(path, "rb") as f:
+            f.readinto(shm.buf[:size])
+        tasks = [(start, end, col, work, scanner) for start, end in ranges if end > start]
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(workers, initializer=_attach, initargs=(shm.name,)) as pool:
+            results = pool.map(sum_chunk, tasks, chunksize=1)
+    finally:
+        shm.close()
+        shm.unlink()
+    return (sum(r[0] for r in results), sum(r[1] for r in results),
+            sum(end - start for start, end in ranges))
@@ -3,10 +3,11 @@ Database Models untuk MPI Payroll System
 SQLAlchemy ORM Models
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import json
 import os
 
 # Base class untuk semua models
@@ -75,6 +76,38 @@ class Gaji(Base):
         }
 
 
+class BenchmarkRun(Base):
+    """Model untuk riwayat hasil benchmark program MPI"""
+    __tablename__ = 'benchmark_run'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    program_id = Column(String(50), nullable=False, index=True)
+    num_processes = Column(Integer, nullable=False)
+    host_fingerprint = Column(String(64), nullable=False, index=True)
+    git_revision = Column(String(40))
+    elapsed_time = Column(Float, nullable=False)
+    success = Column(Boolean, default=False)
+    metrics = Column(Text)  # JSON metrik hasil parsing output program
+    output = Column(Text)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'timestamp': self.created_at.isoformat() if self.created_at else None,
+            'program_id': self.program_id,
+            'num_processes': self.num_processes,
+            'host_fingerprint': self.host_fingerprint,
+            'git_revision': self.git_revision,
+            'elapsed_time': self.elapsed_time,
+            'metrics': json.loads(self.metrics) if self.metrics else {},
+            'output': self.output,
+            'error': self.error,
+            'success': self.success
+        }
+
+
 # Database connection setup
 def get_database_url():
     """Get database URL from environment or use SQLite as fallback"""
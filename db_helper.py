@@ -4,8 +4,11 @@ Wrapper functions untuk operasi database dengan fallback ke in-memory
 """
 
 
+import json
+from statistics import median
+
 try:
-    from database import get_session, Karyawan, Absen, Gaji
+    from database import get_session, Karyawan, Absen, Gaji, BenchmarkRun
     USE_DATABASE = True
 except Exception as e:
     print(f"[DB Helper] Database not available: {e}")
@@ -241,3 +244,160 @@ def generate_dummy_data(jumlah):
             })
         
         return True, f"{jumlah} data berhasil di-generate"
+
+
+def save_benchmark_run(result):
+    """Simpan satu hasil run benchmark ke riwayat"""
+    session = get_session()
+    try:
+        run = BenchmarkRun(
+            program_id=result['program_id'],
+            num_processes=int(result['num_processes']),
+            host_fingerprint=result['host_fingerprint'],
+            git_revision=result.get('git_revision'),
+            elapsed_time=float(result['elapsed_time']),
+            success=bool(result.get('success')),
+            metrics=json.dumps(result.get('metrics') or {}),
+            output=result.get('output', ''),
+            error=result.get('error', '')
+        )
+        session.add(run)
+        session.commit()
+        return True, "Hasil benchmark berhasil disimpan"
+    except Exception as e:
+        session.rollback()
+        return False, str(e)
+    finally:
+        session.close()
+
+
+def get_benchmark_runs(limit=20, program_id=None, num_processes=None):
+    """Get riwayat benchmark terbaru (urut dari yang terbaru)"""
+    session = get_session()
+    try:
+        query = session.query(BenchmarkRun)
+        if program_id:
+            query = query.filter_by(program_id=program_id)
+        if num_processes:
+            query = query.filter_by(num_processes=int(num_processes))
+        query = query.order_by(BenchmarkRun.created_at.desc(), BenchmarkRun.id.desc())
+        if limit:
+            query = query.limit(int(limit))
+        return [r.to_dict() for r in query.all()]
+    finally:
+        session.close()
+
+
+def get_benchmark_timings(limit=1000, program_id=None, host_fingerprint=None):
+    """
+    Waktu run sukses terbaru (tanpa kolom output/error) untuk model skalabilitas:
+    list dict program_id, num_processes, host_fingerprint, elapsed_time, metrics, success
+    """
+    session = get_session()
+    try:
+        query = session.query(BenchmarkRun.program_id, BenchmarkRun.num_processes,
+                              BenchmarkRun.host_fingerprint, BenchmarkRun.elapsed_time,
+                              BenchmarkRun.metrics, BenchmarkRun.success).filter_by(success=True)
+        if program_id:
+            query = query.filter_by(program_id=program_id)
+        if host_fingerprint:
+            query = query.filter_by(host_fingerprint=host_fingerprint)
+        query = query.order_by(BenchmarkRun.created_at.desc(), BenchmarkRun.id.desc())
+        if limit:
+            query = query.limit(int(limit))
+        return [{
+            'program_id': r.program_id,
+            'num_processes': r.num_processes,
+            'host_fingerprint': r.host_fingerprint,
+            'elapsed_time': r.elapsed_time,
+            'metrics': json.loads(r.metrics) if r.metrics else {},
+            'success': r.success
+        } for r in query.all()]
+    finally:
+        session.close()
+
+
+def clear_benchmark_runs():
+    """Hapus semua riwayat benchmark"""
+    session = get_session()
+    try:
+        session.query(BenchmarkRun).delete()
+        session.commit()
+        return True
+    except Exception:
+        session.rollback()
+        return False
+    finally:
+        session.close()
+
+
+def get_benchmark_trends(program_id=None, num_processes=None, host_fingerprint=None):
+    """
+    Tren speedup/efisiensi per (program, jumlah proses) dari waktu ke waktu.
+    Speedup diambil dari metrik program jika ada, selain itu dihitung terhadap
+    median waktu run 1 proses pada host yang sama.
+    """
+    session = get_session()
+    try:
+        query = session.query(BenchmarkRun).filter_by(success=True)
+        if program_id:
+            query = query.filter_by(program_id=program_id)
+        if host_fingerprint:
+            query = query.filter_by(host_fingerprint=host_fingerprint)
+        runs = query.order_by(BenchmarkRun.created_at.asc(), BenchmarkRun.id.asc()).all()
+        runs = [r.to_dict() for r in runs]
+    finally:
+        session.close()
+
+    # Baseline serial per (program, host)
+    serial_times = {}
+    for r in runs:
+        if r['num_processes'] == 1:
+            serial_times.setdefault((r['program_id'], r['host_fingerprint']), []).append(r['elapsed_time'])
+    baselines = {k: median(v) for k, v in serial_times.items()}
+
+    series = {}
+    for r in runs:
+        if num_processes and r['num_processes'] != int(num_processes):
+            continue
+        metrics = r['metrics']
+        speedup = metrics.get('speedup')
+        if speedup is None:
+            baseline = baselines.get((r['program_id'], r['host_fingerprint']))
+            if baseline and r['elapsed_time'] > 0:
+                speedup = baseline / r['elapsed_time']
+        efficiency = metrics.get('efficiency')
+        if efficiency is None and speedup is not None:
+            efficiency = speedup / r['num_processes']
+
+        key = (r['program_id'], r['num_processes'])
+        series.setdefault(key, []).append({
+            'timestamp': r['timestamp'],
+            'git_revision': r['git_revision'],
+            'host_fingerprint': r['host_fingerprint'],
+            'elapsed_time': r['elapsed_time'],
+            'speedup': speedup,
+            'efficiency': efficiency
+        })
+
+    trends = []
+    for (prog, procs), points in sorted(series.items()):
+        trend = {
+            'program_id': prog,
+            'num_processes': procs,
+            'runs': len(points),
+            'points': points
+        }
+        # Bandingkan revisi terakhir dengan revisi sebelumnya (deteksi regresi setelah deploy)
+        latest_rev = points[-1]['git_revision']
+        latest = [p['elapsed_time'] for p in points if p['git_revision'] == latest_rev]
+        previous = [p['elapsed_time'] for p in points if p['git_revision'] != latest_rev]
+        if latest and previous:
+            prev_median = median(previous)
+            trend['latest_revision'] = latest_rev
+            trend['latest_median_time'] = median(latest)
+            trend['previous_median_time'] = prev_median
+            trend['time_change_pct'] = (median(latest) - prev_median) / prev_median * 100 if prev_median else None
+        trends.append(trend)
+
+    return trends
@@ -4,13 +4,18 @@ Program Penghitungan Gaji Karyawan
 """
 
 from mpi4py import MPI  # type: ignore
+from array import array
 import time
 import random
+import bench_metrics
+import mpi_transport
 
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
 size = comm.Get_size()
 
+PROGRAM_NAME = "demo_payroll_benchmark"
+
 def generate_data(num_karyawan):
     """Generate data karyawan dan absen otomatis"""
     if rank != 0:
@@ -53,7 +58,44 @@ def hitung_gaji_serial(data_karyawan, data_absen):
     return data_gaji, elapsed
 
 def hitung_gaji_parallel(data_karyawan, data_absen):
-    """Hitung gaji secara parallel dengan MPI"""
+    """Hitung gaji secara parallel dengan MPI (transport sesuai MPI_TRANSPORT)"""
+    if mpi_transport.transport_mode() == 'buffer':
+        return hitung_gaji_parallel_buffer(data_karyawan, data_absen)
+    return hitung_gaji_parallel_pickle(data_karyawan, data_absen)
+
+def hitung_gaji_parallel_buffer(data_karyawan, data_absen):
+    """Hitung gaji parallel: kolom numerik via Scatterv, total via Gatherv"""
+    columns = None
+    if rank == 0:
+        start = time.perf_counter()
+        np = mpi_transport.np
+        columns = {
+            "gaji_pokok": mpi_transport.pack_column(data_karyawan, "gaji_pokok", np.float64),
+            "hari_masuk": mpi_transport.pack_column(data_absen, "hari_masuk", np.int64, int)
+        }
+    
+    local, counts, displs = mpi_transport.distribute_columns(comm, columns)
+    
+    t_local = time.perf_counter()
+    local_total = local["gaji_pokok"] * local["hari_masuk"]
+    local_time = time.perf_counter() - t_local
+    
+    total = mpi_transport.collect_column(comm, local_total, counts, displs)
+    
+    if rank == 0:
+        data_gaji = [
+            {"id": k["id"], "nama": k["nama"], "total_gaji": float(t)}
+            for k, t in zip(data_karyawan, total)
+        ]
+        elapsed = time.perf_counter() - start
+        rank_times = comm.gather(local_time, root=0)
+        return data_gaji, elapsed, rank_times
+    
+    comm.gather(local_time, root=0)
+    return None, 0, None
+
+def hitung_gaji_parallel_pickle(data_karyawan, data_absen):
+    """Hitung gaji parallel dengan comm.send/recv (jalur pickle); worker hanya mengirim balik kolom total"""
     
     if rank == 0:
         start = time.perf_counter()
@@ -62,7 +104,7 @@ def hitung_gaji_parallel(data_karyawan, data_absen):
         karyawan_per_process = num_karyawan // size
         remainder = num_karyawan % size
         
-        # Distribusi data
+        # Distribusi data (beserta offset chunk)
         start_idx = 0
         for i in range(size):
             count = karyawan_per_process + (1 if i < remainder else 0)
@@ -72,52 +114,36 @@ def hitung_gaji_parallel(data_karyawan, data_absen):
                 local_karyawan = data_karyawan[start_idx:end_idx]
                 local_absen = data_absen[start_idx:end_idx]
             else:
-                comm.send((data_karyawan[start_idx:end_idx], 
+                comm.send((start_idx, data_karyawan[start_idx:end_idx], 
                           data_absen[start_idx:end_idx]), dest=i, tag=0)
             
             start_idx = end_idx
-        
-        # Proses lokal
-        local_gaji = []
-        for i, k in enumerate(local_karyawan):
-            hari_masuk = local_absen[i]["hari_masuk"]
-            total = k["gaji_pokok"] * hari_masuk
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "total_gaji": total
-            })
-        
-        # Kumpulkan hasil
-        all_results = [local_gaji]
-        for i in range(1, size):
-            results = comm.recv(source=i, tag=1)
-            all_results.append(results)
-        
-        # Gabungkan hasil
-        data_gaji = []
-        for result_chunk in all_results:
-            data_gaji.extend(result_chunk)
-        
-        elapsed = time.perf_counter() - start
-        return data_gaji, elapsed
-    
+        offset = 0
     else:
         # Worker process
-        local_karyawan, local_absen = comm.recv(source=0, tag=0)
-        
-        local_gaji = []
-        for i, k in enumerate(local_karyawan):
-            hari_masuk = local_absen[i]["hari_masuk"]
-            total = k["gaji_pokok"] * hari_masuk
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "total_gaji": total
-            })
+        offset, local_karyawan, local_absen = comm.recv(source=0, tag=0)
+        num_karyawan = None
+    
+    # Proses lokal: hanya kolom numerik total_gaji
+    t_local = time.perf_counter()
+    local_total = array("d", (k["gaji_pokok"] * a["hari_masuk"] for k, a in zip(local_karyawan, local_absen)))
+    local_time = time.perf_counter() - t_local
+    
+    # Kumpulkan hasil sesuai offset, id/nama diambil dari data rank 0
+    hasil = mpi_transport.collect_numeric(comm, offset, {"total_gaji": local_total}, num_karyawan)
+    
+    if rank == 0:
+        data_gaji = [
+            {"id": k["id"], "nama": k["nama"], "total_gaji": t}
+            for k, t in zip(data_karyawan, hasil["total_gaji"])
+        ]
         
-        comm.send(local_gaji, dest=0, tag=1)
-        return None, 0
+        elapsed = time.perf_counter() - start
+        rank_times = comm.gather(local_time, root=0)
+        return data_gaji, elapsed, rank_times
+    
+    comm.gather(local_time, root=0)
+    return None, 0, None
 
 def main():
     if rank == 0:
@@ -128,9 +154,10 @@ def main():
         print(f"\nMenggunakan {size} proses MPI\n")
     
     # Test dengan berbagai ukuran data
-    test_sizes = [1000, 5000, 10000, 50000]
+    test_sizes = bench_metrics.bench_sizes([1000, 5000, 10000, 50000])
     
     results = []
+    doc = bench_metrics.new_result(PROGRAM_NAME, size)
     
     for num_karyawan in test_sizes:
         if rank == 0:
@@ -154,7 +181,7 @@ def main():
         if rank == 0:
             print(f"\n[Parallel MPI] Memproses {num_karyawan:,} karyawan...")
         
-        gaji_parallel, time_parallel = hitung_gaji_parallel(data_karyawan, data_absen)
+        gaji_parallel, time_parallel, rank_times = hitung_gaji_parallel(data_karyawan, data_absen)
         
         if rank == 0:
             print(f"  Waktu: {time_parallel:.6f} detik")
@@ -169,6 +196,7 @@ def main():
                 'parallel': time_parallel,
                 'speedup': speedup
             })
+            bench_metrics.add_point(doc, num_karyawan, time_serial, time_parallel, rank_times)
     
     # Summary
     if rank == 0:
@@ -188,6 +216,7 @@ def main():
         print(f"Rata-rata Speedup: {avg_speedup:.2f}x")
         print(f"Rata-rata Efisiensi: {(avg_speedup/size)*100:.1f}%")
         print("=" * 70)
+        bench_metrics.emit_result(doc)
 
 if __name__ == "__main__":
     main()
@@ -7,16 +7,25 @@ from mpi4py import MPI  # type: ignore
 import time
 import random
 import math
+import os
+import bench_metrics
+import mpi_schedule
+import mpi_transport
 
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
 size = comm.Get_size()
 
-def hitung_pajak_kompleks(gaji_bruto):
+PROGRAM_NAME = "demo_payroll_complex"
+
+# Strategi pembagian kerja: static (blok), master (master-worker) atau rma (counter bersama)
+SCHEDULE = os.getenv("SCHEDULE", "static")
+
+def hitung_pajak_kompleks(gaji_bruto, iterasi=1000):
     """Simulasi perhitungan pajak yang lebih kompleks (CPU intensive)"""
     # Simulasi komputasi berat dengan iterasi
     result = gaji_bruto
-    for _ in range(1000):  # Simulasi komputasi
+    for _ in range(iterasi):  # Simulasi komputasi
         result = math.sqrt(result * result + 1)
         result = math.log(result + 1)
         result = math.exp(result / 10)
@@ -57,6 +66,40 @@ def generate_data(num_karyawan):
     
     return karyawan, absen
 
+KOLOM_HASIL = ("gaji_bruto", "pajak", "gaji_netto")
+
+def hitung_gaji_karyawan(k, a):
+    """
+    Hitung gaji satu karyawan -> (gaji_bruto, pajak, gaji_netto).
+    Field opsional `iterasi` mengatur biaya komputasi pajak.
+    """
+    gaji_pokok_total = k["gaji_pokok"] * a["hari_masuk"]
+    gaji_lembur = k["gaji_pokok"] * 1.5 * a["lembur"]
+    gaji_bruto = gaji_pokok_total + gaji_lembur + k["tunjangan"] + k["bonus_kinerja"]
+    
+    pajak = hitung_pajak_kompleks(gaji_bruto, k.get("iterasi", 1000))
+    
+    return gaji_bruto, pajak, gaji_bruto - pajak
+
+def gabung_hasil(data_karyawan, kolom):
+    """Rank 0: gabungkan id/nama dengan kolom hasil numerik (urut sesuai data_karyawan)"""
+    return [
+        {"id": k["id"], "nama": k["nama"], "gaji_bruto": bruto, "pajak": pajak, "gaji_netto": netto}
+        for k, bruto, pajak, netto in zip(data_karyawan, *kolom)
+    ]
+
+def hitung_batch(pasangan):
+    """work_fn untuk mpi_schedule: list (karyawan, absen) -> list tuple hasil numerik"""
+    return [hitung_gaji_karyawan(k, a) for k, a in pasangan]
+
+def hitung_gaji_dynamic(data_karyawan, data_absen, strategy=None):
+    """Hitung gaji parallel dengan self-scheduling (master-worker atau counter RMA)"""
+    pasangan = list(zip(data_karyawan, data_absen)) if rank == 0 else None
+    hasil, stats = mpi_schedule.run(strategy or SCHEDULE, comm, pasangan, hitung_batch)
+    if rank != 0:
+        return None, 0, None
+    return gabung_hasil(data_karyawan, zip(*hasil)), stats['elapsed'], stats['busy_times']
+
 def hitung_gaji_serial(data_karyawan, data_absen):
     """Hitung gaji secara serial dengan komputasi kompleks"""
     if rank != 0:
@@ -92,6 +135,8 @@ def hitung_gaji_serial(data_karyawan, data_absen):
 
 def hitung_gaji_parallel(data_karyawan, data_absen):
     """Hitung gaji secara parallel dengan MPI"""
+    if SCHEDULE != "static":
+        return hitung_gaji_dynamic(data_karyawan, data_absen)
     
     if rank == 0:
         start = time.perf_counter()
@@ -100,7 +145,7 @@ def hitung_gaji_parallel(data_karyawan, data_absen):
         karyawan_per_process = num_karyawan // size
         remainder = num_karyawan % size
         
-        # Distribusi data
+        # Distribusi data (beserta offset chunk)
         start_idx = 0
         for i in range(size):
             count = karyawan_per_process + (1 if i < remainder else 0)
@@ -110,72 +155,34 @@ def hitung_gaji_parallel(data_karyawan, data_absen):
                 local_karyawan = data_karyawan[start_idx:end_idx]
                 local_absen = data_absen[start_idx:end_idx]
             else:
-                comm.send((data_karyawan[start_idx:end_idx], 
+                comm.send((start_idx, data_karyawan[start_idx:end_idx], 
                           data_absen[start_idx:end_idx]), dest=i, tag=0)
             
             start_idx = end_idx
-        
-        # Proses lokal
-        local_gaji = []
-        for i, k in enumerate(local_karyawan):
-            hari_masuk = local_absen[i]["hari_masuk"]
-            lembur = local_absen[i]["lembur"]
-            
-            gaji_pokok_total = k["gaji_pokok"] * hari_masuk
-            gaji_lembur = k["gaji_pokok"] * 1.5 * lembur
-            gaji_bruto = gaji_pokok_total + gaji_lembur + k["tunjangan"] + k["bonus_kinerja"]
-            
-            pajak = hitung_pajak_kompleks(gaji_bruto)
-            gaji_netto = gaji_bruto - pajak
-            
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "gaji_bruto": gaji_bruto,
-                "pajak": pajak,
-                "gaji_netto": gaji_netto
-            })
-        
-        # Kumpulkan hasil
-        all_results = [local_gaji]
-        for i in range(1, size):
-            results = comm.recv(source=i, tag=1)
-            all_results.append(results)
-        
-        # Gabungkan hasil
-        data_gaji = []
-        for result_chunk in all_results:
-            data_gaji.extend(result_chunk)
-        
-        elapsed = time.perf_counter() - start
-        return data_gaji, elapsed
-    
+        offset = 0
     else:
         # Worker process
-        local_karyawan, local_absen = comm.recv(source=0, tag=0)
-        
-        local_gaji = []
-        for i, k in enumerate(local_karyawan):
-            hari_masuk = local_absen[i]["hari_masuk"]
-            lembur = local_absen[i]["lembur"]
-            
-            gaji_pokok_total = k["gaji_pokok"] * hari_masuk
-            gaji_lembur = k["gaji_pokok"] * 1.5 * lembur
-            gaji_bruto = gaji_pokok_total + gaji_lembur + k["tunjangan"] + k["bonus_kinerja"]
-            
-            pajak = hitung_pajak_kompleks(gaji_bruto)
-            gaji_netto = gaji_bruto - pajak
-            
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "gaji_bruto": gaji_bruto,
-                "pajak": pajak,
-                "gaji_netto": gaji_netto
-            })
+        offset, local_karyawan, local_absen = comm.recv(source=0, tag=0)
+        num_karyawan = None
+    
+    # Proses lokal
+    t_local = time.perf_counter()
+    local_hasil = [hitung_gaji_karyawan(k, a) for k, a in zip(local_karyawan, local_absen)]
+    local_time = time.perf_counter() - t_local
+    
+    # Kumpulkan hanya kolom numerik (id/nama sudah ada di rank 0)
+    kolom = mpi_transport.collect_numeric(comm, offset, mpi_transport.numeric_columns(KOLOM_HASIL, local_hasil),
+                                          num_karyawan)
+    
+    if rank == 0:
+        data_gaji = gabung_hasil(data_karyawan, [kolom[nama] for nama in KOLOM_HASIL])
         
-        comm.send(local_gaji, dest=0, tag=1)
-        return None, 0
+        elapsed = time.perf_counter() - start
+        rank_times = comm.gather(local_time, root=0)
+        return data_gaji, elapsed, rank_times
+    
+    comm.gather(local_time, root=0)
+    return None, 0, None
 
 def main():
     if rank == 0:
@@ -183,13 +190,14 @@ def main():
         print(" " * 10 + "BENCHMARK: PERHITUNGAN GAJI KOMPLEKS (MPI)")
         print(" " * 15 + "dengan Simulasi Perhitungan Pajak")
         print("=" * 70)
-        print(f"\nMenggunakan {size} proses MPI")
+        print(f"\nMenggunakan {size} proses MPI (pembagian kerja: {SCHEDULE})")
         print("Setiap perhitungan gaji melibatkan komputasi pajak yang kompleks\n")
     
     # Test dengan berbagai ukuran data
-    test_sizes = [100, 500, 1000, 2000]
+    test_sizes = bench_metrics.bench_sizes([100, 500, 1000, 2000])
     
     results = []
+    doc = bench_metrics.new_result(PROGRAM_NAME, size, schedule=SCHEDULE)
     
     for num_karyawan in test_sizes:
         if rank == 0:
@@ -213,7 +221,7 @@ def main():
         if rank == 0:
             print(f"\n[Parallel MPI] Memproses {num_karyawan:,} karyawan dengan perhitungan kompleks...")
         
-        gaji_parallel, time_parallel = hitung_gaji_parallel(data_karyawan, data_absen)
+        gaji_parallel, time_parallel, rank_times = hitung_gaji_parallel(data_karyawan, data_absen)
         
         if rank == 0:
             print(f"  Waktu: {time_parallel:.4f} detik")
@@ -231,6 +239,7 @@ def main():
                 'speedup': speedup,
                 'efisiensi': efisiensi
             })
+            bench_metrics.add_point(doc, num_karyawan, time_serial, time_parallel, rank_times)
     
     # Summary
     if rank == 0:
@@ -255,6 +264,7 @@ def main():
         print("- Untuk komputasi kompleks, MPI memberikan speedup yang signifikan")
         print("- Overhead komunikasi MPI terkompensasi oleh paralelisasi komputasi")
         print("=" * 70)
+        bench_metrics.emit_result(doc)
 
 if __name__ == "__main__":
     main()
@@ -3,8 +3,9 @@ Demo otomatis untuk membandingkan performa Serial vs Parallel MPI
 pada sistem penggajian karyawan
 """
 
-from payroll_mpi import PayrollSystemMPI, rank
+from payroll_mpi import PayrollSystemMPI, PIPELINE_CHUNKS, hidden_comm_fraction, rank, size
 import time
+import bench_metrics
 
 def demo():
     payroll = PayrollSystemMPI()
@@ -16,21 +17,42 @@ def demo():
         print("="*60)
         print("\n>> Generating 10,000 sample employees...")
     
-    payroll.generate_sample_data(10000)
+    num_employees = 10000
+    payroll.generate_sample_data(num_employees)
     
     if rank == 0:
         print("\n" + "-"*60)
         print(">> TEST 1: SERIAL CALCULATION")
         print("-"*60)
     
-    payroll.calculate_all_salaries_serial()
+    time_serial = payroll.calculate_all_salaries_serial()
     
     if rank == 0:
         print("\n" + "-"*60)
         print(">> TEST 2: PARALLEL MPI CALCULATION")
         print("-"*60)
     
-    payroll.calculate_all_salaries_parallel()
+    time_parallel = payroll.calculate_all_salaries_parallel()
+    parallel_rank_times = payroll.rank_times
+    
+    if rank == 0:
+        print("\n" + "-"*60)
+        print(">> TEST 3: PIPELINED MPI (Isend/Irecv + Waitany)")
+        print("-"*60)
+    
+    # Referensi tanpa overlap (1 sub-chunk) lalu pipeline penuh
+    payroll.calculate_all_salaries_pipelined(chunks=1)
+    reference = payroll.comm_stats
+    time_pipelined = payroll.calculate_all_salaries_pipelined(chunks=PIPELINE_CHUNKS)
+    pipelined = payroll.comm_stats
+    
+    if rank == 0:
+        hidden = hidden_comm_fraction(reference['exposed_comm'], pipelined['exposed_comm'])
+        print(f"   Komunikasi terbuka: 1 sub-chunk {reference['exposed_comm']:.4f}s, "
+              f"{pipelined['chunks']} sub-chunk {pipelined['exposed_comm']:.4f}s")
+        print("   Waktu tunggu per rank: " + ", ".join(f"{w:.4f}s" for w in pipelined['wait_times']))
+        if hidden is not None:
+            print(f"   Fraksi komunikasi tersembunyi: {hidden * 100:.1f}%")
     
     if rank == 0:
         print("\n" + "-"*60)
@@ -48,6 +70,15 @@ def demo():
         print(">> DEMO COMPLETED!")
         print(f"   Total employees processed: {len(payroll.employees)}")
         print("="*60)
+        
+        doc = bench_metrics.new_result("demo_payroll_mpi", size)
+        bench_metrics.add_point(doc, num_employees, time_serial, time_parallel, parallel_rank_times,
+                                pipelined_time=time_pipelined,
+                                pipelined_rank_times=payroll.rank_times,
+                                pipeline_chunks=pipelined['chunks'],
+                                exposed_comm=pipelined['exposed_comm'],
+                                hidden_comm_fraction=hidden)
+        bench_metrics.emit_result(doc)
 
 if __name__ == "__main__":
     demo()
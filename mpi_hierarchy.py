@@ -0,0 +1,121 @@
+"""
+Kolektif Hierarkis Dua Tingkat (topology-aware)
+gather/reduce dilakukan dulu di dalam node (communicator shared-memory), lalu hanya
+antar node leader. Root global menerima (jumlah rank di node-nya - 1) + (jumlah node - 1)
+pesan, bukan size - 1 seperti kolektif datar.
+
+Konfigurasi:
+    MPI_HIER=auto  -> hierarkis jika ada > 1 node dan node berisi > 1 rank (default)
+    MPI_HIER=1     -> selalu hierarkis
+    MPI_HIER=0     -> selalu datar (comm.gather/comm.reduce biasa)
+    HIER_NODE_SIZE=k -> simulasi node berisi k rank (untuk uji lokal dengan oversubscribe)
+
+Hierarki hanya dipakai untuk root=0 (rank 0 global selalu leader node pertama);
+root lain memakai kolektif datar.
+"""
+
+import os
+
+from mpi4py import MPI  # type: ignore
+
+import mpi_transport
+
+_topologies = {}
+
+
+def node_size_override():
+    """Ukuran node simulasi dari env HIER_NODE_SIZE (None = topologi fisik)"""
+    value = os.getenv('HIER_NODE_SIZE')
+    return int(value) if value else None
+
+
+def topology(comm, node_size=None):
+    """
+    (node_comm, leader_comm, node_ranks) untuk comm, dibuat sekali (kolektif pada panggilan pertama).
+    node_ranks = rank global anggota node ini, urut sesuai rank node.
+    """
+    node_size = node_size or node_size_override()
+    key = (comm.py2f(), node_size)
+    if key not in _topologies:
+        if node_size:
+            node_comm = comm.Split(comm.Get_rank() // node_size, key=comm.Get_rank())
+            color = 0 if node_comm.Get_rank() == 0 else MPI.UNDEFINED
+            leader_comm = comm.Split(color, key=comm.Get_rank())
+        else:
+            node_comm, leader_comm = mpi_transport.node_communicators(comm)
+        node_ranks = node_comm.allgather(comm.Get_rank())
+        nodes = node_comm.bcast(leader_comm.Get_size() if leader_comm != MPI.COMM_NULL else 0, root=0)
+        _topologies[key] = (node_comm, leader_comm, node_ranks, nodes)
+    return _topologies[key][:3]
+
+
+def num_nodes(comm):
+    """Jumlah node (semua rank mendapat nilai yang sama)"""
+    topology(comm)
+    return _topologies[(comm.py2f(), node_size_override())][3]
+
+
+def enabled(comm, root=0):
+    """Apakah kolektif hierarkis dipakai untuk comm ini"""
+    mode = os.getenv('MPI_HIER', 'auto').lower()
+    if root != 0 or mode in ('0', 'off', 'flat') or comm.Get_size() == 1:
+        return False
+    if mode in ('1', 'on'):
+        return True
+    return 1 < num_nodes(comm) < comm.Get_size()
+
+
+def root_messages(comm, hierarchical):
+    """Jumlah pesan yang diterima root global (rank 0) untuk satu gather/reduce"""
+    if not hierarchical:
+        return comm.Get_size() - 1
+    node_comm, _, _ = topology(comm)
+    return node_comm.Get_size() - 1 + num_nodes(comm) - 1
+
+
+# -------------------------------
+# Kolektif (lowercase, objek Python)
+# -------------------------------
+def reduce(comm, value, op=MPI.SUM, root=0):
+    """comm.reduce dua tingkat: reduce di node, lalu reduce antar leader ke root"""
+    if not enabled(comm, root):
+        return comm.reduce(value, op=op, root=root)
+    node_comm, leader_comm, _ = topology(comm)
+    node_value = node_comm.reduce(value, op=op, root=0)
+    if leader_comm == MPI.COMM_NULL:
+        return None
+    return leader_comm.reduce(node_value, op=op, root=0)
+
+
+def gather(comm, value, root=0):
+    """comm.gather dua tingkat; root mendapat list urut rank global seperti gather datar"""
+    if not enabled(comm, root):
+        return comm.gather(value, root=root)
+    node_comm, leader_comm, node_ranks = topology(comm)
+    node_values = node_comm.gather(value, root=0)
+    if leader_comm == MPI.COMM_NULL:
+        return None
+    per_node = leader_comm.gather((node_ranks, node_values), root=0)
+    if per_node is None:
+        return None
+    result = [None] * comm.Get_size()
+    for ranks, values in per_node:
+        for r, v in zip(ranks, values):
+            result[r] = v
+    return result
+
+
+# -------------------------------
+# Kolektif buffer (uppercase, array NumPy)
+# -------------------------------
+def Reduce(comm, sendbuf, recvbuf, op=MPI.SUM, root=0):
+    """comm.Reduce dua tingkat untuk array NumPy; recvbuf hanya dipakai di root"""
+    if not enabled(comm, root):
+        comm.Reduce(sendbuf, recvbuf, op=op, root=root)
+        return
+    node_comm, leader_comm, _ = topology(comm)
+    is_leader = leader_comm != MPI.COMM_NULL
+    partial = mpi_transport.np.empty_like(sendbuf) if is_leader else None
+    node_comm.Reduce(sendbuf, partial, op=op, root=0)
+    if is_leader:
+        leader_comm.Reduce(partial, recvbuf if comm.Get_rank() == root else None, op=op, root=0)
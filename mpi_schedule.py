@@ -0,0 +1,225 @@
+"""
+Self-Scheduling MPI (Dynamic Load Balancing)
+Pembagian blok statis membuat rank menganggur jika biaya per record tidak seragam.
+Modul ini menyediakan tiga strategi dengan antarmuka yang sama:
+    static  - blok statis (baseline, sama seperti program payroll lama)
+    master  - master-worker: worker meminta chunk ke rank 0 saat siap;
+              rank 0 ikut menghitung chunk kecil di sela melayani permintaan
+    rma     - counter bersama di window RMA rank 0, setiap rank mengambil chunk
+              sendiri lewat Compare_and_swap (tanpa master)
+
+Ukuran chunk (policy):
+    fixed    - selalu `chunk` record
+    guided   - ceil(sisa / jumlah_rank), minimal `min_chunk` (seperti OpenMP guided)
+    adaptive - ceil(sisa / (2 * jumlah_rank)) (factoring), minimal `min_chunk`
+
+Setiap fungsi menerima `work_fn(list_record) -> list_hasil` dan mengembalikan
+(hasil berurutan di root / None di rank lain, statistik per rank di root).
+"""
+
+import math
+import os
+import time
+
+from mpi4py import MPI  # type: ignore
+
+import mpi_transport
+
+TAG_REQUEST = 11
+TAG_WORK = 12
+
+DEFAULT_POLICY = os.getenv('SCHEDULE_POLICY', 'guided')
+DEFAULT_MIN_CHUNK = int(os.getenv('SCHEDULE_MIN_CHUNK', '1'))
+
+
+def next_chunk(remaining, workers, policy=DEFAULT_POLICY, min_chunk=DEFAULT_MIN_CHUNK, chunk=None):
+    """Ukuran chunk berikutnya untuk `remaining` record tersisa"""
+    if remaining <= 0:
+        return 0
+    if policy == 'fixed':
+        c = chunk or min_chunk
+    elif policy == 'adaptive':
+        c = math.ceil(remaining / (2 * workers))
+    else:
+        c = math.ceil(remaining / workers)
+    return min(max(c, min_chunk), remaining)
+
+
+def _stats(comm, busy, chunks, t0, root):
+    """Kumpulkan waktu sibuk & jumlah chunk per rank ke root"""
+    gathered = comm.gather((busy, chunks), root=root)
+    if comm.Get_rank() != root:
+        return None
+    busy_times = [b for b, _ in gathered]
+    mean_busy = sum(busy_times) / len(busy_times)
+    return {
+        'elapsed': time.perf_counter() - t0,
+        'busy_times': busy_times,
+        'chunks': [c for _, c in gathered],
+        # Rasio ketidakseimbangan: rank tersibuk dibanding rata-rata (1.0 = seimbang sempurna)
+        'imbalance': max(busy_times) / mean_busy if mean_busy > 0 else 1.0
+    }
+
+
+def static_split(comm, items, work_fn, root=0):
+    """Baseline: blok statis (sisa ke rank awal) lewat scatter/gather"""
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    t0 = time.perf_counter()
+
+    if rank == root:
+        counts, displs = mpi_transport.block_partition(len(items), size)
+        blocks = [items[d:d + c] for c, d in zip(counts, displs)]
+    else:
+        blocks = None
+    local = comm.scatter(blocks, root=root)
+
+    t_local = time.perf_counter()
+    results = work_fn(local)
+    busy = time.perf_counter() - t_local
+
+    gathered = comm.gather(results, root=root)
+    stats = _stats(comm, busy, 1, t0, root)
+    if rank != root:
+        return None, None
+    return [r for block in gathered for r in block], stats
+
+
+def master_worker(comm, items, work_fn, policy=DEFAULT_POLICY, min_chunk=DEFAULT_MIN_CHUNK, chunk=None, root=0):
+    """
+    Master-worker on-demand: worker mengirim permintaan (beserta hasil chunk sebelumnya),
+    root membalas dengan chunk berikutnya atau None jika pekerjaan habis.
+    """
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    t0 = time.perf_counter()
+    busy = 0.0
+    chunks = 0
+
+    if rank == root:
+        n = len(items)
+        results = [None] * n
+        next_idx = 0
+        active = size - 1
+        status = MPI.Status()
+
+        def serve(message, source):
+            nonlocal next_idx, active
+            if message is not None:
+                start, part = message
+                results[start:start + len(part)] = part
+            c = next_chunk(n - next_idx, size, policy, min_chunk, chunk)
+            if c:
+                comm.send((next_idx, items[next_idx:next_idx + c]), dest=source, tag=TAG_WORK)
+                next_idx += c
+            else:
+                comm.send(None, dest=source, tag=TAG_WORK)
+                active -= 1
+
+        while active > 0 or next_idx < n:
+            # Layani semua permintaan yang sudah menunggu
+            while active > 0 and comm.Iprobe(source=MPI.ANY_SOURCE, tag=TAG_REQUEST, status=status):
+                source = status.Get_source()
+                serve(comm.recv(source=source, tag=TAG_REQUEST), source)
+
+            if next_idx < n:
+                # Root ikut bekerja dengan chunk kecil agar tetap responsif
+                c = min(min_chunk if size > 1 else n, n - next_idx)
+                start = next_idx
+                next_idx += c
+                t_local = time.perf_counter()
+                results[start:start + c] = work_fn(items[start:start + c])
+                busy += time.perf_counter() - t_local
+                chunks += 1
+            elif active > 0:
+                message = comm.recv(source=MPI.ANY_SOURCE, tag=TAG_REQUEST, status=status)
+                serve(message, status.Get_source())
+    else:
+        message = None
+        while True:
+            comm.send(message, dest=root, tag=TAG_REQUEST)
+            work = comm.recv(source=root, tag=TAG_WORK)
+            if work is None:
+                break
+            start, part = work
+            t_local = time.perf_counter()
+            message = (start, work_fn(part))
+            busy += time.perf_counter() - t_local
+            chunks += 1
+        results = None
+
+    stats = _stats(comm, busy, chunks, t0, root)
+    return results, stats
+
+
+def rma_counter(comm, items, work_fn, policy=DEFAULT_POLICY, min_chunk=DEFAULT_MIN_CHUNK, chunk=None, root=0):
+    """
+    Self-scheduling lewat counter bersama (MPI RMA, passive target) di rank root.
+    Data di-broadcast sekali; setiap rank mengklaim [cur, cur+c) dengan Compare_and_swap
+    sehingga ukuran chunk guided/adaptive bisa dihitung dari sisa pekerjaan terkini.
+    """
+    np = mpi_transport.np
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    t0 = time.perf_counter()
+
+    items = comm.bcast(items, root=root)
+    n = len(items)
+
+    win = MPI.Win.Allocate(8 if rank == root else 0, 8, comm=comm)
+    if rank == root:
+        counter = np.frombuffer(win.tomemory(), dtype=np.int64, count=1)
+        counter[0] = 0
+    comm.Barrier()
+
+    current = np.zeros(1, dtype=np.int64)
+    desired = np.zeros(1, dtype=np.int64)
+    previous = np.zeros(1, dtype=np.int64)
+    dummy = np.zeros(1, dtype=np.int64)
+
+    local = []
+    busy = 0.0
+    chunks = 0
+    while True:
+        win.Lock(root, MPI.LOCK_SHARED)
+        win.Fetch_and_op(dummy, current, root, op=MPI.NO_OP)
+        win.Flush(root)
+        while current[0] < n:
+            c = next_chunk(n - int(current[0]), size, policy, min_chunk, chunk)
+            desired[0] = current[0] + c
+            win.Compare_and_swap(desired, current, previous, root)
+            win.Flush(root)
+            if previous[0] == current[0]:
+                break
+            current[0] = previous[0]  # dikalahkan rank lain: coba lagi dari nilai terbaru
+        win.Unlock(root)
+
+        start = int(current[0])
+        if start >= n:
+            break
+        end = int(desired[0])
+        t_local = time.perf_counter()
+        local.append((start, work_fn(items[start:end])))
+        busy += time.perf_counter() - t_local
+        chunks += 1
+
+    gathered = comm.gather(local, root=root)
+    win.Free()
+    stats = _stats(comm, busy, chunks, t0, root)
+    if rank != root:
+        return None, None
+
+    results = [None] * n
+    for parts in gathered:
+        for start, part in parts:
+            results[start:start + len(part)] = part
+    return results, stats
+
+
+def run(strategy, comm, items, work_fn, **kwargs):
+    """Jalankan salah satu strategi: 'static', 'master' atau 'rma'"""
+    if strategy == 'static':
+        return static_split(comm, items, work_fn, kwargs.get('root', 0))
+    if strategy == 'rma' and mpi_transport.HAS_NUMPY:
+        return rma_counter(comm, items, work_fn, **kwargs)
+    return master_worker(comm, items, work_fn, **kwargs)
@@ -0,0 +1,411 @@
+"""
+Transport MPI Berbasis Buffer
+Data karyawan dikemas menjadi kolom NumPy bertipe (contiguous) lalu didistribusikan
+dengan Scatterv/Gatherv (uppercase API, tanpa pickle) memakai counts/displacements.
+Jalur pickle (comm.send/recv list of dict) tetap ada sebagai fallback:
+    MPI_TRANSPORT=pickle  -> paksa jalur lama
+    MPI_TRANSPORT=buffer  -> Scatterv/Gatherv (default jika numpy tersedia)
+
+Protokol hasil minimal: worker hanya mengembalikan kolom numerik hasil hitung
+(array bertipe + offset chunk), id/nama tidak dikirim balik karena sudah ada di rank 0.
+
+Shared memory intra-node: communicator dipecah per node (COMM_TYPE_SHARED), data ditulis
+sekali oleh node leader ke window Allocate_shared dan dibaca zero-copy oleh rank lain.
+
+Transport objek (pickle protocol 5): objek Python tetap dikirim apa adanya, tetapi buffer
+besar (array NumPy, bytes) dikeluarkan dari stream pickle dan dikirim sebagai pesan
+buffer terpisah tanpa salinan perantara:
+    OBJECT_TRANSPORT=oob     -> send_oob/recv_oob (default jika numpy tersedia)
+    OBJECT_TRANSPORT=pickle  -> comm.send/recv biasa
+
+Kompresi payload (stdlib zlib/lzma) untuk pesan pickle besar antar rank:
+    PAYLOAD_CODEC=none|zlib|lzma|auto, COMPRESS_LEVEL, COMPRESS_MIN_BYTES, LINK_MBPS
+"""
+
+import array
+import lzma
+import os
+import pickle
+import time
+import zlib
+
+from mpi4py import MPI  # type: ignore
+
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+def transport_mode():
+    """Mode transport aktif: 'buffer' atau 'pickle'"""
+    mode = os.getenv('MPI_TRANSPORT', 'buffer' if HAS_NUMPY else 'pickle').lower()
+    if mode == 'buffer' and not HAS_NUMPY:
+        return 'pickle'
+    return mode
+
+
+def block_partition(n, size):
+    """Pembagian blok statis (sisa ke rank awal): kembalikan (counts, displs)"""
+    base, rem = divmod(n, size)
+    counts = [base + (1 if i < rem else 0) for i in range(size)]
+    displs = [0] * size
+    for i in range(1, size):
+        displs[i] = displs[i - 1] + counts[i - 1]
+    return counts, displs
+
+
+def pack_column(records, key, dtype, convert=float):
+    """Ambil satu field dari list of dict menjadi array NumPy bertipe"""
+    return np.fromiter((convert(r[key]) for r in records), dtype=dtype, count=len(records))
+
+
+def distribute_columns(comm, columns, root=0, partition=None):
+    """
+    Scatterv setiap kolom (dict nama -> array, hanya di root) ke semua rank.
+    `columns=None` di root berarti tidak ada pekerjaan: semua rank mendapat None.
+    Kembalikan (kolom lokal, counts, displs).
+    """
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    if rank == root:
+        if columns is None:
+            meta = None
+        else:
+            n = len(next(iter(columns.values())))
+            meta = (n, [(name, np.asarray(arr).dtype.str) for name, arr in columns.items()])
+    else:
+        meta = None
+    meta = comm.bcast(meta, root=root)
+    if meta is None:
+        return None, None, None
+
+    n, layout = meta
+    counts, displs = partition(n, size) if partition else block_partition(n, size)
+    local = {}
+    for name, dtype in layout:
+        recvbuf = np.empty(counts[rank], dtype=dtype)
+        if rank == root:
+            sendbuf = [np.ascontiguousarray(columns[name], dtype=dtype), (counts, displs)]
+        else:
+            sendbuf = None
+        comm.Scatterv(sendbuf, recvbuf, root=root)
+        local[name] = recvbuf
+    return local, counts, displs
+
+
+def collect_column(comm, local, counts, displs, root=0):
+    """Gatherv satu kolom hasil (array lokal) ke root; rank lain mendapat None"""
+    local = np.ascontiguousarray(local)
+    if comm.Get_rank() == root:
+        out = np.empty(sum(counts), dtype=local.dtype)
+        recvbuf = [out, (counts, displs)]
+    else:
+        out = None
+        recvbuf = None
+    comm.Gatherv(local, recvbuf, root=root)
+    return out
+
+
+# -------------------------------
+# Protokol hasil numerik (jalur pickle)
+# -------------------------------
+def numeric_columns(names, rows, typecode='d'):
+    """Ubah baris tuple hasil hitung menjadi dict nama -> array bertipe (stdlib array)"""
+    columns = {name: array.array(typecode) for name in names}
+    for row in rows:
+        for name, value in zip(names, row):
+            columns[name].append(value)
+    return columns
+
+
+def collect_numeric(comm, offset, local_columns, n, root=0, tag=1):
+    """
+    Kumpulkan kolom hasil (dict nama -> array) dari semua rank ke root.
+    Setiap rank mengirim (offset, kolom); root menempatkan sesuai offset dalam
+    urutan kedatangan. Root mendapat dict nama -> array sepanjang n, rank lain None.
+    """
+    if comm.Get_rank() != root:
+        comm.send((offset, local_columns), dest=root, tag=tag)
+        return None
+
+    out = {name: array.array(arr.typecode, bytes(arr.itemsize * n)) for name, arr in local_columns.items()}
+
+    def place(off, cols):
+        for name, arr in cols.items():
+            out[name][off:off + len(arr)] = arr
+
+    place(offset, local_columns)
+    for _ in range(comm.Get_size() - 1):
+        off, cols = comm.recv(source=MPI.ANY_SOURCE, tag=tag)
+        place(off, cols)
+    return out
+
+
+def payload_bytes(obj):
+    """Ukuran pesan pickle (bytes on the wire untuk comm.send lowercase)"""
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+# -------------------------------
+# Transport objek out-of-band (pickle protocol 5)
+# -------------------------------
+OOB_MIN_BYTES = int(os.getenv('OOB_MIN_BYTES', str(64 * 1024)))
+
+
+def object_transport():
+    """Mode transport objek aktif: 'oob' atau 'pickle'"""
+    mode = os.getenv('OBJECT_TRANSPORT', 'oob' if HAS_NUMPY else 'pickle').lower()
+    return mode if mode in ('oob', 'pickle') else 'pickle'
+
+
+def dumps_oob(obj, min_bytes=OOB_MIN_BYTES):
+    """
+    Serialisasi protocol 5: kembalikan (stream pickle, list memoryview buffer out-of-band).
+    Buffer lebih kecil dari min_bytes tetap in-band (tidak sebanding dengan pesan tambahan).
+    """
+    buffers = []
+
+    def keep_in_band(pickle_buffer):
+        view = pickle_buffer.raw()
+        if view.nbytes < min_bytes:
+            return True
+        buffers.append(view)
+        return False
+
+    data = pickle.dumps(obj, protocol=5, buffer_callback=keep_in_band)
+    return data, buffers
+
+
+def send_oob(comm, obj, dest, tag=0):
+    """
+    Kirim objek: header kecil (ukuran stream + ukuran buffer), stream pickle, lalu setiap
+    buffer out-of-band langsung dari memori objek aslinya (Send uppercase, zero-copy).
+    """
+    data, buffers = dumps_oob(obj)
+    comm.send((len(data), [b.nbytes for b in buffers]), dest=dest, tag=tag)
+    comm.Send([data, MPI.BYTE], dest=dest, tag=tag)
+    for view in buffers:
+        comm.Send([view, MPI.BYTE], dest=dest, tag=tag)
+
+
+def recv_oob(comm, source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG, status=None):
+    """
+    Terima objek dari send_oob. Buffer diterima langsung ke bytearray yang kemudian
+    menjadi memori array hasil unpickle (tanpa salinan tambahan).
+    """
+    status = status if status is not None else MPI.Status()
+    nbytes, sizes = comm.recv(source=source, tag=tag, status=status)
+    source, tag = status.Get_source(), status.Get_tag()
+    data = bytearray(nbytes)
+    comm.Recv([data, MPI.BYTE], source=source, tag=tag)
+    buffers = []
+    for n in sizes:
+        buf = bytearray(n)
+        comm.Recv([buf, MPI.BYTE], source=source, tag=tag)
+        buffers.append(buf)
+    return pickle.loads(data, buffers=buffers)
+
+
+def oob_bytes(obj):
+    """(bytes in-band, bytes out-of-band) untuk objek yang dikirim dengan send_oob"""
+    data, buffers = dumps_oob(obj)
+    return len(data), sum(b.nbytes for b in buffers)
+
+
+# -------------------------------
+# Kompresi payload (zlib / lzma)
+# -------------------------------
+CODECS = ('zlib', 'lzma')
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', str(256 * 1024)))
+AUTO_CANDIDATES = (('zlib', 1), ('zlib', 6), ('lzma', 0))
+AUTO_SAMPLE_BYTES = 256 * 1024
+DEFAULT_LINK_MBPS = 1000.0  # dipakai mode auto jika link belum diukur
+
+_link_mbps = None
+transfer_log = []  # catatan per transfer terkompresi (dikosongkan oleh compression_summary)
+
+
+def compression_codec():
+    """Codec aktif: 'none', 'zlib', 'lzma' atau 'auto'"""
+    codec = os.getenv('PAYLOAD_CODEC', 'none').lower()
+    return codec if codec in CODECS + ('auto',) else 'none'
+
+
+def compression_level(codec):
+    """Level kompresi (env COMPRESS_LEVEL), default zlib 6 / lzma preset 1"""
+    level = os.getenv('COMPRESS_LEVEL')
+    if level:
+        return int(level)
+    return 6 if codec == 'zlib' else 1
+
+
+def compress(codec, level, data):
+    if codec == 'zlib':
+        return zlib.compress(data, level)
+    if codec == 'lzma':
+        return lzma.compress(data, preset=level)
+    return data
+
+
+def decompress(codec, blob):
+    if codec == 'zlib':
+        return zlib.decompress(blob)
+    if codec == 'lzma':
+        return lzma.decompress(blob)
+    return blob
+
+
+def link_bandwidth(comm, nbytes=8 << 20, root=0):
+    """
+    Bandwidth link (bytes/detik): env LINK_MBPS, atau diukur sekali dengan Bcast.
+    Kolektif pada pemanggilan pertama tanpa LINK_MBPS; hasil di-cache per proses.
+    """
+    global _link_mbps
+    if _link_mbps is None:
+        if os.getenv('LINK_MBPS'):
+            _link_mbps = float(os.getenv('LINK_MBPS'))
+        else:
+            buf = bytearray(nbytes)
+            comm.Bcast([buf, MPI.BYTE], root=root)  # warm-up
+            comm.Barrier()
+            t0 = MPI.Wtime()
+            comm.Bcast([buf, MPI.BYTE], root=root)
+            comm.Barrier()
+            elapsed = comm.allreduce(MPI.Wtime() - t0, op=MPI.MAX)
+            _link_mbps = nbytes / elapsed / 1e6
+    return _link_mbps * 1e6
+
+
+def choose_codec(data, bandwidth, sample_bytes=AUTO_SAMPLE_BYTES):
+    """
+    Pilih (codec, level) dengan biaya terkecil per byte pada sampel awal payload:
+    waktu kompres + dekompres + kirim hasil kompresi vs kirim mentah (bandwidth bytes/detik).
+    """
+    sample = bytes(data[:sample_bytes])
+    best = ('none', None, len(sample) / bandwidth)
+    for codec, level in AUTO_CANDIDATES:
+        t0 = time.perf_counter()
+        blob = compress(codec, level, sample)
+        decompress(codec, blob)
+        cost = time.perf_counter() - t0 + len(blob) / bandwidth
+        if cost < best[2]:
+            best = (codec, level, cost)
+    return best[0], best[1]
+
+
+def send_compressed(comm, obj, dest, tag=0, codec=None, level=None):
+    """
+    Kirim objek pickle, dikompresi jika >= COMPRESS_MIN_BYTES: header (codec, ukuran)
+    lalu blob via Send. Kembalikan catatan transfer (juga disimpan di transfer_log).
+    """
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    codec = codec or compression_codec()
+    if len(data) < COMPRESS_MIN_BYTES:
+        codec = 'none'
+    elif codec == 'auto':
+        codec, level = choose_codec(data, (_link_mbps or DEFAULT_LINK_MBPS) * 1e6)
+    if codec != 'none' and level is None:
+        level = compression_level(codec)
+
+    t0 = time.perf_counter()
+    blob = compress(codec, level, data)
+    compress_time = time.perf_counter() - t0
+
+    comm.send((codec, len(blob)), dest=dest, tag=tag)
+    comm.Send([blob, MPI.BYTE], dest=dest, tag=tag)
+    record = {'side': 'send', 'peer': dest, 'codec': codec, 'level': level, 'raw_bytes': len(data),
+              'wire_bytes': len(blob), 'ratio': len(data) / len(blob), 'compress_time': compress_time}
+    transfer_log.append(record)
+    return record
+
+
+def recv_compressed(comm, source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG, status=None):
+    """Terima objek dari send_compressed (waktu dekompresi dicatat di transfer_log)"""
+    status = status if status is not None else MPI.Status()
+    codec, nbytes = comm.recv(source=source, tag=tag, status=status)
+    source, tag = status.Get_source(), status.Get_tag()
+    blob = bytearray(nbytes)
+    comm.Recv([blob, MPI.BYTE], source=source, tag=tag)
+
+    t0 = time.perf_counter()
+    data = decompress(codec, blob)
+    decompress_time = time.perf_counter() - t0
+    transfer_log.append({'side': 'recv', 'peer': source, 'codec': codec, 'raw_bytes': len(data),
+                         'wire_bytes': nbytes, 'decompress_time': decompress_time})
+    return pickle.loads(data)
+
+
+def send_payload(comm, obj, dest, tag=0):
+    """comm.send biasa, atau send_compressed jika PAYLOAD_CODEC aktif"""
+    if compression_codec() == 'none':
+        comm.send(obj, dest=dest, tag=tag)
+    else:
+        send_compressed(comm, obj, dest, tag=tag)
+
+
+def recv_payload(comm, source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG):
+    """Pasangan send_payload"""
+    if compression_codec() == 'none':
+        return comm.recv(source=source, tag=tag)
+    return recv_compressed(comm, source=source, tag=tag)
+
+
+def compression_summary(comm, root=0):
+    """
+    Kolektif: pasangkan catatan kirim root dengan catatan terima di rank tujuan.
+    Root mendapat list baris per transfer dengan rasio dan estimasi waktu bersih yang
+    dihemat = (raw - wire) / bandwidth - kompres - dekompres; rank lain None.
+    """
+    sent = [r for r in transfer_log if r['side'] == 'send']
+    received = [r for r in transfer_log if r['side'] == 'recv' and r['peer'] == root]
+    del transfer_log[:]
+    all_received = comm.gather(received, root=root)
+    if comm.Get_rank() != root:
+        return None
+
+    bandwidth = (_link_mbps or DEFAULT_LINK_MBPS) * 1e6
+    pending = {dest: list(records) for dest, records in enumerate(all_received)}
+    rows = []
+    for record in sent:
+        queue = pending.get(record['peer']) or []
+        decompress_time = queue.pop(0)['decompress_time'] if queue else 0.0
+        saved = (record['raw_bytes'] - record['wire_bytes']) / bandwidth - record['compress_time'] - decompress_time
+        rows.append(dict(record, decompress_time=decompress_time, net_saved=saved))
+    return rows
+
+
+# -------------------------------
+# Shared memory intra-node
+# -------------------------------
+def shm_enabled():
+    """Mode shared-memory window aktif (env PAYROLL_SHM, default 1 jika numpy tersedia)"""
+    return HAS_NUMPY and os.getenv('PAYROLL_SHM', '1') not in ('', '0')
+
+
+def node_communicators(comm):
+    """
+    Pecah comm per node: (node_comm, leader_comm).
+    leader_comm berisi rank 0 tiap node (urutan mengikuti rank global, sehingga rank 0
+    global = leader 0); rank non-leader mendapat MPI.COMM_NULL.
+    """
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED, key=comm.Get_rank())
+    color = 0 if node_comm.Get_rank() == 0 else MPI.UNDEFINED
+    leader_comm = comm.Split(color, key=comm.Get_rank())
+    return node_comm, leader_comm
+
+
+def shared_array(node_comm, shape, dtype):
+    """
+    Alokasikan array di window shared memory milik node leader.
+    Kembalikan (win, ndarray) - ndarray di semua rank node menunjuk memori yang sama.
+    Panggil win.Free() setelah selesai dipakai.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    win = MPI.Win.Allocate_shared(nbytes if node_comm.Get_rank() == 0 else 0, dtype.itemsize, comm=node_comm)
+    buf, _ = win.Shared_query(0)
+    return win, np.ndarray(buffer=buf, dtype=dtype, shape=shape)
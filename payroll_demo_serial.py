@@ -5,6 +5,7 @@ Demo sistem penggajian dengan data dummy - bisa jalan di production
 
 import random
 from datetime import datetime, timedelta
+import bench_metrics
 
 def generate_dummy_employees(num=100):
     """Generate dummy employee data"""
@@ -89,6 +90,11 @@ def main():
     print(f"Processing Time:  {elapsed:.3f} seconds")
     print(f"Throughput:       {len(results)/elapsed:,.0f} records/second")
     print("="*70)
+    
+    doc = bench_metrics.new_result("payroll_demo_serial", 1)
+    bench_metrics.add_point(doc, num_employees, serial_time=elapsed, rank_times=[elapsed],
+                            throughput=len(results) / elapsed if elapsed > 0 else None)
+    bench_metrics.emit_result(doc)
 
 if __name__ == '__main__':
     main()
@@ -1,7 +1,10 @@
 from mpi4py import MPI  # type: ignore
+from array import array
 import time
 import csv
 import os
+import csv_cache
+import mpi_transport
 
 # Initialize MPI
 comm = MPI.COMM_WORLD
@@ -38,9 +41,8 @@ def muat_dari_csv(nama_file):
     if not os.path.exists(nama_file):
         print(f"    File '{nama_file}' tidak ditemukan.")
         return []
-    with open(nama_file, mode='r', newline='', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        return list(reader)
+    # Kolom biner di-mmap jika cache masih segar (csv_cache.py), selain itu csv.DictReader
+    return csv_cache.load_records(nama_file)
 
 # -------------------------------
 # Input Data
@@ -180,14 +182,74 @@ def hitung_gaji_serial():
 # Hitung Gaji (Parallel MPI)
 # -------------------------------
 def hitung_gaji_parallel():
+    """Pilih transport: Scatterv/Gatherv buffer (default) atau pickle send/recv (fallback)"""
+    if mpi_transport.transport_mode() == 'buffer':
+        hitung_gaji_parallel_buffer()
+    else:
+        hitung_gaji_parallel_pickle()
+
+def hitung_gaji_parallel_buffer():
+    """Distribusi kolom gaji_pokok & hari_masuk dengan Scatterv, hasil total dengan Gatherv"""
+    global data_gaji
+    
+    columns = None
+    if rank == 0:
+        if not data_absen:
+            print("     Input data absen terlebih dahulu!")
+        else:
+            print(f">> Menghitung gaji secara paralel dengan {size} proses MPI (Scatterv/Gatherv)...")
+            start = time.perf_counter()
+            np = mpi_transport.np
+            columns = {
+                "gaji_pokok": mpi_transport.pack_column(data_karyawan, "gaji_pokok", np.float64),
+                "hari_masuk": mpi_transport.pack_column(data_absen, "hari_masuk", np.int64, int)
+            }
+    
+    local, counts, displs = mpi_transport.distribute_columns(comm, columns)
+    if local is None:
+        return  # Tidak ada pekerjaan
+    
+    # Setiap rank menghitung bagiannya (vektor)
+    local_total = local["gaji_pokok"] * local["hari_masuk"]
+    total = mpi_transport.collect_column(comm, local_total, counts, displs)
+    
+    if rank == 0:
+        data_gaji = [
+            {"id": k["id"], "nama": k["nama"], "total_gaji": float(t)}
+            for k, t in zip(data_karyawan, total)
+        ]
+        
+        end = time.perf_counter()
+        elapsed = end - start
+        parallel_times.append(elapsed)
+        jumlah_data.append(len(data_karyawan))
+        
+        print(f">> Gaji berhasil dihitung secara PARALEL (MPI) dalam {elapsed:.6f} detik.")
+        print(f"   Total karyawan: {len(data_karyawan)}")
+        print(f"   Proses MPI: {size}")
+
+def cetak_kompresi(rows):
+    """Rank 0: rasio kompresi dan estimasi waktu bersih yang dihemat per transfer"""
+    print(f"   Kompresi payload ({mpi_transport.compression_codec()}):")
+    for r in rows:
+        level = f"-{r['level']}" if r['level'] is not None else ""
+        print(f"     -> rank {r['peer']}: {r['codec']}{level} {r['raw_bytes'] / 1e6:.2f} MB -> "
+              f"{r['wire_bytes'] / 1e6:.2f} MB (rasio {r['ratio']:.1f}x), "
+              f"hemat bersih {r['net_saved'] * 1000:+.2f} ms")
+
+def hitung_gaji_parallel_pickle():
     global data_gaji
     
+    codec = mpi_transport.compression_codec()
+    if codec == 'auto':
+        mpi_transport.link_bandwidth(comm)  # kolektif, sekali per proses
+    
     if rank == 0:
         if not data_absen:
             print("     Input data absen terlebih dahulu!")
             # Broadcast signal untuk tidak ada pekerjaan
             for i in range(1, size):
-                comm.send(None, dest=i, tag=0)
+                mpi_transport.send_payload(comm, None, dest=i, tag=0)
             return
         
         print(f">> Menghitung gaji secara paralel dengan {size} proses MPI...")
@@ -198,7 +260,7 @@ def hitung_gaji_parallel():
         karyawan_per_process = num_karyawan // size
         remainder = num_karyawan % size
         
-        # Distribusi data ke worker processes
+        # Distribusi data ke worker processes (beserta offset chunk)
         start_idx = 0
         for i in range(size):
             count = karyawan_per_process + (1 if i < remainder else 0)
@@ -206,37 +268,38 @@ def hitung_gaji_parallel():
             
             if i == 0:
                 # Rank 0 memproses bagiannya sendiri
-                local_karyawan = data_karyawan[start_idx:end_idx]
-                local_absen = data_absen[start_idx:end_idx]
-            else:
-                # Kirim ke worker processes
                 chunk_karyawan = data_karyawan[start_idx:end_idx]
                 chunk_absen = data_absen[start_idx:end_idx]
-                comm.send((chunk_karyawan, chunk_absen), dest=i, tag=0)
+            else:
+                # Kirim ke worker processes
+                mpi_transport.send_payload(comm, (start_idx, data_karyawan[start_idx:end_idx],
+                                                   data_absen[start_idx:end_idx]), dest=i, tag=0)
             
             start_idx = end_idx
+        offset = 0
+    
+    else:
+        # Worker processes
+        data_chunk = mpi_transport.recv_payload(comm, source=0, tag=0)
         
-        # Rank 0 memproses bagiannya
-        local_gaji = []
-        for i, k in enumerate(local_karyawan):
-            hari_masuk = int(local_absen[i]["hari_masuk"])
-            total = float(k["gaji_pokok"]) * hari_masuk
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "total_gaji": total
-            })
-        
-        # Kumpulkan hasil dari semua worker processes
-        all_results = [local_gaji]
-        for i in range(1, size):
-            results = comm.recv(source=i, tag=1)
-            all_results.append(results)
+        if data_chunk is None:
+            return  # Tidak ada pekerjaan
         
-        # Gabungkan semua hasil
-        data_gaji = []
-        for result_chunk in all_results:
-            data_gaji.extend(result_chunk)
+        offset, chunk_karyawan, chunk_absen = data_chunk
+        num_karyawan = None
+    
+    # Proses data: hanya kolom total_gaji yang dikirim balik ke rank 0
+    local_total = array("d", (float(k["gaji_pokok"]) * int(a["hari_masuk"])
+                              for k, a in zip(chunk_karyawan, chunk_absen)))
+    hasil = mpi_transport.collect_numeric(comm, offset, {"total_gaji": local_total}, num_karyawan)
+    kompresi = mpi_transport.compression_summary(comm) if codec != 'none' else None
+    
+    if rank == 0:
+        # Gabungkan dengan id/nama yang sudah ada di rank 0
+        data_gaji = [
+            {"id": k["id"], "nama": k["nama"], "total_gaji": t}
+            for k, t in zip(data_karyawan, hasil["total_gaji"])
+        ]
         
         end = time.perf_counter()
         elapsed = end - start
@@ -246,29 +309,8 @@ def hitung_gaji_parallel():
         print(f">> Gaji berhasil dihitung secara PARALEL (MPI) dalam {elapsed:.6f} detik.")
         print(f"   Total karyawan: {len(data_karyawan)}")
         print(f"   Proses MPI: {size}")
-        
-    else:
-        # Worker processes
-        data_chunk = comm.recv(source=0, tag=0)
-        
-        if data_chunk is None:
-            return  # Tidak ada pekerjaan
-        
-        chunk_karyawan, chunk_absen = data_chunk
-        
-        # Proses data
-        local_gaji = []
-        for i, k in enumerate(chunk_karyawan):
-            hari_masuk = int(chunk_absen[i]["hari_masuk"])
-            total = float(k["gaji_pokok"]) * hari_masuk
-            local_gaji.append({
-                "id": k["id"],
-                "nama": k["nama"],
-                "total_gaji": total
-            })
-        
-        # Kirim hasil kembali ke rank 0
-        comm.send(local_gaji, dest=0, tag=1)
+        if kompresi:
+            cetak_kompresi(kompresi)
 
 # -------------------------------
 # Tampilkan Data Gaji
@@ -10,6 +10,9 @@ import csv
 import os
 from datetime import datetime
 
+import mpi_hierarchy
+import mpi_transport
+
 # MPI Setup
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
@@ -40,42 +43,60 @@ class Absen:
         self.hari_masuk = hari_masuk
 
 
+# Jabatan yang menentukan tunjangan (urutan = prioritas pencocokan); kode untuk mode shared memory
+JABATAN_TUNJANGAN = ["Manager", "Supervisor", "Staff", ""]
+
+
+def kode_jabatan(jabatan):
+    """Kode numerik kategori jabatan (indeks JABATAN_TUNJANGAN)"""
+    for i, nama in enumerate(JABATAN_TUNJANGAN[:-1]):
+        if nama in jabatan:
+            return i
+    return len(JABATAN_TUNJANGAN) - 1
+
+
+def hitung_total_gaji(gaji_pokok, hari_masuk, jabatan):
+    """Hitung total gaji dengan berbagai komponen"""
+    gaji_dasar = gaji_pokok * hari_masuk
+    
+    # Tunjangan berdasarkan jabatan
+    if "Manager" in jabatan:
+        tunjangan = gaji_dasar * 0.20
+    elif "Supervisor" in jabatan:
+        tunjangan = gaji_dasar * 0.15
+    elif "Staff" in jabatan:
+        tunjangan = gaji_dasar * 0.10
+    else:
+        tunjangan = gaji_dasar * 0.05
+    
+    # Bonus kehadiran
+    if hari_masuk >= 25:
+        bonus = gaji_dasar * 0.10
+    elif hari_masuk >= 20:
+        bonus = gaji_dasar * 0.05
+    else:
+        bonus = 0
+    
+    # Pajak 5%
+    total_kotor = gaji_dasar + tunjangan + bonus
+    pajak = total_kotor * 0.05
+    
+    return total_kotor - pajak
+
+
 class Gaji:
-    def __init__(self, karyawan, absen):
+    def __init__(self, karyawan, absen, total_gaji=None):
         self.id = karyawan.id
         self.nama = karyawan.nama
         self.jabatan = karyawan.jabatan
         self.gaji_pokok = karyawan.gaji_pokok
         self.hari_masuk = absen.hari_masuk
-        self.total_gaji = self.hitung_total()
+        # total_gaji sudah dihitung rank lain (mode shared memory)
+        self.total_gaji = self.hitung_total() if total_gaji is None else total_gaji
     
     def hitung_total(self):
         """Hitung total gaji dengan berbagai komponen"""
-        gaji_dasar = self.gaji_pokok * self.hari_masuk
-        
-        # Tunjangan berdasarkan jabatan
-        if "Manager" in self.jabatan:
-            tunjangan = gaji_dasar * 0.20
-        elif "Supervisor" in self.jabatan:
-            tunjangan = gaji_dasar * 0.15
-        elif "Staff" in self.jabatan:
-            tunjangan = gaji_dasar * 0.10
-        else:
-            tunjangan = gaji_dasar * 0.05
-        
-        # Bonus kehadiran
-        if self.hari_masuk >= 25:
-            bonus = gaji_dasar * 0.10
-        elif self.hari_masuk >= 20:
-            bonus = gaji_dasar * 0.05
-        else:
-            bonus = 0
-        
-        # Pajak 5%
-        total_kotor = gaji_dasar + tunjangan + bonus
-        pajak = total_kotor * 0.05
-        
-        return total_kotor - pajak
+        return hitung_total_gaji(self.gaji_pokok, self.hari_masuk, self.jabatan)
 
 
 def clear_screen():
@@ -223,8 +244,114 @@ def hitung_gaji_serial():
     print(f"[>>] Waktu Eksekusi: {waktu:.4f} detik")
 
 
+def simulasi_komputasi():
+    """Simulasi perhitungan kompleks per karyawan"""
+    for _ in range(100000):
+        _ = sum([i**2 for i in range(100)])
+
+
+def node_communicators_cached():
+    """Communicator node & leader dibuat sekali per sesi (dibagi dengan mpi_hierarchy)"""
+    node_comm, leader_comm, _ = mpi_hierarchy.topology(comm)
+    return node_comm, leader_comm
+
+
 def hitung_gaji_parallel():
-    """Menu 4: Hitung gaji secara parallel dengan MPI"""
+    """Menu 4: pilih mode shared memory intra-node (default) atau bcast"""
+    if mpi_transport.shm_enabled():
+        hitung_gaji_parallel_shm()
+    else:
+        hitung_gaji_parallel_bcast()
+
+
+def hitung_gaji_parallel_shm():
+    """
+    Hitung gaji parallel dengan window shared memory per node.
+    Kolom [gaji_pokok, hari_masuk, kode_jabatan, total] ditulis sekali per node:
+    rank 0 mengirim ke node leader lain (Bcast antar leader), rank lain di node
+    membaca langsung dari window tanpa salinan. Total gaji ditulis ke kolom yang sama
+    lalu digabung antar node leader dengan Reduce.
+    """
+    global data_gaji
+    np = mpi_transport.np
+    
+    meta = None
+    if rank == 0:
+        print("\n[HITUNG GAJI - MODE PARALLEL MPI (SHARED MEMORY)]")
+        
+        if not data_karyawan or not data_absen:
+            print("[X] Data karyawan atau absen belum lengkap!")
+        else:
+            print(f"Memproses dengan {size} proses...")
+            start_time = time.time()
+            meta = len(data_karyawan)
+    
+    n = comm.bcast(meta, root=0)
+    if not n:
+        return
+    
+    node_comm, leader_comm = node_communicators_cached()
+    win, tabel = mpi_transport.shared_array(node_comm, (n, 4), np.float64)
+    
+    if rank == 0:
+        # Gabung absen per id sekali (dict), -1 = tidak ada data absen
+        absen_per_id = {}
+        for a in data_absen:
+            absen_per_id.setdefault(a.id, a.hari_masuk)
+        for i, k in enumerate(data_karyawan):
+            tabel[i, 0] = k.gaji_pokok
+            tabel[i, 1] = absen_per_id.get(k.id, -1)
+            tabel[i, 2] = kode_jabatan(k.jabatan)
+    
+    # Transfer antar node hanya ke node leader, langsung ke dalam window
+    if leader_comm != MPI.COMM_NULL:
+        tabel[:, 3] = 0.0
+        if leader_comm.Get_size() > 1:
+            leader_comm.Bcast(tabel, root=0)
+    node_comm.Barrier()  # data node leader terlihat oleh semua rank di node
+    
+    # Bagi kerja (blok statis) dan tulis total ke window
+    counts, displs = mpi_transport.block_partition(n, size)
+    for i in range(displs[rank], displs[rank] + counts[rank]):
+        gaji_pokok, hari_masuk, kode, _ = tabel[i]
+        if hari_masuk < 0:
+            continue
+        tabel[i, 3] = hitung_total_gaji(gaji_pokok, int(hari_masuk), JABATAN_TUNJANGAN[int(kode)])
+        simulasi_komputasi()
+    node_comm.Barrier()
+    
+    # Gabung hasil antar node: baris yang tidak dihitung node bernilai 0
+    if leader_comm != MPI.COMM_NULL and leader_comm.Get_size() > 1:
+        total = np.ascontiguousarray(tabel[:, 3])
+        hasil = np.empty_like(total) if rank == 0 else None
+        leader_comm.Reduce(total, hasil, op=MPI.SUM, root=0)
+        if rank == 0:
+            tabel[:, 3] = hasil
+    
+    if rank == 0:
+        absen_obj = {}
+        for a in data_absen:
+            absen_obj.setdefault(a.id, a)
+        data_gaji = [
+            Gaji(k, absen_obj[k.id], float(tabel[i, 3]))
+            for i, k in enumerate(data_karyawan) if k.id in absen_obj
+        ]
+        
+        end_time = time.time()
+        waktu = end_time - start_time
+        jumlah_node = leader_comm.Get_size()
+        
+        print(f"[OK] Selesai! {len(data_gaji)} gaji dihitung")
+        print(f"[>>] Waktu Eksekusi: {waktu:.4f} detik")
+        print(f"[>>] {jumlah_node} node, window shared {tabel.nbytes / 1e6:.2f} MB per node "
+              f"(satu salinan untuk {node_comm.Get_size()} proses di node ini)")
+    
+    del tabel
+    win.Free()
+
+
+def hitung_gaji_parallel_bcast():
+    """Hitung gaji parallel: data lengkap di-bcast ke semua proses (mode lama)"""
     global data_gaji, data_karyawan, data_absen
     
     if rank == 0:
@@ -269,7 +396,7 @@ def hitung_gaji_parallel():
                 _ = sum([i**2 for i in range(100)])
     
     # Gather hasil
-    all_gaji = comm.gather(local_gaji, root=0)
+    all_gaji = mpi_hierarchy.gather(comm, local_gaji, root=0)
     
     if rank == 0:
         data_gaji = []
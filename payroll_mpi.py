@@ -6,11 +6,34 @@ from typing import List
 import csv
 import os
 
+import csv_cache
+import mpi_transport
+
 # Initialize MPI
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
 size = comm.Get_size()
 
+# Jumlah sub-chunk per proses untuk mode pipelined
+PIPELINE_CHUNKS = int(os.getenv('PIPELINE_CHUNKS', '4'))
+RESULT_TAG = 16384  # tag hasil = RESULT_TAG + k, tag input = k
+
+
+def _sub_chunks(start: int, count: int, chunks: int):
+    """Pecah rentang [start, start+count) menjadi maksimal `chunks` sub-rentang (lo, hi)"""
+    sub_counts, sub_displs = mpi_transport.block_partition(count, min(chunks, count) or 1)
+    return [(start + d, start + d + c) for c, d in zip(sub_counts, sub_displs) if c > 0]
+
+
+def hidden_comm_fraction(reference_exposed: float, pipelined_exposed: float):
+    """
+    Fraksi komunikasi yang tersembunyi di balik komputasi: 1 - terbuka(pipeline) / terbuka(referensi).
+    Referensi = run tanpa overlap (mis. pipeline dengan 1 sub-chunk per proses).
+    """
+    if not reference_exposed or reference_exposed <= 0:
+        return None
+    return min(max(1.0 - pipelined_exposed / reference_exposed, 0.0), 1.0)
+
 @dataclass
 class Employee:
     id: int
@@ -21,11 +44,56 @@ class Employee:
     deductions: float = 0.0
     total_salary: float = 0.0
 
+# Kolom numerik Employee yang dikemas ke satu array float64 untuk transport out-of-band
+EMPLOYEE_VALUES = ('base_salary', 'overtime_hours', 'bonus', 'deductions', 'total_salary')
+
+
+def employees_to_batch(employees: List[Employee]):
+    """
+    Kemas list Employee menjadi pesan campuran: metadata (nama) in-band,
+    id dan kolom numerik sebagai array NumPy (dikirim out-of-band oleh send_oob)
+    """
+    np = mpi_transport.np
+    n = len(employees)
+    values = np.empty((n, len(EMPLOYEE_VALUES)))
+    for j, field in enumerate(EMPLOYEE_VALUES):
+        values[:, j] = np.fromiter((getattr(e, field) for e in employees), dtype=np.float64, count=n)
+    return {
+        'name': [e.name for e in employees],
+        'id': np.fromiter((e.id for e in employees), dtype=np.int64, count=n),
+        'values': values
+    }
+
+
+def batch_to_employees(batch) -> List[Employee]:
+    """Kebalikan employees_to_batch"""
+    rows = batch['values'].tolist()
+    return [Employee(emp_id, name, *row) for emp_id, name, row in zip(batch['id'].tolist(), batch['name'], rows)]
+
+
+def send_employees(employees, dest: int, tag: int):
+    """Kirim chunk Employee (atau None) sesuai OBJECT_TRANSPORT"""
+    if mpi_transport.object_transport() == 'pickle':
+        comm.send(employees, dest=dest, tag=tag)
+    else:
+        batch = None if employees is None else employees_to_batch(employees)
+        mpi_transport.send_oob(comm, batch, dest=dest, tag=tag)
+
+
+def recv_employees(source: int, tag: int):
+    """Terima chunk Employee dari send_employees"""
+    if mpi_transport.object_transport() == 'oob':
+        batch = mpi_transport.recv_oob(comm, source=source, tag=tag)
+        return None if batch is None else batch_to_employees(batch)
+    return comm.recv(source=source, tag=tag)
+
 class PayrollSystemMPI:
     def __init__(self):
         self.employees: List[Employee] = []
         self.overtime_rate = 1.5  # 150% dari gaji per jam
         self.work_hours_per_month = 160  # 8 jam x 20 hari
+        self.rank_times = None  # waktu komputasi per rank dari run paralel terakhir
+        self.comm_stats = None  # statistik komunikasi dari run pipelined terakhir
     
     def add_employee(self, name: str, base_salary: float):
         """Hanya rank 0 yang menambahkan karyawan"""
@@ -62,17 +130,20 @@ class PayrollSystemMPI:
             else:
                 print("[X] ID karyawan tidak ditemukan!")
     
-    def _calculate_single_salary(self, emp: Employee) -> Employee:
-        """Hitung gaji satu karyawan"""
+    def _salary_formula(self, base_salary, overtime_hours, bonus, deductions):
+        """Rumus gaji; berlaku untuk skalar maupun array NumPy"""
         # Hitung gaji per jam
-        hourly_rate = emp.base_salary / self.work_hours_per_month
+        hourly_rate = base_salary / self.work_hours_per_month
         
         # Hitung uang lembur
-        overtime_pay = emp.overtime_hours * hourly_rate * self.overtime_rate
+        overtime_pay = overtime_hours * hourly_rate * self.overtime_rate
         
         # Total gaji = gaji pokok + lembur + bonus - potongan
-        emp.total_salary = emp.base_salary + overtime_pay + emp.bonus - emp.deductions
-        
+        return base_salary + overtime_pay + bonus - deductions
+    
+    def _calculate_single_salary(self, emp: Employee) -> Employee:
+        """Hitung gaji satu karyawan"""
+        emp.total_salary = self._salary_formula(emp.base_salary, emp.overtime_hours, emp.bonus, emp.deductions)
         return emp
     
     def calculate_all_salaries_parallel(self):
@@ -87,7 +158,7 @@ class PayrollSystemMPI:
                 print("Tidak ada karyawan untuk dihitung!")
                 # Broadcast None untuk memberitahu worker tidak ada pekerjaan
                 for i in range(1, size):
-                    comm.send(None, dest=i, tag=0)
+                    send_employees(None, dest=i, tag=0)
                 return
             
             print(f"[Rank {rank}] Mendistribusikan {num_employees} karyawan ke {size} proses...")
@@ -109,18 +180,20 @@ class PayrollSystemMPI:
                 else:
                     # Kirim ke worker processes
                     chunk = self.employees[start_idx:end_idx]
-                    comm.send(chunk, dest=i, tag=0)
+                    send_employees(chunk, dest=i, tag=0)
                 
                 start_idx = end_idx
             
             # Rank 0 memproses bagiannya
+            t_local = time.perf_counter()
             for i, emp in enumerate(local_employees):
                 local_employees[i] = self._calculate_single_salary(emp)
+            local_time = time.perf_counter() - t_local
             
             # Kumpulkan hasil dari semua worker processes
             all_results = [local_employees]
             for i in range(1, size):
-                results = comm.recv(source=i, tag=1)
+                results = recv_employees(source=i, tag=1)
                 all_results.append(results)
             
             # Gabungkan semua hasil
@@ -133,23 +206,231 @@ class PayrollSystemMPI:
             t1 = time.perf_counter()
             print(f"[OK] Gaji {num_employees} karyawan berhasil dihitung (MPI Parallel, {t1-t0:.3f}s)")
             print(f"  Menggunakan {size} proses MPI")
+            self.rank_times = comm.gather(local_time, root=0)
+            return t1 - t0
         
         else:
             # Worker processes
             # Terima data dari rank 0
-            employees_chunk = comm.recv(source=0, tag=0)
+            employees_chunk = recv_employees(source=0, tag=0)
             
             if employees_chunk is None:
                 return  # Tidak ada pekerjaan
             
             # Proses data
+            t_local = time.perf_counter()
             results = []
             for emp in employees_chunk:
                 results.append(self._calculate_single_salary(emp))
+            local_time = time.perf_counter() - t_local
             
             # Kirim hasil kembali ke rank 0
-            comm.send(results, dest=0, tag=1)
+            send_employees(results, dest=0, tag=1)
+            comm.gather(local_time, root=0)
     
+    def calculate_all_salaries_pipelined(self, chunks: int = PIPELINE_CHUNKS):
+        """
+        Hitung gaji dengan pipeline non-blocking: bagian tiap rank dipecah menjadi
+        `chunks` sub-chunk (array float64 [gaji pokok, lembur, bonus, potongan]).
+        Worker memasang Irecv semua sub-chunk di awal sehingga transfer sub-chunk k+1
+        berjalan selama sub-chunk k dihitung, lalu hasil dikirim balik dengan Isend.
+        Rank 0 mengumpulkan hasil sesuai urutan selesai (Waitany), bukan urutan rank.
+        """
+        if not mpi_transport.HAS_NUMPY:
+            if rank == 0:
+                print("[!] numpy tidak tersedia, memakai mode blocking")
+            return self.calculate_all_salaries_parallel()
+        np = mpi_transport.np
+
+        if rank == 0:
+            t0 = time.perf_counter()
+            num_employees = len(self.employees)
+            meta = (num_employees, min(max(1, chunks), RESULT_TAG)) if num_employees else None
+        else:
+            meta = None
+        meta = comm.bcast(meta, root=0)
+
+        if meta is None:
+            if rank == 0:
+                print("Tidak ada karyawan untuk dihitung!")
+            return
+
+        num_employees, chunks = meta
+        counts, displs = mpi_transport.block_partition(num_employees, size)
+        pieces = [_sub_chunks(displs[r], counts[r], chunks) for r in range(size)]
+        wait_time = 0.0
+        compute_time = 0.0
+
+        if rank == 0:
+            print(f"[Rank {rank}] Pipeline {num_employees} karyawan ke {size} proses ({chunks} sub-chunk/proses)...")
+            t_pack = time.perf_counter()
+            data = np.array([(e.base_salary, e.overtime_hours, e.bonus, e.deductions) for e in self.employees],
+                            dtype=np.float64).reshape(num_employees, 4)
+            totals = np.empty(num_employees, dtype=np.float64)
+            pack_time = time.perf_counter() - t_pack
+
+            # Pasang Irecv hasil terlebih dahulu, baru kirim input (Isend) ke worker
+            recv_reqs = []
+            for r in range(1, size):
+                for k, (lo, hi) in enumerate(pieces[r]):
+                    recv_reqs.append(comm.Irecv(totals[lo:hi], source=r, tag=RESULT_TAG + k))
+            send_reqs = []
+            for r in range(1, size):
+                for k, (lo, hi) in enumerate(pieces[r]):
+                    send_reqs.append(comm.Isend(data[lo:hi], dest=r, tag=k))
+
+            # Rank 0 menghitung bagiannya sambil transfer berjalan
+            for lo, hi in pieces[0]:
+                t_local = time.perf_counter()
+                block = data[lo:hi]
+                totals[lo:hi] = self._salary_formula(block[:, 0], block[:, 1], block[:, 2], block[:, 3])
+                compute_time += time.perf_counter() - t_local
+                MPI.Request.Testall(send_reqs)
+
+            # Kumpulkan hasil sesuai urutan selesai
+            t_wait = time.perf_counter()
+            completion_order = []
+            for _ in range(len(recv_reqs)):
+                status = MPI.Status()
+                MPI.Request.Waitany(recv_reqs, status)
+                completion_order.append((status.Get_source(), status.Get_tag() - RESULT_TAG))
+            MPI.Request.Waitall(send_reqs)
+            wait_time += time.perf_counter() - t_wait
+
+            t_pack = time.perf_counter()
+            for emp, total in zip(self.employees, totals.tolist()):
+                emp.total_salary = total
+            pack_time += time.perf_counter() - t_pack
+
+        else:
+            my_pieces = pieces[rank]
+            inputs = [np.empty((hi - lo, 4), dtype=np.float64) for lo, hi in my_pieces]
+            outputs = [np.empty(hi - lo, dtype=np.float64) for lo, hi in my_pieces]
+            recv_reqs = [comm.Irecv(buf, source=0, tag=k) for k, buf in enumerate(inputs)]
+            send_reqs = []
+
+            for k in range(len(my_pieces)):
+                t_wait = time.perf_counter()
+                recv_reqs[k].Wait()
+                wait_time += time.perf_counter() - t_wait
+
+                t_local = time.perf_counter()
+                block = inputs[k]
+                outputs[k][:] = self._salary_formula(block[:, 0], block[:, 1], block[:, 2], block[:, 3])
+                compute_time += time.perf_counter() - t_local
+                send_reqs.append(comm.Isend(outputs[k], dest=0, tag=RESULT_TAG + k))
+
+            t_wait = time.perf_counter()
+            MPI.Request.Waitall(send_reqs)
+            wait_time += time.perf_counter() - t_wait
+
+        stats = comm.gather((compute_time, wait_time), root=0)
+        if rank != 0:
+            return
+
+        elapsed = time.perf_counter() - t0
+        self.rank_times = [c for c, _ in stats]
+        self.comm_stats = {
+            'chunks': chunks,
+            'elapsed': elapsed,
+            'pack_time': pack_time,
+            'wait_times': [w for _, w in stats],
+            # Komunikasi yang tidak tertutup komputasi: waktu total dikurangi packing dan komputasi terlama
+            'exposed_comm': max(elapsed - pack_time - max(self.rank_times), 0.0),
+            'completion_order': completion_order
+        }
+        print(f"[OK] Gaji {num_employees} karyawan berhasil dihitung (MPI Pipelined, {elapsed:.3f}s)")
+        print(f"  Menggunakan {size} proses MPI, komunikasi terbuka {self.comm_stats['exposed_comm']:.4f}s")
+        return elapsed
+
+    def calculate_all_salaries_collect(self, collect: str = 'fence'):
+        """
+        Hitung gaji dengan kolom numerik (Scatterv) dan mode pengumpulan hasil yang bisa dipilih:
+            sendrecv - Send/Recv buffer per worker, rank 0 menerima berurutan
+            gatherv  - satu Gatherv
+            fence    - RMA: worker Put total ke window hasil rank 0 di dalam epoch Fence
+            passive  - RMA passive target: Lock/Put/Unlock per worker, lalu Barrier
+        Dengan RMA rank 0 tidak perlu mencocokkan receive maupun unpickle per chunk.
+        """
+        if not mpi_transport.HAS_NUMPY:
+            if rank == 0:
+                print("[!] numpy tidak tersedia, memakai mode send/recv pickle")
+            return self.calculate_all_salaries_parallel()
+        np = mpi_transport.np
+
+        columns = None
+        if rank == 0:
+            t0 = time.perf_counter()
+            if self.employees:
+                columns = {
+                    name: np.fromiter((getattr(e, name) for e in self.employees), dtype=np.float64,
+                                      count=len(self.employees))
+                    for name in ('base_salary', 'overtime_hours', 'bonus', 'deductions')
+                }
+        local, counts, displs = mpi_transport.distribute_columns(comm, columns)
+        if local is None:
+            if rank == 0:
+                print("Tidak ada karyawan untuk dihitung!")
+            return
+
+        t_local = time.perf_counter()
+        local_total = np.ascontiguousarray(self._salary_formula(
+            local['base_salary'], local['overtime_hours'], local['bonus'], local['deductions']))
+        local_time = time.perf_counter() - t_local
+
+        n = sum(counts)
+        comm.Barrier()
+        t_collect = time.perf_counter()
+        totals = np.empty(n, dtype=np.float64) if rank == 0 else None
+
+        if collect == 'gatherv':
+            totals = mpi_transport.collect_column(comm, local_total, counts, displs)
+        elif collect in ('fence', 'passive'):
+            # Window hasil hanya berisi memori di rank 0 (ukuran = jumlah karyawan)
+            win = MPI.Win.Create(totals if rank == 0 else None, 8, comm=comm)
+            target = (displs[rank], counts[rank], MPI.DOUBLE)
+            if collect == 'fence':
+                win.Fence()
+                if rank == 0:
+                    totals[:counts[0]] = local_total
+                elif counts[rank]:
+                    win.Put(local_total, 0, target=target)
+                win.Fence()
+            else:
+                if rank == 0:
+                    totals[:counts[0]] = local_total
+                elif counts[rank]:
+                    win.Lock(0, MPI.LOCK_SHARED)
+                    win.Put(local_total, 0, target=target)
+                    win.Unlock(0)
+                comm.Barrier()  # semua Put sudah selesai (Unlock) sebelum rank 0 membaca
+                if rank == 0:
+                    win.Lock(0, MPI.LOCK_SHARED)
+                    win.Sync()
+                    win.Unlock(0)
+            win.Free()
+        else:
+            if rank == 0:
+                totals[:counts[0]] = local_total
+                for i in range(1, size):
+                    comm.Recv(totals[displs[i]:displs[i] + counts[i]], source=i, tag=1)
+            else:
+                comm.Send(local_total, dest=0, tag=1)
+        collect_time = time.perf_counter() - t_collect
+
+        rank_times = comm.gather(local_time, root=0)
+        if rank != 0:
+            return
+
+        for emp, total in zip(self.employees, totals.tolist()):
+            emp.total_salary = total
+        elapsed = time.perf_counter() - t0
+        self.rank_times = rank_times
+        self.comm_stats = {'collect': collect, 'collect_time': collect_time, 'elapsed': elapsed}
+        print(f"[OK] Gaji {n} karyawan berhasil dihitung (MPI {collect}, {elapsed:.3f}s, "
+              f"pengumpulan {collect_time:.4f}s)")
+        return elapsed
+
     def calculate_all_salaries_serial(self):
         """Hitung gaji secara serial (hanya rank 0)"""
         if rank == 0:
@@ -165,6 +446,7 @@ class PayrollSystemMPI:
             
             t1 = time.perf_counter()
             print(f"[OK] Gaji {num_employees} karyawan berhasil dihitung (Serial, {t1-t0:.3f}s)")
+            return t1 - t0
     
     def display_all_payroll(self):
         """Tampilkan slip gaji semua karyawan (hanya rank 0)"""
@@ -248,19 +530,18 @@ class PayrollSystemMPI:
             return
         
         self.employees = []
-        with open(filename, mode='r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                emp = Employee(
-                    id=int(row['id']),
-                    name=row['name'],
-                    base_salary=float(row['base_salary']),
-                    overtime_hours=float(row['overtime_hours']),
-                    bonus=float(row['bonus']),
-                    deductions=float(row['deductions']),
-                    total_salary=float(row['total_salary'])
-                )
-                self.employees.append(emp)
+        # Kolom biner di-mmap jika cache masih segar (csv_cache.py), selain itu csv.DictReader
+        for row in csv_cache.load_records(filename):
+            emp = Employee(
+                id=int(row['id']),
+                name=row['name'],
+                base_salary=float(row['base_salary']),
+                overtime_hours=float(row['overtime_hours']),
+                bonus=float(row['bonus']),
+                deductions=float(row['deductions']),
+                total_salary=float(row['total_salary'])
+            )
+            self.employees.append(emp)
         
         print(f">> {len(self.employees)} data karyawan berhasil dimuat dari '{filename}'")
 
@@ -279,6 +560,7 @@ def show_menu():
         print("8. Generate Data Sample")
         print("9. Simpan ke CSV")
         print("10. Muat dari CSV")
+        print("11. Hitung Semua Gaji (MPI Pipelined)")
         print("0. Keluar")
         print("="*50)
         print(f"INFO: Running dengan {size} proses MPI")
@@ -291,7 +573,7 @@ def main():
         
         # Hanya rank 0 yang membaca input
         if rank == 0:
-            choice = input("Pilih menu (0-10): ").strip()
+            choice = input("Pilih menu (0-11): ").strip()
         else:
             choice = None
         
@@ -361,6 +643,9 @@ def main():
                 filename = input("Nama file CSV (default: payroll_data.csv): ").strip() or "payroll_data.csv"
                 payroll.load_from_csv(filename)
         
+        elif choice == "11":
+            payroll.calculate_all_salaries_pipelined()
+        
         elif choice == "0":
             if rank == 0:
                 print("\nTerima kasih! Program selesai.")
@@ -24,6 +24,7 @@ if HAS_OMP:
 import time
 import csv
 import os
+import csv_cache
 import matplotlib.pyplot as plt
 
 # Coba import omp4py
@@ -59,9 +60,8 @@ def muat_dari_csv(nama_file):
     if not os.path.exists(nama_file):
         print(f"    File '{nama_file}' tidak ditemukan.")
         return []
-    with open(nama_file, mode='r', newline='', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        return list(reader)
+    # Kolom biner di-mmap jika cache masih segar (csv_cache.py), selain itu csv.DictReader
+    return csv_cache.load_records(nama_file)
 
 # -------------------------------
 # Menu utama
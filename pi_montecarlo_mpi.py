@@ -1,6 +1,8 @@
 from mpi4py import MPI  # type: ignore
 import random
 import time
+import bench_metrics
+import mpi_hierarchy
 
 comm = MPI.COMM_WORLD
 rank = comm.Get_rank()
@@ -48,8 +50,8 @@ def pi_montecarlo_mpi(total_points: int) -> float:
     
     local_time = time.perf_counter() - start_time
     
-    # Kumpulkan hasil dari semua proses menggunakan reduce
-    total_count = comm.reduce(local_count, op=MPI.SUM, root=0)
+    # Kumpulkan hasil dari semua proses menggunakan reduce (dua tingkat: node, lalu antar node)
+    total_count = mpi_hierarchy.reduce(comm, local_count, op=MPI.SUM, root=0)
     
     # Hitung nilai Pi hanya di rank 0
     if rank == 0:
@@ -94,7 +96,9 @@ def main():
     import math
     
     # Test dengan berbagai ukuran
-    test_sizes = [100_000, 1_000_000, 10_000_000]
+    test_sizes = bench_metrics.bench_sizes([100_000, 1_000_000, 10_000_000])
+    
+    doc = bench_metrics.new_result("pi_montecarlo_mpi", size)
     
     if rank == 0:
         print("="*70)
@@ -104,6 +108,8 @@ def main():
     for num_points in test_sizes:
         # MPI Parallel version
         pi_mpi, time_mpi = pi_montecarlo_mpi(num_points)
+        rank_times = mpi_hierarchy.gather(comm, time_mpi, root=0)
+        time_serial = None
         
         if rank == 0:
             print(f"\n[MPI Parallel] Pi estimate: {pi_mpi:.10f}")
@@ -126,10 +132,14 @@ def main():
         
         if rank == 0:
             print("-"*70)
+            # Critical path = rank paling lambat
+            bench_metrics.add_point(doc, num_points, time_serial, max(rank_times), rank_times,
+                                    pi_estimate=pi_mpi, error=abs(pi_mpi - math.pi))
     
     if rank == 0:
         print("\nActual Pi value: {:.10f}".format(math.pi))
         print("="*70)
+        bench_metrics.emit_result(doc)
 
 if __name__ == "__main__":
     main()
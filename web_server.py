@@ -26,16 +26,18 @@ from flask import Flask, render_template, jsonify, request, send_file  # type: i
 import subprocess
 import json
 import time
-from datetime import datetime
 import os
 import sys
 import threading
+import statistics
 from io import StringIO
 import csv
 
 
 # Import database helpers (wajib DB, tidak ada fallback)
 import db_helper
+import bench_metrics
+import bench_model
 USE_DATABASE = True
 print("[DB] Database helpers loaded")
 print("[DB] Loading data from database...")
@@ -46,8 +48,6 @@ print(f"[DB] Loaded: {len(data_karyawan)} karyawan, {len(data_absen)} absen, {le
 
 app = Flask(__name__)
 
-# Simpan hasil benchmark
-benchmark_results = []
 current_status = {
     'running': False,
     'program': None,
@@ -212,13 +212,35 @@ def system_info():
     except:
         pass
     
+    # Rekomendasi jumlah proses dari model Amdahl + overhead komunikasi (bench_model.py)
+    max_procs = multiprocessing.cpu_count()
+    program_id = request.args.get('program_id')
+    recs = bench_model.recommendations(max_procs, host=bench_metrics.host_fingerprint())
+    if program_id in recs:
+        recommended = recs[program_id]['recommended_processes']
+    elif recs:
+        recommended = round(statistics.median(r['recommended_processes'] for r in recs.values()))
+    else:
+        recommended = max_procs
+    
     info = {
         'cpu_count': multiprocessing.cpu_count(),
         'platform': platform.system(),
         'python_version': platform.python_version(),
         'mpi_available': mpi_available,
         'mpi_version': mpi_version,
-        'recommended_processes': multiprocessing.cpu_count()
+        'recommended_processes': recommended,
+        'recommendations': {
+            prog: {
+                'recommended_processes': r['recommended_processes'],
+                'predicted_speedup': r['recommended_speedup'],
+                'predicted_efficiency': r['recommended_efficiency'],
+                'time_optimal_processes': r['time_optimal_processes'],
+                'serial_fraction': r['serial_fraction'],
+                'comm_overhead': r['comm_overhead']
+            }
+            for prog, r in recs.items()
+        }
     }
     
     return jsonify(info)
@@ -266,7 +288,7 @@ def run_program(program_id):
 
 def run_mpi_program(program_id, program_file, num_processes):
     """Fungsi untuk menjalankan MPI program di background"""
-    global current_status, benchmark_results
+    global current_status
     
     # Update status
     with status_lock:
@@ -308,11 +330,13 @@ def run_mpi_program(program_id, program_file, num_processes):
         # Build command
         if mpiexec_available and actual_processes > 1:
             # Use MPI with optimal process count
-            cmd = ['mpiexec', '-n', str(actual_processes), 'python', program_file]
+            cmd = ['mpiexec', '-n', str(actual_processes), 'python', program_file, '--json']
+            used_processes = actual_processes
             print(f"[MPI] Running with {actual_processes} processes (max cores: {max_cores})")
         else:
             # Fallback to serial execution
-            cmd = ['python', program_file]
+            cmd = ['python', program_file, '--json']
+            used_processes = 1
             if not mpiexec_available:
                 print(f"[WARNING] mpiexec not available, running in serial mode")
             else:
@@ -328,25 +352,22 @@ def run_mpi_program(program_id, program_file, num_processes):
         
         elapsed = time.time() - current_status['start_time']
         
-        # Simpan hasil
+        # Dokumen hasil JSON (--json) dipakai langsung, fallback ke parsing teks
+        metrics = bench_metrics.parse_metrics(result.stdout)
+        
+        # Simpan hasil ke riwayat benchmark (database)
         benchmark_result = {
-            'timestamp': datetime.now().isoformat(),
             'program_id': program_id,
-            'num_processes': num_processes,
+            'num_processes': metrics.get('ranks') or used_processes,
             'elapsed_time': elapsed,
+            'metrics': metrics,
             'output': result.stdout,
             'error': result.stderr,
             'success': result.returncode == 0
         }
         
-        with status_lock:
-            benchmark_results.insert(0, benchmark_result)
-            if len(benchmark_results) > 20:  # Keep only last 20 results
-                benchmark_results = benchmark_results[:20]
-        
     except subprocess.TimeoutExpired:
         benchmark_result = {
-            'timestamp': datetime.now().isoformat(),
             'program_id': program_id,
             'num_processes': num_processes,
             'elapsed_time': 300,
@@ -354,12 +375,9 @@ def run_mpi_program(program_id, program_file, num_processes):
             'error': 'Program timeout (lebih dari 5 menit)',
             'success': False
         }
-        with status_lock:
-            benchmark_results.insert(0, benchmark_result)
         
     except Exception as e:
         benchmark_result = {
-            'timestamp': datetime.now().isoformat(),
             'program_id': program_id,
             'num_processes': num_processes,
             'elapsed_time': 0,
@@ -367,10 +385,14 @@ def run_mpi_program(program_id, program_file, num_processes):
             'error': f'Error: {str(e)}',
             'success': False
         }
-        with status_lock:
-            benchmark_results.insert(0, benchmark_result)
     
     finally:
+        benchmark_result['host_fingerprint'] = bench_metrics.host_fingerprint()
+        benchmark_result['git_revision'] = bench_metrics.git_revision()
+        ok, msg = db_helper.save_benchmark_run(benchmark_result)
+        if not ok:
+            print(f"[ERROR] Gagal simpan hasil benchmark: {msg}")
+        
         # Reset status
         with status_lock:
             current_status['running'] = False
@@ -390,16 +412,25 @@ def get_status():
 
 @app.route('/api/results', methods=['GET'])
 def get_results():
-    """Mendapatkan hasil benchmark sebelumnya"""
-    with status_lock:
-        results = benchmark_results.copy()
-    return jsonify(results)
+    """Mendapatkan hasil benchmark sebelumnya (dari riwayat database)"""
+    limit = request.args.get('limit', 20, type=int)
+    program_id = request.args.get('program_id')
+    num_processes = request.args.get('processes', type=int)
+    return jsonify(db_helper.get_benchmark_runs(limit, program_id, num_processes))
+
+@app.route('/api/results/trends', methods=['GET'])
+def get_results_trends():
+    """Tren speedup/efisiensi per program dan jumlah proses dari waktu ke waktu"""
+    program_id = request.args.get('program_id')
+    num_processes = request.args.get('processes', type=int)
+    host = request.args.get('host')
+    return jsonify(db_helper.get_benchmark_trends(program_id, num_processes, host))
 
 @app.route('/api/results/clear', methods=['POST'])
 def clear_results():
     """Menghapus semua hasil benchmark"""
-    with status_lock:
-        benchmark_results.clear()
+    if not db_helper.clear_benchmark_runs():
+        return jsonify({'success': False, 'message': 'Gagal menghapus hasil benchmark'}), 500
     return jsonify({'success': True, 'message': 'Hasil benchmark dihapus'})
 
 # ==============================
@@ -798,6 +829,7 @@ if __name__ == '__main__':
     print("   - POST /api/run/<program_id>")
     print("   - GET  /api/status")
     print("   - GET  /api/results")
+    print("   - GET  /api/results/trends")
     print("   - GET  /api/database/browse")
     print("\nTekan Ctrl+C untuk berhenti\n")
     